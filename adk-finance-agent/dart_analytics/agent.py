@@ -19,7 +19,10 @@ from .sub_functions.document_analyzer import (
     analyze_extracted_dart_document,
     parse_xml_file_to_readable
 )
-from .sub_functions.utils import get_corp_code, get_document_basic_info, ensure_document_available, process_user_request, refresh_corpcode_data, search_corporations, get_corp_info, get_corpcode_file_info
+from .sub_functions.utils import get_document_basic_info, ensure_document_available, process_user_request, refresh_corpcode_data, find_similar_corporations, resolve_corporations, autocomplete_corporations, get_corpcode_file_info
+# 기업 코드 조회 도구는 이벤트 루프를 막지 않는 async 버전을 사용
+from .sub_functions.async_tools import get_corp_code, search_corporations, get_corp_info
+from .sub_functions.rate_limiter import openapi_tool_callbacks
 
 # Load OpenAPI spec
 with open('./dart_analytics/dart_openapi_full_specification.yml', 'r', encoding='utf-8') as f:
@@ -52,6 +55,9 @@ except Exception as e:
     # 오류 발생 시 빈 도구 세트로 대체 (기본 기능은 유지)
     toolset = None
 
+# OpenAPIToolset 호출도 함수 도구와 같은 DART 속도 제한기/일일 한도를 공유
+before_tool_callback, after_tool_callback = openapi_tool_callbacks('dart', config.DART_API_KEY)
+
 
 def process_dart_document(rcept_no: str, user_request: str = "", download_folder: str = "./downloads") -> str:
     """
@@ -114,6 +120,9 @@ tools_list.extend([
     FunctionTool(func=get_corp_code),
     FunctionTool(func=refresh_corpcode_data),
     FunctionTool(func=search_corporations),
+    FunctionTool(func=find_similar_corporations),
+    FunctionTool(func=resolve_corporations),
+    FunctionTool(func=autocomplete_corporations),
     FunctionTool(func=get_corp_info),
     FunctionTool(func=get_corpcode_file_info),
     FunctionTool(func=process_dart_document),
@@ -133,6 +142,8 @@ dart_analytics = LlmAgent(
     description="자연어 질문을 DART API 호출로 변환하여 기업 분석 데이터를 조회하고 요약하는 AI 에이전트. ZIP 파일 형태의 공시서류도 자동으로 다운로드, 압축해제하고 분석할 수 있습니다.",
     instruction=DART_ANALYTICS_PROMPT,
     tools=tools_list,
+    before_tool_callback=before_tool_callback,
+    after_tool_callback=after_tool_callback,
     output_key="dart_result",
 )
 
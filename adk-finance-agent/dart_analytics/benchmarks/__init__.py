@@ -0,0 +1 @@
+"""DART Analytics 오프라인 성능 벤치마크 모듈들"""
@@ -0,0 +1,132 @@
+"""
+CorpCodeStorage Lookup Benchmark
+================================
+Measures corporation lookups per second under concurrent tool calls, comparing
+the legacy connection-per-call access pattern with the pooled connections used
+by CorpCodeStorage.
+
+Runs fully offline against a synthetic database:
+
+    python -m dart_analytics.benchmarks.corpcode_lookup --rows 20000 --threads 8
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from ..sub_functions.corpcode_storage import CorpCodeStorage
+
+
+def _populate(storage: CorpCodeStorage, rows: int) -> List[str]:
+    """Fill the storage with synthetic corporations and return their codes"""
+    records = [
+        (f"{i:08d}", f"테스트기업{i}", f"Test Corp {i}", f"{i % 1000000:06d}" if i % 3 == 0 else "", "20240101")
+        for i in range(rows)
+    ]
+    with storage._connection() as conn:
+        conn.executemany('''
+            INSERT OR REPLACE INTO corporations
+            (corp_code, corp_name, corp_eng_name, stock_code, modify_date)
+            VALUES (?, ?, ?, ?, ?)
+        ''', records)
+        conn.commit()
+    return [record[0] for record in records]
+
+
+def _legacy_lookup(db_path: Path) -> Callable[[str], None]:
+    """Reproduce the previous pattern: one connection per statement"""
+    def lookup(corp_code: str):
+        conn = sqlite3.connect(db_path, timeout=30)
+        conn.execute('''
+            SELECT corp_code, corp_name, corp_eng_name, stock_code,
+                   modify_date, last_accessed, access_count
+            FROM corporations
+            WHERE corp_code = ?
+        ''', (corp_code,)).fetchone()
+        conn.close()
+
+        conn = sqlite3.connect(db_path, timeout=30)
+        conn.execute('''
+            UPDATE corporations
+            SET last_accessed = ?, access_count = access_count + 1
+            WHERE corp_code = ?
+        ''', (datetime.now().isoformat(), corp_code))
+        conn.commit()
+        conn.close()
+    return lookup
+
+
+def _run(lookup: Callable[[str], None], codes: List[str], threads: int, lookups: int) -> Dict[str, float]:
+    """Run ``lookups`` calls spread across ``threads`` workers"""
+    rng = random.Random(42)
+    sample = [rng.choice(codes) for _ in range(lookups)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lookup, sample))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'lookups': lookups,
+        'seconds': round(elapsed, 4),
+        'lookups_per_sec': round(lookups / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def run_benchmark(rows: int = 20000, threads: int = 8, lookups: int = 5000) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmark legacy and pooled lookups on identical synthetic data.
+    
+    Args:
+        rows: Number of synthetic corporations
+        threads: Number of concurrent callers
+        lookups: Total lookups per scenario
+        
+    Returns:
+        Results per scenario
+    """
+    work_dir = Path(tempfile.mkdtemp(prefix="corpcode_bench_"))
+    try:
+        storage = CorpCodeStorage(base_dir=str(work_dir), pool_size=threads)
+        codes = _populate(storage, rows)
+
+        # The legacy layout used the default rollback journal on its own file
+        legacy_db = work_dir / "legacy.db"
+        with storage._connection() as conn:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        shutil.copyfile(storage.db_path, legacy_db)
+        conn = sqlite3.connect(legacy_db)
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.close()
+
+        results = {
+            'legacy_connection_per_call': _run(_legacy_lookup(legacy_db), codes, threads, lookups),
+            'pooled_connections': _run(storage.get_corporation_info, codes, threads, lookups),
+        }
+        storage.close()
+        return results
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CorpCodeStorage lookup benchmark")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--lookups", type=int, default=5000)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.rows, args.threads, args.lookups)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+CorpCodeStorage Benchmark Suite
+===============================
+End-to-end storage benchmark on synthetic CORPCODE.xml files (see
+``synthetic_corpcode``), for spotting regressions between commits.
+
+For every dataset size it measures ``import_from_xml`` throughput, then the
+latency (p50/p99/mean) and throughput of exact ``get_corp_code`` lookups,
+``search_corporations``, ``get_popular_corporations`` and ``get_statistics``
+at each requested thread count. Results are printed (or written) as JSON;
+pass an earlier result as ``--baseline`` to get per-metric ratios.
+
+Runs fully offline:
+
+    python -m dart_analytics.benchmarks.corpcode_suite --sizes 10000,100000 --threads 1,8
+    python -m dart_analytics.benchmarks.corpcode_suite --output after.json --baseline before.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..sub_functions.corpcode_storage import CorpCodeStorage
+from .synthetic_corpcode import SIZES, iter_synthetic_records, write_corpcode_xml
+
+DEFAULT_THREADS = (1, 8)
+
+# Names sampled from each dataset to drive lookups and searches
+_SAMPLE_NAMES = 5000
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _measure(operation: Callable[[Any], Any], arguments: Sequence[Any], threads: int) -> Dict[str, float]:
+    """
+    Call ``operation`` once per argument from ``threads`` workers.
+
+    Returns:
+        Call count, wall time, throughput and latency percentiles in milliseconds
+    """
+    latencies: List[float] = []
+    lock = threading.Lock()
+    chunks = [arguments[i::threads] for i in range(threads)]
+
+    def worker(chunk: Sequence[Any]):
+        local = []
+        for argument in chunk:
+            started = time.perf_counter()
+            operation(argument)
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, chunks))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'calls': len(latencies),
+        'seconds': round(elapsed, 4),
+        'ops_per_sec': round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        'p50_ms': round(_percentile(latencies, 0.50) * 1000, 4),
+        'p99_ms': round(_percentile(latencies, 0.99) * 1000, 4),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 4),
+    }
+
+
+def _sample_names(size: int, seed: int) -> List[str]:
+    """Evenly spaced corporation names from the synthetic dataset"""
+    stride = max(1, size // _SAMPLE_NAMES)
+    return [record[1] for index, record in enumerate(iter_synthetic_records(size, seed)) if index % stride == 0]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, timeout=5, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def benchmark_size(size: int, threads: Sequence[int] = DEFAULT_THREADS, operations: int = 2000,
+                   seed: int = 42, work_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Benchmark one dataset size.
+
+    Args:
+        size: Number of synthetic corporations
+        threads: Concurrency levels to measure each operation at
+        operations: Calls per operation and concurrency level
+        seed: Dataset and query seed
+        work_dir: Directory for the XML file and storage (temporary if omitted)
+
+    Returns:
+        Import figures and per-operation, per-thread-count measurements
+    """
+    own_dir = work_dir is None
+    work_dir = Path(tempfile.mkdtemp(prefix="corpcode_suite_")) if own_dir else Path(work_dir)
+    try:
+        xml_path = work_dir / f"CORPCODE-{size}-{seed}.xml"
+        if not xml_path.exists():
+            write_corpcode_xml(xml_path, size, seed)
+
+        storage_dir = work_dir / f"storage-{size}"
+        shutil.rmtree(storage_dir, ignore_errors=True)
+        storage_dir.mkdir()
+        storage = CorpCodeStorage(base_dir=str(storage_dir), pool_size=max(threads))
+        try:
+            started = time.perf_counter()
+            imported = storage.import_from_xml(str(xml_path))
+            import_seconds = time.perf_counter() - started
+
+            rng = random.Random(seed)
+            names = _sample_names(size, seed)
+            lookups = [rng.choice(names) for _ in range(operations)]
+            # Two- and three-character prefixes plus inner substrings of real names
+            queries = []
+            for _ in range(operations):
+                name = rng.choice(names).replace("(주)", "")
+                start = rng.randrange(max(1, len(name) - 2))
+                queries.append(name[start:start + rng.choice((2, 3))])
+
+            scenarios = {
+                'get_corp_code': (storage.get_corp_code, lookups),
+                'search_corporations': (lambda query: storage.search_corporations(query, 10), queries),
+                'get_popular_corporations': (lambda _: storage.get_popular_corporations(20), range(operations)),
+                'get_statistics': (lambda _: storage.get_statistics(), range(operations)),
+            }
+
+            results: Dict[str, Dict[str, Any]] = {}
+            for name, (operation, arguments) in scenarios.items():
+                results[name] = {}
+                for thread_count in threads:
+                    # Every scenario starts cold so cache hit rates are comparable
+                    storage.clear_cache()
+                    results[name][f"threads_{thread_count}"] = _measure(operation, list(arguments), thread_count)
+
+            return {
+                'import_from_xml': {
+                    'records': imported,
+                    'seconds': round(import_seconds, 3),
+                    'records_per_sec': round(imported / import_seconds, 1) if import_seconds > 0 else 0.0,
+                },
+                'operations': results,
+            }
+        finally:
+            storage.close()
+    finally:
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def run_suite(sizes: Sequence[int] = SIZES, threads: Sequence[int] = DEFAULT_THREADS,
+              operations: int = 2000, seed: int = 42) -> Dict[str, Any]:
+    """
+    Run the benchmark for every dataset size.
+
+    Returns:
+        JSON-serialisable results with environment metadata
+    """
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': sys.version.split()[0],
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'sizes': list(sizes),
+            'threads': list(threads),
+            'operations': operations,
+            'seed': seed,
+        },
+        'results': {},
+    }
+    work_dir = Path(tempfile.mkdtemp(prefix="corpcode_suite_"))
+    try:
+        for size in sizes:
+            results['results'][str(size)] = benchmark_size(size, threads, operations, seed, work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ratios of current to baseline figures (>1 means slower for latencies and
+    faster for throughputs) for every metric present in both runs.
+    """
+    ratios: Dict[str, Any] = {}
+    for size, current_size in current['results'].items():
+        baseline_size = baseline.get('results', {}).get(size)
+        if baseline_size is None:
+            continue
+        size_ratios = ratios.setdefault(size, {})
+
+        base_import = baseline_size['import_from_xml']['records_per_sec']
+        if base_import:
+            size_ratios['import_records_per_sec'] = round(current_size['import_from_xml']['records_per_sec'] / base_import, 3)
+
+        for operation, per_threads in current_size['operations'].items():
+            for thread_key, figures in per_threads.items():
+                base = baseline_size['operations'].get(operation, {}).get(thread_key)
+                if not base:
+                    continue
+                size_ratios[f"{operation}.{thread_key}"] = {
+                    metric: round(figures[metric] / base[metric], 3)
+                    for metric in ('p50_ms', 'p99_ms', 'ops_per_sec') if base[metric]
+                }
+    return ratios
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CorpCodeStorage benchmark suite")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES),
+                        help="Comma-separated dataset sizes")
+    parser.add_argument("--threads", default=",".join(str(count) for count in DEFAULT_THREADS),
+                        help="Comma-separated thread counts")
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="Write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="Earlier results to compare against")
+    args = parser.parse_args()
+
+    results = run_suite(
+        sizes=[int(size) for size in args.sizes.split(",")],
+        threads=[int(count) for count in args.threads.split(",")],
+        operations=args.operations,
+        seed=args.seed,
+    )
+    if args.baseline:
+        results['comparison'] = compare(json.loads(args.baseline.read_text(encoding="utf-8")), results)
+
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(output, encoding="utf-8")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
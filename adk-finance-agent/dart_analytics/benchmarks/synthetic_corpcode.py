@@ -0,0 +1,130 @@
+"""
+Synthetic CORPCODE.xml Generator
+================================
+Writes CORPCODE.xml files shaped like the DART download: 8-digit corp codes,
+Korean names built from common corporate name parts (with English
+counterparts), 6-digit stock codes for a listed minority and modify dates.
+Output is deterministic for a given seed, so benchmark runs on different
+commits see identical data.
+
+    python -m dart_analytics.benchmarks.synthetic_corpcode --count 100000 --output CORPCODE.xml
+"""
+
+import argparse
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator, Tuple
+from xml.sax.saxutils import escape
+
+# Preset sizes used by the benchmark suite
+SIZES = (10_000, 100_000, 1_000_000)
+
+# Roughly the listed share of the real file (~3.9k of ~100k corporations)
+LISTED_RATIO = 0.04
+
+_GROUPS = [
+    ("삼성", "SAMSUNG"), ("현대", "HYUNDAI"), ("엘지", "LG"), ("에스케이", "SK"), ("한화", "HANWHA"),
+    ("롯데", "LOTTE"), ("포스코", "POSCO"), ("대한", "DAEHAN"), ("한국", "KOREA"), ("동양", "TONGYANG"),
+    ("신한", "SHINHAN"), ("대우", "DAEWOO"), ("코오롱", "KOLON"), ("두산", "DOOSAN"), ("효성", "HYOSUNG"),
+    ("동원", "DONGWON"), ("영풍", "YOUNGPOONG"), ("한솔", "HANSOL"), ("대림", "DAELIM"), ("금호", "KUMHO"),
+    ("미래", "MIRAE"), ("세아", "SEAH"), ("태광", "TAEKWANG"), ("성우", "SUNGWOO"), ("우리", "WOORI"),
+    ("새한", "SAEHAN"), ("동아", "DONGA"), ("일진", "ILJIN"), ("한일", "HANIL"), ("경동", "KYUNGDONG"),
+]
+
+_INDUSTRIES = [
+    ("전자", "ELECTRONICS"), ("화학", "CHEMICAL"), ("중공업", "HEAVY INDUSTRIES"), ("건설", "E&C"),
+    ("제약", "PHARMACEUTICAL"), ("바이오", "BIO"), ("에너지", "ENERGY"), ("반도체", "SEMICONDUCTOR"),
+    ("물산", "C&T"), ("증권", "SECURITIES"), ("생명", "LIFE INSURANCE"), ("식품", "FOODS"),
+    ("통신", "TELECOM"), ("소재", "MATERIALS"), ("기계", "MACHINERY"), ("자동차", "MOTOR"),
+    ("해운", "SHIPPING"), ("철강", "STEEL"), ("제지", "PAPER"), ("섬유", "TEXTILE"),
+    ("유통", "RETAIL"), ("정밀", "PRECISION"), ("산업", "INDUSTRIAL"), ("개발", "DEVELOPMENT"),
+]
+
+_SUFFIXES = [
+    ("", ""), ("", ""), ("", ""), ("홀딩스", "HOLDINGS"), ("테크", "TECH"), ("솔루션", "SOLUTIONS"),
+    ("글로벌", "GLOBAL"), ("시스템", "SYSTEMS"), ("파트너스", "PARTNERS"), ("인터내셔널", "INTERNATIONAL"),
+]
+
+# Syllables appended to tell apart otherwise identical names
+_SYLLABLES = list("가나다라마바사아자차카타파하강남동서북진성원광명신")
+
+# (corp_code, corp_name, corp_eng_name, stock_code, modify_date), as iter_corpcode_records yields
+CorpCodeRecord = Tuple[str, str, str, str, str]
+
+
+def iter_synthetic_records(count: int, seed: int = 42, listed_ratio: float = LISTED_RATIO) -> Iterator[CorpCodeRecord]:
+    """
+    Yield ``count`` synthetic corporations.
+
+    Args:
+        count: Number of corporations
+        seed: Random seed; the same seed yields the same records
+        listed_ratio: Share of corporations given a stock code
+    """
+    rng = random.Random(seed)
+    corp_codes = rng.sample(range(100_000_000), count)
+    stock_codes = iter(rng.sample(range(1, 1_000_000), min(count, 999_999)))
+    first_date = date(2015, 1, 1)
+    used_names = set()
+
+    for corp_code in corp_codes:
+        group, group_eng = rng.choice(_GROUPS)
+        industry, industry_eng = rng.choice(_INDUSTRIES)
+        suffix, suffix_eng = rng.choice(_SUFFIXES)
+        name = group + industry + suffix
+        eng_name = " ".join(part for part in (group_eng, industry_eng, suffix_eng) if part)
+
+        # Most real names are unique; add syllables until this one is
+        while name in used_names:
+            name += rng.choice(_SYLLABLES) + rng.choice(_SYLLABLES)
+        used_names.add(name)
+        if rng.random() < 0.05:
+            name = "(주)" + name
+
+        stock_code = f"{next(stock_codes):06d}" if rng.random() < listed_ratio else " "
+        modify_date = (first_date + timedelta(days=rng.randrange(3650))).strftime("%Y%m%d")
+        yield f"{corp_code:08d}", name, f"{eng_name} CO.,LTD", stock_code, modify_date
+
+
+def write_corpcode_xml(path: Path, count: int, seed: int = 42, listed_ratio: float = LISTED_RATIO) -> int:
+    """
+    Write a synthetic CORPCODE.xml.
+
+    Args:
+        path: Destination file
+        count: Number of corporations
+        seed: Random seed
+        listed_ratio: Share of corporations given a stock code
+
+    Returns:
+        Number of corporations written
+    """
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<result>\n')
+        for corp_code, corp_name, corp_eng_name, stock_code, modify_date in iter_synthetic_records(count, seed, listed_ratio):
+            f.write(
+                f"<list><corp_code>{corp_code}</corp_code><corp_name>{escape(corp_name)}</corp_name>"
+                f"<corp_eng_name>{escape(corp_eng_name)}</corp_eng_name><stock_code>{stock_code}</stock_code>"
+                f"<modify_date>{modify_date}</modify_date></list>\n"
+            )
+            written += 1
+        f.write("</result>\n")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic CORPCODE.xml")
+    parser.add_argument("--count", type=int, default=SIZES[1])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--listed-ratio", type=float, default=LISTED_RATIO)
+    parser.add_argument("--output", type=Path, default=Path("CORPCODE.xml"))
+    args = parser.parse_args()
+
+    count = write_corpcode_xml(args.output, args.count, args.seed, args.listed_ratio)
+    print(f"Wrote {count} corporations to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Filing ZIP Extraction Pipeline Benchmark
+========================================
+Compares the legacy download path (write the ZIP to disk, reopen it,
+``extractall`` into a second folder, ``os.walk`` it, delete the ZIP) with
+the spooled pipeline used by the download cache (spool the response into a
+SpooledTemporaryFile and extract members straight from it while recording a
+manifest).
+
+Runs fully offline: the "response" is a chunk iterator over a synthetic
+filing ZIP. Where ``/proc/self/io`` exists, bytes passed through read/write
+system calls are reported alongside the latency.
+
+    python -m dart_analytics.benchmarks.zip_pipeline --size-mb 5 20 --repeat 5
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from ..sub_functions.download_cache import SPOOL_MAX_BYTES
+from ..sub_functions.file_handlers import _extract_zip
+
+CHUNK_SIZE = 65536
+
+
+def make_filing_zip(size_mb: float, members: int = 6, seed: int = 42) -> bytes:
+    """Build a ZIP of XML members totalling roughly ``size_mb`` compressed"""
+    rng = random.Random(seed)
+    words = ["매출액", "영업이익", "당기순이익", "자산총계", "부채총계", "자본총계", "TABLE", "TD", "TR"]
+    buffer = io.BytesIO()
+    target = int(size_mb * 1024 * 1024)
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for index in range(members):
+            parts = []
+            length = 0
+            # Random numbers keep the members from compressing away entirely
+            while length < target * 3 // members:
+                part = f"<P>{rng.choice(words)} {rng.randint(0, 10**12)}</P>\n"
+                parts.append(part)
+                length += len(part)
+            archive.writestr(f"{20240101000000 + index}_{index:05d}.xml", "".join(parts))
+    return buffer.getvalue()
+
+
+def _response(payload: bytes) -> Iterator[bytes]:
+    for offset in range(0, len(payload), CHUNK_SIZE):
+        yield payload[offset:offset + CHUNK_SIZE]
+
+
+def _legacy_pipeline(payload: bytes, work_dir: Path):
+    zip_path = work_dir / "document.zip"
+    with open(zip_path, 'wb') as f:
+        for chunk in _response(payload):
+            f.write(chunk)
+    extract_folder = work_dir / "extracted_legacy"
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        zip_ref.extractall(extract_folder)
+    files = []
+    for root, dirs, names in os.walk(extract_folder):
+        for name in names:
+            files.append(os.path.join(root, name))
+    os.remove(zip_path)
+    return files
+
+
+def _spooled_pipeline(payload: bytes, work_dir: Path, spool_max_bytes: int):
+    with tempfile.SpooledTemporaryFile(max_size=spool_max_bytes, dir=work_dir) as spool:
+        for chunk in _response(payload):
+            spool.write(chunk)
+        spool.seek(0)
+        return _extract_zip(spool, str(work_dir / "extracted_spooled"))
+
+
+def _proc_io() -> Optional[Dict[str, int]]:
+    try:
+        with open("/proc/self/io") as f:
+            return {key: int(value) for key, value in (line.split(": ") for line in f)}
+    except OSError:
+        return None
+
+
+def _measure(run, payload: bytes, repeat: int) -> Dict[str, float]:
+    timings: List[float] = []
+    read_bytes = write_bytes = 0
+    for _ in range(repeat):
+        work_dir = Path(tempfile.mkdtemp(prefix="zip_pipeline_"))
+        try:
+            before = _proc_io()
+            start = time.perf_counter()
+            run(payload, work_dir)
+            timings.append(time.perf_counter() - start)
+            after = _proc_io()
+            if before and after:
+                read_bytes += after['rchar'] - before['rchar']
+                write_bytes += after['wchar'] - before['wchar']
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    result = {
+        'p50_ms': round(statistics.median(timings) * 1000, 2),
+        'mean_ms': round(statistics.fmean(timings) * 1000, 2),
+    }
+    if read_bytes or write_bytes:
+        result['read_mb'] = round(read_bytes / repeat / 1024 / 1024, 2)
+        result['write_mb'] = round(write_bytes / repeat / 1024 / 1024, 2)
+    return result
+
+
+def run_benchmark(sizes_mb: List[float], repeat: int = 5,
+                  spool_max_bytes: int = SPOOL_MAX_BYTES) -> Dict[str, Dict[str, object]]:
+    """
+    Benchmark both pipelines on synthetic filings of each size.
+
+    Args:
+        sizes_mb: Compressed ZIP sizes to test
+        repeat: Runs per pipeline and size
+        spool_max_bytes: In-memory limit for the spooled pipeline
+
+    Returns:
+        Results per size
+    """
+    results = {}
+    for size_mb in sizes_mb:
+        payload = make_filing_zip(size_mb)
+        legacy = _measure(_legacy_pipeline, payload, repeat)
+        spooled = _measure(lambda p, d: _spooled_pipeline(p, d, spool_max_bytes), payload, repeat)
+        entry = {
+            'zip_mb': round(len(payload) / 1024 / 1024, 2),
+            'spooled_in_memory': len(payload) <= spool_max_bytes,
+            'legacy': legacy,
+            'spooled': spooled,
+            'latency_saved_pct': round((1 - spooled['p50_ms'] / legacy['p50_ms']) * 100, 1),
+        }
+        if 'read_mb' in legacy and 'read_mb' in spooled:
+            entry['io_saved_mb'] = round(legacy['read_mb'] + legacy['write_mb']
+                                         - spooled['read_mb'] - spooled['write_mb'], 2)
+        results[f"{size_mb:g}MB"] = entry
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Filing ZIP extraction pipeline benchmark")
+    parser.add_argument("--size-mb", type=float, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--spool-max-mb", type=float, default=SPOOL_MAX_BYTES / 1024 / 1024)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.size_mb, args.repeat, int(args.spool_max_mb * 1024 * 1024))
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
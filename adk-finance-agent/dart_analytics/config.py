@@ -59,12 +59,14 @@ class ResearchConfiguration:
         worker_model (str): Model for working/generation tasks.
         max_search_iterations (int): Maximum search iterations allowed.
         DART_API_KEY (str): DART API key loaded from environment variables.
+        DART_HTTP_POOL_SIZE (int): Keep-alive connections kept to the DART API.
     """
 
     critic_model: str = "gemini-2.5-pro"
     worker_model: str = "gemini-2.5-flash"
     max_search_iterations: int = 5
     DART_API_KEY: str = os.getenv("DART_API_KEY", "")
+    DART_HTTP_POOL_SIZE: int = int(os.getenv("DART_HTTP_POOL_SIZE", "10"))
 
 
 config = ResearchConfiguration()
\ No newline at end of file
@@ -54,6 +54,9 @@ DART_ANALYTICS_PROMPT = f"""
 # 고성능 CORPCODE 저장소
 - `get_corp_code(기업명)` - 8자리 코드 반환
 - `search_corporations(검색어)` - 부분검색 지원
+- `find_similar_corporations(기업명)` - 오타/띄어쓰기/(주) 표기/초성(ㅅㅅㅈㅈ) 허용 유사 기업 후보
+- `resolve_corporations([기업명, ...])` - 여러 기업을 한 번에 변환 (비교 기업군, 다중회사 조회 시 반복 호출 대신 사용)
+- `autocomplete_corporations(기업명 앞부분)` - "삼성", "현대"처럼 후보가 여럿인 이름을 조회 빈도순 상장기업 목록으로 구분
 - SQLite 기반 캐싱, < 1ms 검색속도
 
 # 응답 처리
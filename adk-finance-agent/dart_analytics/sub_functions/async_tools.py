@@ -0,0 +1,69 @@
+"""
+DART Analytics 비동기 도구 모듈
+
+ADK 이벤트 루프를 막지 않도록 기업 코드 조회 도구를 async 함수로 제공합니다.
+SQLite/파일 I/O는 AsyncCorpCodeStorage 전용 스레드 풀에서 실행됩니다.
+"""
+
+from . import utils
+from .corpcode_async import get_async_storage
+
+
+async def get_corp_code(corp_name: str) -> str:
+    """
+    회사명을 입력받아 고유번호(8자리)를 반환합니다.
+    CORPCODE.xml이 없는 경우 자동으로 다운로드하여 처리합니다.
+    새로운 고성능 저장소 시스템을 사용하여 빠른 조회를 제공합니다.
+    """
+    try:
+        storage = get_async_storage()
+        if await storage.run(utils.ensure_storage_initialized):
+            corp_code = await storage.get_corp_code(corp_name)
+            if corp_code:
+                return corp_code
+
+        # 정확한 조회는 이미 끝났으므로 유사/부분 검색 및 XML 폴백만 스레드 풀에서 수행
+        return await storage.run(utils.resolve_corp_code_fallback, corp_name)
+    except Exception as e:
+        return f"오류가 발생했습니다: {e}"
+
+
+async def search_corporations(query: str, limit: int = 10) -> str:
+    """
+    기업명 또는 코드를 검색하여 매칭되는 기업 목록을 반환합니다.
+
+    Args:
+        query: 검색 키워드 (부분 매칭 지원)
+        limit: 최대 결과 개수
+
+    Returns:
+        검색 결과를 포맷팅한 문자열
+    """
+    try:
+        storage = get_async_storage()
+        await storage.run(utils.ensure_storage_initialized)
+
+        results = await storage.search_corporations(query, limit)
+        return utils.format_search_results(query, results)
+    except Exception as e:
+        return f"검색 중 오류 발생: {str(e)}"
+
+
+async def get_corp_info(corp_code: str) -> str:
+    """
+    고유번호로 기업 상세 정보를 조회합니다.
+
+    Args:
+        corp_code: 8자리 고유번호
+
+    Returns:
+        기업 상세 정보
+    """
+    try:
+        storage = get_async_storage()
+        await storage.run(utils.ensure_storage_initialized)
+
+        info = await storage.get_corporation_info(corp_code)
+        return utils.format_corp_info(corp_code, info)
+    except Exception as e:
+        return f"정보 조회 중 오류 발생: {str(e)}"
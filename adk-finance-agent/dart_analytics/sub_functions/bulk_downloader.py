@@ -0,0 +1,276 @@
+"""
+DART 공시서류 대량 다운로드 모듈
+
+접수번호 목록을 받아 여러 스레드로 동시에 공시서류 ZIP을 다운로드 캐시에 받아 둡니다.
+압축은 풀지 않으며, 문서 분석 함수들이 FilingArchive로 필요한 멤버만 읽습니다.
+
+- 요청은 PRIORITY_BULK 우선순위로 공용 DART 속도 제한기를 거치므로 대화형 요청이 먼저 처리되고,
+  초당 요청 수와 일일 한도(공용 장부, KST 기준)는 다른 세션과 함께 계산됨
+- 일일 한도를 모두 쓰면 멈추고, 캐시에 이미 있는 항목은 요청 없이 건너뜀
+- 네트워크 오류, 5xx, DART 020(요청 제한 초과) 등은 지수 백오프로 재시도
+- 진행 상황을 추가 전용 JSONL 로그에 한 줄씩 기록하여 중단 후 다시 실행하면 남은 항목부터 이어서 처리
+- 처리량(건/초, MB/초)과 재시도 횟수를 리포트로 반환
+
+    python -m dart_analytics.sub_functions.bulk_downloader rcept_nos.txt --concurrency 4
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .dart_client import get_dart_client
+from .file_handlers import DartDownloadError, fetch_zip, is_document_cached
+from .rate_limiter import PRIORITY_BULK, request_priority
+
+logger = logging.getLogger(__name__)
+
+# 로그 줄 수가 항목 수의 이 배수를 넘으면 불러올 때 한 번 압축
+_PROGRESS_COMPACT_RATIO = 4
+
+
+class BulkDownloader:
+    """
+    재개 가능한 동시 공시서류 다운로더
+    """
+
+    def __init__(self, download_folder: str = "./downloads", concurrency: int = 4,
+                 max_retries: int = 3, backoff_base: float = 1.0, backoff_max: float = 60.0,
+                 progress_path: Optional[str] = None):
+        """
+        Args:
+            download_folder: 다운로드 캐시(.dart_cache)가 있는 폴더
+            concurrency: 동시 다운로드 스레드 수 (요청 속도는 공용 DART 속도 제한기가 제한)
+            max_retries: 재시도 가능한 오류의 최대 재시도 횟수
+            backoff_base: 첫 재시도 대기 시간(초), 이후 2배씩 증가
+            backoff_max: 재시도 대기 시간 상한(초)
+            progress_path: 진행 상황 로그 (기본값: {download_folder}/bulk_progress.jsonl)
+        """
+        self.download_folder = download_folder
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.progress_path = Path(progress_path or os.path.join(download_folder, "bulk_progress.jsonl"))
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._progress_log = None
+        self._progress = self._load_progress()
+
+    # 진행 상황 파일 ------------------------------------------------------------
+
+    def _load_progress(self) -> Dict[str, Any]:
+        """
+        진행 상황 로그를 재생합니다. 한 줄은 항목 하나의 변경분이며 뒤의 줄이 앞의 값을 덮어씁니다.
+        마지막 줄이 쓰다 만 상태(중단)이면 그 줄만 무시합니다.
+        """
+        progress = {'items': {}}
+        lines = 0
+        try:
+            with open(self.progress_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        change = json.loads(line)
+                    except ValueError:
+                        continue
+                    lines += 1
+                    if 'item' in change:
+                        progress['items'].setdefault(change['item'], {}).update(change.get('fields', {}))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"진행 상황 파일을 읽을 수 없어 새로 시작합니다 ({self.progress_path}): {e}")
+
+        if lines > _PROGRESS_COMPACT_RATIO * max(len(progress['items']), 1) + 100:
+            self._compact_progress(progress)
+        return progress
+
+    def _compact_progress(self, progress: Dict[str, Any]):
+        """항목마다 한 줄만 남기도록 로그를 원자적으로 다시 씀"""
+        tmp_path = self.progress_path.with_name(self.progress_path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for rcept_no, fields in progress['items'].items():
+                f.write(json.dumps({'item': rcept_no, 'fields': fields}, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.progress_path)
+
+    def _append_progress(self, change: Dict[str, Any]):
+        """변경분 한 줄을 로그에 추가 (호출자가 _lock 보유). 전체 파일을 다시 쓰지 않음"""
+        if self._progress_log is None:
+            self.progress_path.parent.mkdir(parents=True, exist_ok=True)
+            self._progress_log = open(self.progress_path, 'a', encoding='utf-8')
+            # 이전 실행이 줄 중간에 끊겼으면 새 줄에서 시작 (끊긴 줄만 버려짐)
+            if self._progress_log.tell() > 0:
+                with open(self.progress_path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        self._progress_log.write("\n")
+        self._progress_log.write(json.dumps(change, ensure_ascii=False) + "\n")
+        self._progress_log.flush()
+
+    def _close_progress(self):
+        with self._lock:
+            if self._progress_log is not None:
+                self._progress_log.close()
+                self._progress_log = None
+
+    def _record(self, rcept_no: str, **fields):
+        with self._lock:
+            self._progress['items'].setdefault(rcept_no, {}).update(fields)
+            self._append_progress({'item': rcept_no, 'fields': fields})
+
+    # 다운로드 -------------------------------------------------------------------
+
+    def _backoff(self, attempt: int) -> float:
+        # 지수 백오프 + 지터 (동시에 실패한 스레드가 한꺼번에 재시도하지 않도록)
+        return min(self.backoff_max, self.backoff_base * (2 ** attempt)) * random.uniform(0.5, 1.5)
+
+    def _download_one(self, rcept_no: str) -> Dict[str, Any]:
+        """한 건 다운로드 (재시도 포함). 결과 상태를 반환"""
+        with self._lock:
+            attempts = self._progress['items'].get(rcept_no, {}).get('attempts', 0)
+        retries = 0
+        while not self._stop.is_set():
+            attempts += 1
+            started = time.perf_counter()
+            try:
+                with request_priority(PRIORITY_BULK):
+                    downloaded = fetch_zip('document.xml', {'rcept_no': rcept_no}, self.download_folder)
+            except DartDownloadError as e:
+                if e.status == '020' and not e.retryable:
+                    # 공용 장부 기준 일일 한도 소진 (다른 세션 사용량 포함): 다음 실행에서 이어서 처리
+                    self._stop.set()
+                    logger.warning(f"DART 일일 요청 한도에 도달하여 대량 다운로드를 중단합니다: {e}")
+                    break
+                if e.retryable and retries < self.max_retries:
+                    delay = self._backoff(retries)
+                    retries += 1
+                    logger.info(f"{rcept_no} 재시도 {retries}/{self.max_retries} ({delay:.1f}초 후): {e}")
+                    self._stop.wait(delay)
+                    continue
+                self._record(rcept_no, status='failed', attempts=attempts, error=str(e),
+                             retryable=e.retryable, finished_at=datetime.now().isoformat())
+                return {'status': 'failed', 'retries': retries, 'bytes': 0}
+
+            self._record(rcept_no, status='done', attempts=attempts, error=None,
+                         files=len(downloaded['members']), bytes=downloaded['zip_size'],
+                         seconds=round(time.perf_counter() - started, 3),
+                         finished_at=datetime.now().isoformat())
+            return {'status': 'done', 'retries': retries, 'bytes': downloaded['zip_size']}
+
+        return {'status': 'pending', 'retries': retries, 'bytes': 0}
+
+    def _is_complete(self, rcept_no: str, retry_failed: bool) -> Optional[str]:
+        """이미 처리된 항목이면 건너뛸 사유, 아니면 None"""
+        with self._lock:
+            item = dict(self._progress['items'].get(rcept_no, {}))
+        if item.get('status') == 'done':
+            return 'done'
+        if item.get('status') == 'failed' and not item.get('retryable') and not retry_failed:
+            return 'failed'
+        if is_document_cached(rcept_no, self.download_folder):
+            return 'cached'
+        return None
+
+    def run(self, rcept_nos: Iterable[str], retry_failed: bool = False) -> Dict[str, Any]:
+        """
+        접수번호 목록을 다운로드합니다.
+
+        Args:
+            rcept_nos: 접수번호 목록 (중복은 한 번만 처리)
+            retry_failed: 이전 실행에서 재시도 불가로 실패한 항목도 다시 시도
+
+        Returns:
+            처리 건수, 재시도 횟수, 소요 시간, 처리량 리포트
+        """
+        unique = list(dict.fromkeys(no.strip() for no in rcept_nos if no and no.strip()))
+        pending = []
+        skipped = 0
+        for rcept_no in unique:
+            if self._is_complete(rcept_no, retry_failed):
+                skipped += 1
+            else:
+                pending.append(rcept_no)
+
+        self._stop.clear()
+        counts = {'done': 0, 'failed': 0, 'pending': 0}
+        retries = 0
+        total_bytes = 0
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="dart-bulk") as executor:
+            for outcome in executor.map(self._download_one, pending):
+                counts[outcome['status']] += 1
+                retries += outcome['retries']
+                total_bytes += outcome['bytes']
+        elapsed = time.perf_counter() - started
+
+        self._close_progress()
+        limiter = get_dart_client().rate_limiter.get_metrics()
+
+        return {
+            'requested': len(unique),
+            'skipped': skipped,
+            'downloaded': counts['done'],
+            'failed': counts['failed'],
+            'remaining': counts['pending'],
+            'retries': retries,
+            'bytes': total_bytes,
+            'seconds': round(elapsed, 3),
+            'documents_per_sec': round(counts['done'] / elapsed, 3) if elapsed > 0 else 0.0,
+            'mb_per_sec': round(total_bytes / 1024 / 1024 / elapsed, 3) if elapsed > 0 else 0.0,
+            'quota_used_today': limiter['quota_used_today'],
+            'quota_remaining_today': limiter['quota_remaining_today'],
+            'rate_limiter': limiter,
+            'progress_path': str(self.progress_path),
+        }
+
+    def stop(self):
+        """진행 중인 다운로드는 마치고 나머지는 pending으로 남긴 채 중단"""
+        self._stop.set()
+
+    def failed_items(self) -> List[str]:
+        with self._lock:
+            return [no for no, item in self._progress['items'].items() if item.get('status') == 'failed']
+
+
+def bulk_download_documents(rcept_nos: List[str], download_folder: str = "./downloads", **options) -> Dict[str, Any]:
+    """
+    공시서류를 대량으로 다운로드합니다 (BulkDownloader 옵션을 그대로 전달).
+
+    Returns:
+        처리량 리포트
+    """
+    return BulkDownloader(download_folder, **options).run(rcept_nos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DART 공시서류 대량 다운로드")
+    parser.add_argument("rcept_file", type=Path, help="접수번호가 한 줄에 하나씩 있는 파일")
+    parser.add_argument("--download-folder", default="./downloads")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--progress", default=None, help="진행 상황 JSONL 로그 경로")
+    parser.add_argument("--retry-failed", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    rcept_nos = args.rcept_file.read_text(encoding='utf-8').split()
+    downloader = BulkDownloader(
+        download_folder=args.download_folder,
+        concurrency=args.concurrency,
+        max_retries=args.max_retries,
+        progress_path=args.progress,
+    )
+    report = downloader.run(rcept_nos, retry_failed=args.retry_failed)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
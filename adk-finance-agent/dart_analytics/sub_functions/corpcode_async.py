@@ -0,0 +1,89 @@
+"""
+Async CORPCODE Storage Module
+=============================
+Awaitable facade over ``CorpCodeStorage`` for code running inside an asyncio
+event loop (ADK executes tools on one).
+
+Every call runs on a dedicated thread pool sized to the SQLite connection
+pool, so blocking SQLite and file I/O never stalls the event loop and other
+concurrent sessions keep making progress.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from .corpcode_storage import CorpCodeStorage, get_storage
+
+T = TypeVar("T")
+
+
+class AsyncCorpCodeStorage:
+    """
+    Async wrapper around a ``CorpCodeStorage`` instance.
+    """
+
+    def __init__(self, storage: Optional[CorpCodeStorage] = None, max_workers: Optional[int] = None):
+        """
+        Args:
+            storage: Storage to wrap. Defaults to the process-wide singleton.
+            max_workers: Executor threads. Defaults to the storage's connection pool size.
+        """
+        self.storage = storage if storage is not None else get_storage()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or self.storage.pool_size,
+            thread_name_prefix="corpcode-async",
+        )
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run any blocking callable on the storage executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def get_corp_code(self, corp_name: str) -> Optional[str]:
+        return await self.run(self.storage.get_corp_code, corp_name)
+
+    async def get_corp_codes_bulk(self, corp_names: List[str]) -> Dict[str, Optional[str]]:
+        return await self.run(self.storage.get_corp_codes_bulk, corp_names)
+
+    async def search_corporations(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        return await self.run(self.storage.search_corporations, query, limit)
+
+    async def fuzzy_search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        return await self.run(self.storage.fuzzy_search, query, limit)
+
+    async def autocomplete(self, prefix: str, k: int = 10) -> List[Dict[str, Any]]:
+        return await self.run(self.storage.autocomplete, prefix, k)
+
+    async def get_corporation_info(self, corp_code: str) -> Optional[Dict[str, Any]]:
+        return await self.run(self.storage.get_corporation_info, corp_code)
+
+    async def get_corporations_by_codes(self, corp_codes: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        return await self.run(self.storage.get_corporations_by_codes, corp_codes)
+
+    async def resolve_identifier(self, identifier: str) -> Optional[Dict[str, Any]]:
+        return await self.run(self.storage.resolve_identifier, identifier)
+
+    async def get_statistics(self) -> Dict[str, Any]:
+        return await self.run(self.storage.get_statistics)
+
+    def close(self, wait: bool = True):
+        """Shut down the executor (the wrapped storage stays open)"""
+        self._executor.shutdown(wait=wait)
+
+
+# Singleton instance
+_async_storage_instance = None
+_async_storage_lock = threading.Lock()
+
+
+def get_async_storage() -> AsyncCorpCodeStorage:
+    """Get or create the singleton async storage wrapping ``get_storage()``"""
+    global _async_storage_instance
+    if _async_storage_instance is None:
+        with _async_storage_lock:
+            if _async_storage_instance is None:
+                _async_storage_instance = AsyncCorpCodeStorage()
+    return _async_storage_instance
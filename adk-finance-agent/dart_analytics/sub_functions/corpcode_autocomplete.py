@@ -0,0 +1,155 @@
+"""
+CORPCODE Autocomplete Module
+============================
+Compact, sorted name index of listed corporations for prefix autocomplete.
+
+The index file is a small binary export (replacing the old pretty-printed
+``corpcode_index.json``) that loads into a few parallel Python lists. Korean
+and English names are both indexed under an ASCII-lowercased key; a prefix
+query bisects the sorted keys and ranks the matching range by popularity,
+which takes microseconds for the few thousand listed corporations.
+
+File layout (little endian):
+
+    header   magic, version, generation, record count, key count
+    records  corp_code, stock_code, popularity, UTF-8 corp_name
+    keys     record index, UTF-8 lowercased name key (sorted)
+"""
+
+import heapq
+import os
+import struct
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .corpcode_search_index import ascii_lower
+
+MAGIC = b"CORPAC01"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIQII")
+_RECORD = struct.Struct("<8s6sIH")
+_KEY = struct.Struct("<IH")
+
+# (corp_code, corp_name, corp_eng_name, stock_code, access_count)
+AutocompleteRow = Tuple[str, str, str, str, int]
+
+
+def write_autocomplete_index(path: Path, rows: Iterable[AutocompleteRow], generation: int = 0) -> int:
+    """
+    Write the autocomplete index atomically.
+
+    Args:
+        path: Destination file
+        rows: Listed corporations as (corp_code, corp_name, corp_eng_name, stock_code, access_count)
+        generation: Data generation the rows were read under
+
+    Returns:
+        Number of corporations written
+    """
+    records = bytearray()
+    keys = []
+    count = 0
+    for index, (corp_code, corp_name, corp_eng_name, stock_code, access_count) in enumerate(rows):
+        name = (corp_name or "").encode("utf-8")[:0xFFFF]
+        records += _RECORD.pack(corp_code.encode("ascii"), stock_code.strip().encode("ascii"),
+                                min(access_count or 0, 0xFFFFFFFF), len(name))
+        records += name
+        for key_source in {corp_name, corp_eng_name}:
+            key = ascii_lower((key_source or "").strip())
+            if key:
+                keys.append((key.encode("utf-8")[:0xFFFF], index))
+        count = index + 1
+
+    keys.sort()
+    key_bytes = bytearray()
+    for key, index in keys:
+        key_bytes += _KEY.pack(index, len(key))
+        key_bytes += key
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, generation, count, len(keys)))
+        f.write(records)
+        f.write(key_bytes)
+    os.replace(tmp_path, path)
+    return count
+
+
+class AutocompleteIndex:
+    """
+    In-memory prefix index loaded from an autocomplete index file.
+    """
+
+    def __init__(self, generation: int, codes: List[str], names: List[str], stocks: List[str],
+                 popularity: List[int], keys: List[str], key_records: List[int]):
+        self.generation = generation
+        self._codes = codes
+        self._names = names
+        self._stocks = stocks
+        self._popularity = popularity
+        self._keys = keys
+        self._key_records = key_records
+
+    @classmethod
+    def load(cls, path: Path) -> "AutocompleteIndex":
+        """
+        Raises:
+            ValueError: If the file is not an autocomplete index of a supported version
+        """
+        data = Path(path).read_bytes()
+        magic, version, generation, count, key_count = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Unsupported autocomplete index: {path}")
+
+        offset = _HEADER.size
+        codes, names, stocks, popularity = [], [], [], []
+        for _ in range(count):
+            corp_code, stock_code, score, name_len = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            codes.append(corp_code.rstrip(b"\0").decode("ascii"))
+            stocks.append(stock_code.rstrip(b"\0").decode("ascii"))
+            popularity.append(score)
+            names.append(data[offset:offset + name_len].decode("utf-8"))
+            offset += name_len
+
+        keys, key_records = [], []
+        for _ in range(key_count):
+            index, key_len = _KEY.unpack_from(data, offset)
+            offset += _KEY.size
+            keys.append(data[offset:offset + key_len].decode("utf-8"))
+            key_records.append(index)
+            offset += key_len
+
+        return cls(generation, codes, names, stocks, popularity, keys, key_records)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def complete(self, prefix: str, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Return the ``k`` most popular listed corporations whose Korean or
+        English name starts with ``prefix`` (ASCII case-insensitive).
+        """
+        key = ascii_lower(prefix.strip())
+        if not key or k <= 0:
+            return []
+
+        start = bisect_left(self._keys, key)
+        # Every key with this prefix sorts before prefix + U+10FFFF
+        end = bisect_left(self._keys, key + "\U0010ffff", start)
+        candidates = {self._key_records[position] for position in range(start, end)}
+
+        popularity, names = self._popularity, self._names
+        best = heapq.nsmallest(k, candidates, key=lambda index: (-popularity[index], names[index]))
+        return [
+            {
+                'corp_code': self._codes[index],
+                'corp_name': self._names[index],
+                'stock_code': self._stocks[index],
+                'access_count': self._popularity[index],
+            }
+            for index in best
+        ]
@@ -0,0 +1,210 @@
+"""
+CORPCODE Lookup Cache Module
+============================
+Bounded in-memory cache for corporation lookups with LRU and TTL eviction.
+
+Every entry is tagged with the data generation it was read under. Bumping the
+generation (after an import or sync) invalidates all older entries in O(1);
+they are dropped lazily when next touched or evicted. Persistence is optional
+and only writes a snapshot when the cache has changed since the last save.
+"""
+
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Snapshot layout version; snapshots with a different version are ignored
+_SNAPSHOT_VERSION = 1
+
+
+class LookupCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and generation tags.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: Optional[float] = 3600.0, generation: int = 0):
+        """
+        Args:
+            max_size: Maximum number of entries kept before LRU eviction
+            ttl: Seconds an entry stays valid, or None for no expiry
+            generation: Data generation new entries are tagged with
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._generation = generation
+        # key -> (value, expires_at, generation); most recently used last
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for ``key``, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, generation = entry
+            if generation != self._generation:
+                del self._entries[key]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Store ``value`` under ``key``, evicting the least recently used entry if full"""
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at, self._generation)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._dirty = True
+
+    def invalidate(self, predicate: Optional[Callable[[Any], bool]] = None) -> int:
+        """
+        Drop entries whose value matches ``predicate`` (all entries if omitted).
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if predicate is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                keys = [key for key, (value, _, _) in self._entries.items() if predicate(value)]
+                for key in keys:
+                    del self._entries[key]
+                removed = len(keys)
+            self.invalidations += removed
+            if removed:
+                self._dirty = True
+            return removed
+
+    def set_generation(self, generation: int, retain: Optional[Callable[[Any], bool]] = None):
+        """
+        Move the cache to a new data generation.
+
+        Args:
+            generation: New generation number
+            retain: Optional predicate selecting entries known to be unaffected;
+                they are re-tagged instead of being invalidated
+        """
+        with self._lock:
+            if retain is not None:
+                for key, (value, expires_at, entry_generation) in self._entries.items():
+                    if entry_generation == self._generation and retain(value):
+                        self._entries[key] = (value, expires_at, generation)
+            self._generation = generation
+            self._dirty = True
+
+    def save(self, path: Path) -> bool:
+        """
+        Write live entries to ``path`` if anything changed since the last save.
+
+        Returns:
+            True if a snapshot was written
+        """
+        with self._lock:
+            if not self._dirty:
+                return False
+            now = time.time()
+            entries = [
+                (key, value, expires_at)
+                for key, (value, expires_at, generation) in self._entries.items()
+                if generation == self._generation and (expires_at is None or expires_at > now)
+            ]
+            snapshot = {'version': _SNAPSHOT_VERSION, 'generation': self._generation, 'entries': entries}
+            self._dirty = False
+
+        tmp_path = Path(f"{path}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save cache: {e}")
+            self._dirty = True
+            return False
+
+    def load(self, path: Path) -> int:
+        """
+        Restore entries saved for the current generation.
+
+        Returns:
+            Number of entries loaded
+        """
+        if not Path(path).exists():
+            return 0
+        try:
+            with open(path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load cache: {e}")
+            return 0
+
+        if not isinstance(snapshot, dict) or snapshot.get('version') != _SNAPSHOT_VERSION:
+            return 0
+        if snapshot.get('generation') != self._generation:
+            return 0
+
+        now = time.time()
+        with self._lock:
+            for key, value, expires_at in snapshot['entries'][-self.max_size:]:
+                if expires_at is None or expires_at > now:
+                    self._entries[key] = (value, expires_at, self._generation)
+            return len(self._entries)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return cache counters for monitoring"""
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            'size': size,
+            'max_size': self.max_size,
+            'ttl': self.ttl,
+            'generation': self._generation,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+        }
@@ -0,0 +1,280 @@
+"""
+CORPCODE Fuzzy Matching Module
+==============================
+Korean-aware approximate matching of corporation names.
+
+Names are normalised (legal-entity markers such as "(주)" or "주식회사",
+spacing and punctuation removed) and decomposed into jamo, so a typo inside a
+syllable ("삼셩전자") costs one edit instead of a whole syllable. Candidates
+are gathered from a jamo-trigram inverted index and ranked by jamo edit
+distance. Trigrams shared by too many names ("ㅈㅓㄴ" of 전자, "ㅎㅗㅣ" of 회사)
+carry no signal and are dropped as stop-grams instead of being scanned.
+Choseong-only queries ("ㅅㅅㅈㅈ") are served by a separate choseong index.
+"""
+
+import bisect
+import re
+import threading
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Hangul syllable composition constants (Unicode 3.0, section 3.12)
+_SYLLABLE_BASE = 0xAC00
+_SYLLABLE_END = 0xD7A3
+_JUNGSEONG_COUNT = 21
+_JONGSEONG_COUNT = 28
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+             "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+_CHOSEONG_SET = set(CHOSEONG)
+
+# Legal-entity markers that users add or omit freely
+_ENTITY_MARKERS = re.compile(
+    r"\(주\)|㈜|\(유\)|\(사\)|\(재\)|\(합\)|주식회사|유한회사|유한책임회사|사단법인|재단법인|합자회사|합명회사"
+)
+_ENGLISH_SUFFIXES = re.compile(
+    r"\b(co|ltd|inc|corp|corporation|company|limited|llc|plc)\b\.?"
+)
+_NON_WORD = re.compile(r"[^0-9a-z가-힣ㄱ-ㅣ]+")
+
+_GRAM_SIZE = 3
+
+
+def decompose_jamo(text: str) -> str:
+    """Split Hangul syllables into their jamo; other characters pass through"""
+    out = []
+    for char in text:
+        code = ord(char)
+        if _SYLLABLE_BASE <= code <= _SYLLABLE_END:
+            offset = code - _SYLLABLE_BASE
+            out.append(CHOSEONG[offset // (_JUNGSEONG_COUNT * _JONGSEONG_COUNT)])
+            out.append(JUNGSEONG[(offset % (_JUNGSEONG_COUNT * _JONGSEONG_COUNT)) // _JONGSEONG_COUNT])
+            out.append(JONGSEONG[offset % _JONGSEONG_COUNT])
+        else:
+            out.append(char)
+    return "".join(out)
+
+
+def extract_choseong(text: str) -> str:
+    """Replace each Hangul syllable with its initial consonant"""
+    out = []
+    for char in text:
+        code = ord(char)
+        if _SYLLABLE_BASE <= code <= _SYLLABLE_END:
+            out.append(CHOSEONG[(code - _SYLLABLE_BASE) // (_JUNGSEONG_COUNT * _JONGSEONG_COUNT)])
+        else:
+            out.append(char)
+    return "".join(out)
+
+
+def is_choseong_query(text: str) -> bool:
+    """Whether the query consists only of initial consonants, e.g. "ㅅㅅㅈㅈ" """
+    chars = [char for char in text if not char.isspace()]
+    return bool(chars) and all(char in _CHOSEONG_SET for char in chars)
+
+
+def normalize_name(name: str) -> str:
+    """Drop entity markers, spacing and punctuation; lowercase ASCII"""
+    if not name:
+        return ""
+    name = _ENTITY_MARKERS.sub("", name).lower()
+    name = _ENGLISH_SUFFIXES.sub("", name)
+    return _NON_WORD.sub("", name)
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance between two strings"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            ))
+        previous = current
+    return previous[-1]
+
+
+def _grams(jamo: str) -> set:
+    padded = f"^{jamo}$"
+    return {padded[i:i + _GRAM_SIZE] for i in range(len(padded) - _GRAM_SIZE + 1)}
+
+
+class FuzzyCorpIndex:
+    """
+    Precomputed fuzzy index over corporation names.
+
+    Memory stays compact: postings are ``array('I')`` of entry ids. Grams found
+    in more than ``max_posting`` names are stop-grams and are not indexed, so a
+    query only scans postings of at most ``max_posting`` ids and every entry
+    sharing an indexed gram with the query stays a candidate.
+    """
+
+    def __init__(self, max_posting: int = 4000, max_candidates: int = 60, min_score: float = 0.5):
+        self.max_posting = max_posting
+        self.max_candidates = max_candidates
+        self.min_score = min_score
+        self._entries: List[Tuple[str, str, str]] = []
+        self._keys: List[Tuple[str, ...]] = []
+        self._exact: Dict[str, List[int]] = {}
+        self._postings: Dict[str, array] = {}
+        self._stop_grams: set = set()
+        self._choseong: List[Tuple[str, int]] = []
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[str, str, str, str]], **kwargs) -> "FuzzyCorpIndex":
+        """
+        Build the index from (corp_code, corp_name, corp_eng_name, stock_code) rows.
+        """
+        index = cls(**kwargs)
+        postings: Dict[str, List[int]] = {}
+        for corp_code, corp_name, corp_eng_name, stock_code in rows:
+            entry_id = len(index._entries)
+            index._entries.append((corp_code, corp_name, (stock_code or "").strip()))
+
+            keys = tuple(dict.fromkeys(
+                key for key in (normalize_name(corp_name), normalize_name(corp_eng_name or "")) if key
+            ))
+            index._keys.append(tuple(decompose_jamo(key) for key in keys))
+
+            for key in keys:
+                index._exact.setdefault(key, []).append(entry_id)
+                for gram in _grams(decompose_jamo(key)):
+                    postings.setdefault(gram, []).append(entry_id)
+
+            choseong = extract_choseong(normalize_name(corp_name))
+            if choseong:
+                index._choseong.append((choseong, entry_id))
+
+        for gram, ids in postings.items():
+            if len(ids) > index.max_posting:
+                index._stop_grams.add(gram)
+            else:
+                index._postings[gram] = array("I", ids)
+        index._choseong.sort()
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def search(self, query: str, limit: int = 5) -> List[Dict[str, object]]:
+        """
+        Return the top ``limit`` candidates for a possibly misspelled name.
+        
+        Args:
+            query: Corporation name, variant spelling or choseong string
+            limit: Maximum number of candidates
+            
+        Returns:
+            Candidates with corp_code, corp_name, stock_code, score (0-1) and match_type
+        """
+        if is_choseong_query(query):
+            return self._search_choseong(query.replace(" ", ""), limit)
+
+        normalized = normalize_name(query)
+        if not normalized:
+            return []
+
+        scored: Dict[int, Tuple[float, str]] = {}
+        for entry_id in self._exact.get(normalized, []):
+            scored[entry_id] = (1.0, "normalized")
+
+        query_jamo = decompose_jamo(normalized)
+        for entry_id in self._candidates(query_jamo):
+            if entry_id in scored:
+                continue
+            best = 0.0
+            for key_jamo in self._keys[entry_id]:
+                distance = edit_distance(query_jamo, key_jamo)
+                best = max(best, 1.0 - distance / max(len(query_jamo), len(key_jamo)))
+            if best >= self.min_score:
+                scored[entry_id] = (best, "fuzzy")
+
+        return self._top(scored, limit)
+
+    def _candidates(self, query_jamo: str) -> List[int]:
+        """Entry ids sharing the most jamo trigrams with the query"""
+        # Stop-grams were never indexed, so only informative grams are scanned, in full
+        postings = [self._postings[gram] for gram in _grams(query_jamo) if gram in self._postings]
+        if not postings:
+            return []
+
+        counts: Counter = Counter()
+        for posting in postings:
+            counts.update(posting)
+
+        return [entry_id for entry_id, _ in counts.most_common(self.max_candidates)]
+
+    def _search_choseong(self, query: str, limit: int) -> List[Dict[str, object]]:
+        scored: Dict[int, Tuple[float, str]] = {}
+        start = bisect.bisect_left(self._choseong, (query, -1))
+        for choseong, entry_id in self._choseong[start:start + self.max_candidates]:
+            if not choseong.startswith(query):
+                break
+            if choseong == query:
+                scored[entry_id] = (1.0, "choseong")
+            else:
+                scored[entry_id] = (len(query) / len(choseong), "choseong_prefix")
+        return self._top(scored, limit)
+
+    def _top(self, scored: Dict[int, Tuple[float, str]], limit: int) -> List[Dict[str, object]]:
+        ranked = sorted(
+            scored.items(),
+            key=lambda item: (-item[1][0], len(self._entries[item[0]][1]), self._entries[item[0]][1])
+        )
+        results = []
+        for entry_id, (score, match_type) in ranked[:limit]:
+            corp_code, corp_name, stock_code = self._entries[entry_id]
+            results.append({
+                'corp_code': corp_code,
+                'corp_name': corp_name,
+                'stock_code': stock_code,
+                'score': round(score, 3),
+                'match_type': match_type,
+            })
+        return results
+
+
+class LazyFuzzyIndex:
+    """
+    Builds a FuzzyCorpIndex on first use and rebuilds it after invalidation.
+
+    Nothing is built until the first fuzzy lookup, so workers that never
+    serve one never pay for the index.
+    """
+
+    def __init__(self, loader):
+        """
+        Args:
+            loader: Callable returning (corp_code, corp_name, corp_eng_name, stock_code) rows
+        """
+        self._loader = loader
+        self._index: Optional[FuzzyCorpIndex] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self) -> FuzzyCorpIndex:
+        index = self._index
+        if index is None:
+            with self._lock:
+                while self._index is None:
+                    generation = self._generation
+                    built = FuzzyCorpIndex.build(self._loader())
+                    # Rows read before an invalidation are stale; build again
+                    if generation == self._generation:
+                        self._index = built
+                index = self._index
+        return index
+
+    def invalidate(self):
+        self._generation += 1
+        self._index = None
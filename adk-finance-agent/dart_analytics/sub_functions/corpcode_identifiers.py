@@ -0,0 +1,163 @@
+"""
+Corporation Identifier Index Module
+===================================
+In-process translation between the identifiers used by the DART and stock
+agents: DART ``corp_code`` (8 digits), KRX ``stock_code`` (6 characters),
+``ISIN`` (12 characters) and corporation name.
+
+ISINs are derived from the KRX short code: ``KR7`` + stock_code + ``00`` +
+check digit, which is the form KRX assigns to common shares listed in
+CORPCODE.xml.
+"""
+
+import re
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+ISIN_PREFIX = "KR7"
+ISIN_SUFFIX = "00"
+
+_STOCK_CODE_RE = re.compile(r"^[0-9A-Z]{6}$")
+_CORP_CODE_RE = re.compile(r"^\d{8}$")
+_ISIN_RE = re.compile(r"^[A-Z]{2}[0-9A-Z]{9}\d$")
+
+# (corp_code, corp_name, stock_code)
+IdentifierRow = Tuple[str, str, str]
+
+
+def isin_check_digit(body: str) -> int:
+    """Luhn check digit over an 11-character ISIN body (letters count as 10-35)"""
+    digits = "".join(str(int(char, 36)) for char in body.upper())
+    total = 0
+    for position, char in enumerate(reversed(digits)):
+        value = int(char)
+        if position % 2 == 0:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return (10 - total % 10) % 10
+
+
+def is_valid_isin(isin: str) -> bool:
+    isin = isin.strip().upper()
+    return bool(_ISIN_RE.match(isin)) and isin_check_digit(isin[:11]) == int(isin[11])
+
+
+def stock_code_to_isin(stock_code: str) -> Optional[str]:
+    """
+    Derive the ISIN of a KRX-listed common share.
+
+    Args:
+        stock_code: Six-character KRX short code (e.g. "005930")
+
+    Returns:
+        ISIN such as "KR7005930003", or None if the code is malformed
+    """
+    stock_code = (stock_code or "").strip().upper()
+    if not _STOCK_CODE_RE.match(stock_code):
+        return None
+    body = f"{ISIN_PREFIX}{stock_code}{ISIN_SUFFIX}"
+    return f"{body}{isin_check_digit(body)}"
+
+
+def isin_to_stock_code(isin: str) -> Optional[str]:
+    """Return the KRX short code embedded in a Korean ISIN, or None"""
+    isin = (isin or "").strip().upper()
+    if not isin.startswith("KR") or not is_valid_isin(isin):
+        return None
+    return isin[3:9]
+
+
+def classify_identifier(identifier: str) -> str:
+    """
+    Guess what kind of identifier a string is.
+
+    Returns:
+        One of 'isin', 'corp_code', 'stock_code' or 'name'
+    """
+    value = identifier.strip().upper()
+    if len(value) == 12 and is_valid_isin(value):
+        return 'isin'
+    if _CORP_CODE_RE.match(value):
+        return 'corp_code'
+    if _STOCK_CODE_RE.match(value) and any(char.isdigit() for char in value):
+        return 'stock_code'
+    return 'name'
+
+
+class CorpIdentifierIndex:
+    """
+    Hash maps between corp_code, stock_code, ISIN and name (O(1) lookups).
+    """
+
+    def __init__(self, generation: int = 0):
+        self.generation = generation
+        self._by_corp_code: Dict[str, Tuple[str, str]] = {}
+        self._by_stock_code: Dict[str, str] = {}
+        self._by_name: Dict[str, str] = {}
+
+    @classmethod
+    def build(cls, rows: Iterable[IdentifierRow], generation: int = 0) -> "CorpIdentifierIndex":
+        """
+        Args:
+            rows: (corp_code, corp_name, stock_code) rows of active corporations
+            generation: Data generation the rows were read under
+        """
+        index = cls(generation)
+        for corp_code, corp_name, stock_code in rows:
+            stock_code = (stock_code or "").strip()
+            index._by_corp_code[corp_code] = (corp_name, stock_code)
+            if stock_code:
+                index._by_stock_code[stock_code] = corp_code
+            # Prefer the listed corporation when several share a name, then the lower
+            # corp_code (same tie-break as the snapshot and the SQL lookups)
+            current = index._by_name.get(corp_name)
+            if current is None or (not stock_code, corp_code) < (not index._by_corp_code[current][1], current):
+                index._by_name[corp_name] = corp_code
+        return index
+
+    def __len__(self) -> int:
+        return len(self._by_corp_code)
+
+    def _entry(self, corp_code: Optional[str]) -> Optional[Dict[str, Any]]:
+        if corp_code is None or corp_code not in self._by_corp_code:
+            return None
+        corp_name, stock_code = self._by_corp_code[corp_code]
+        return {
+            'corp_code': corp_code,
+            'corp_name': corp_name,
+            'stock_code': stock_code,
+            'isin': stock_code_to_isin(stock_code) if stock_code else None,
+        }
+
+    def by_corp_code(self, corp_code: str) -> Optional[Dict[str, Any]]:
+        return self._entry(corp_code.strip())
+
+    def by_stock_code(self, stock_code: str) -> Optional[Dict[str, Any]]:
+        return self._entry(self._by_stock_code.get(stock_code.strip().upper()))
+
+    def by_isin(self, isin: str) -> Optional[Dict[str, Any]]:
+        stock_code = isin_to_stock_code(isin)
+        return self.by_stock_code(stock_code) if stock_code else None
+
+    def by_name(self, corp_name: str) -> Optional[Dict[str, Any]]:
+        return self._entry(self._by_name.get(corp_name.strip()))
+
+    def resolve(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        Translate any supported identifier into all the others.
+
+        Args:
+            identifier: corp_code, stock_code, ISIN or exact corporation name
+
+        Returns:
+            Dict with corp_code, corp_name, stock_code and isin, or None
+        """
+        kind = classify_identifier(identifier)
+        if kind == 'isin':
+            return self.by_isin(identifier)
+        if kind == 'corp_code':
+            return self.by_corp_code(identifier) or self.by_name(identifier)
+        if kind == 'stock_code':
+            return self.by_stock_code(identifier) or self.by_name(identifier)
+        return self.by_name(identifier)
@@ -0,0 +1,98 @@
+"""
+CORPCODE Popularity Module
+==========================
+Top-K most accessed corporations, maintained incrementally from the access
+counts written by the write-behind flusher.
+
+Access counts only grow, so a corporation outside the top K can only enter it
+through an update the tracker observes. Keeping the K best entries in a dict
+plus a min-heap (with lazily discarded stale entries) therefore yields the
+exact ranking without ever sorting the corporations table.
+"""
+
+import heapq
+import threading
+from typing import Any, Dict, Iterable, List, Tuple
+
+# (corp_code, corp_name, stock_code, access_count)
+PopularityRow = Tuple[str, str, str, int]
+
+
+class TopKTracker:
+    """
+    Thread-safe top-K ranking of corporations by access count.
+    """
+
+    def __init__(self, capacity: int = 100):
+        """
+        Args:
+            capacity: Number of corporations kept in the ranking
+        """
+        self.capacity = capacity
+        self._entries: Dict[str, Tuple[int, str, str]] = {}
+        self._heap: List[Tuple[int, str]] = []
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def load(self, rows: Iterable[PopularityRow]):
+        """Replace the ranking with rows read from the database"""
+        with self._lock:
+            self._entries = {}
+            self._heap = []
+            for corp_code, corp_name, stock_code, access_count in rows:
+                self._add(corp_code, corp_name, stock_code, access_count)
+            self.loaded = True
+
+    def update(self, rows: Iterable[PopularityRow]):
+        """Apply the new absolute access counts of recently accessed corporations"""
+        with self._lock:
+            for corp_code, corp_name, stock_code, access_count in rows:
+                self._add(corp_code, corp_name, stock_code, access_count)
+
+    def discard(self, corp_codes: Iterable[str]):
+        """Drop corporations that no longer exist (their heap entries go stale)"""
+        with self._lock:
+            for corp_code in corp_codes:
+                self._entries.pop(corp_code, None)
+
+    def _add(self, corp_code: str, corp_name: str, stock_code: str, access_count: int):
+        if access_count <= 0:
+            return
+        if corp_code not in self._entries and len(self._entries) >= self.capacity:
+            if access_count <= self._min_count():
+                return
+            self._evict_min()
+        self._entries[corp_code] = (access_count, corp_name, stock_code)
+        heapq.heappush(self._heap, (access_count, corp_code))
+        if len(self._heap) > 4 * self.capacity + 16:
+            # Rebuild from the live entries so stale heap entries cannot pile up
+            self._heap = [(count, code) for code, (count, _, _) in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def _prune(self):
+        # Discard heap entries whose corporation left the ranking or has a newer count
+        while self._heap:
+            count, corp_code = self._heap[0]
+            entry = self._entries.get(corp_code)
+            if entry is not None and entry[0] == count:
+                return
+            heapq.heappop(self._heap)
+
+    def _min_count(self) -> int:
+        self._prune()
+        return self._heap[0][0] if self._heap else 0
+
+    def _evict_min(self):
+        self._prune()
+        if self._heap:
+            _, corp_code = heapq.heappop(self._heap)
+            del self._entries[corp_code]
+
+    def top(self, limit: int) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` corporations, most accessed first"""
+        with self._lock:
+            ranked = heapq.nlargest(limit, self._entries.items(), key=lambda item: item[1][0])
+        return [
+            {'corp_code': corp_code, 'corp_name': corp_name, 'stock_code': stock_code, 'access_count': count}
+            for corp_code, (count, corp_name, stock_code) in ranked
+        ]
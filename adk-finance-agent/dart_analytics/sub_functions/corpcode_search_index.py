@@ -0,0 +1,164 @@
+"""
+CORPCODE Search Index Module
+============================
+Bigram inverted index over corporation names and codes, stored in SQLite next
+to the corporations table.
+
+A ``LIKE '%q%'`` predicate cannot use a B-tree index and scans every row. The
+index maps each character bigram of ``corp_name``, ``corp_code`` and
+``stock_code`` to the corporations containing it, so a substring query only
+touches rows that contain all of its bigrams. Bigrams (rather than FTS5's
+trigram tokenizer) are used because most Korean partial-name queries are two
+syllables long, e.g. "삼성" or "현대", which a trigram index cannot serve.
+"""
+
+import string
+from typing import Iterable, Iterator, Set, Tuple
+
+GRAM_SIZE = 2
+
+# SQLite's lower() and LIKE only fold ASCII letters; mirror that exactly so the
+# index matches what the LIKE-based search used to return.
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS corp_name_grams (
+        gram TEXT NOT NULL,
+        corp_code TEXT NOT NULL,
+        PRIMARY KEY (gram, corp_code)
+    ) WITHOUT ROWID
+'''
+
+_SQL_INSERT_GRAM = "INSERT OR IGNORE INTO corp_name_grams (gram, corp_code) VALUES (?, ?)"
+
+
+def ascii_lower(text: str) -> str:
+    """Lowercase ASCII letters only, like SQLite's lower()"""
+    return text.translate(_ASCII_LOWER)
+
+
+def extract_ngrams(text: str, size: int = GRAM_SIZE) -> Set[str]:
+    """Return the set of character n-grams of ``text`` (case-folded)"""
+    text = ascii_lower(text)
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def record_ngrams(corp_code: str, corp_name: str, stock_code: str) -> Set[str]:
+    """Return every indexed gram for one corporation"""
+    grams = extract_ngrams(corp_name)
+    grams |= extract_ngrams(corp_code)
+    grams |= extract_ngrams((stock_code or '').strip())
+    return grams
+
+
+def iter_gram_rows(records: Iterable[Tuple[str, str, str]]) -> Iterator[Tuple[str, str]]:
+    """Yield (gram, corp_code) rows for (corp_code, corp_name, stock_code) records"""
+    for corp_code, corp_name, stock_code in records:
+        for gram in record_ngrams(corp_code, corp_name, stock_code):
+            yield gram, corp_code
+
+
+def is_indexable(query: str) -> bool:
+    """Whether the query can be answered from the index instead of a LIKE scan"""
+    # LIKE wildcards in the query changed the old semantics; keep those on the scan path
+    return len(query) >= GRAM_SIZE and '%' not in query and '_' not in query
+
+
+def add_records(conn, records: Iterable[Tuple[str, str, str]]):
+    """Index new (corp_code, corp_name, stock_code) records"""
+    conn.executemany(_SQL_INSERT_GRAM, iter_gram_rows(records))
+
+
+def rebuild(conn, batch_size: int = 5000) -> int:
+    """
+    Rebuild the whole index from the corporations table.
+    
+    Args:
+        conn: Open SQLite connection; the caller commits
+        batch_size: Corporations indexed per executemany call
+        
+    Returns:
+        Number of corporations indexed
+    """
+    conn.execute("DELETE FROM corp_name_grams")
+    cursor = conn.execute("SELECT corp_code, corp_name, stock_code FROM corporations WHERE is_deleted = 0")
+
+    indexed = 0
+    while True:
+        records = cursor.fetchmany(batch_size)
+        if not records:
+            break
+        add_records(conn, records)
+        indexed += len(records)
+    return indexed
+
+
+def _delete_current(conn, corp_codes: Iterable[str]):
+    """Delete the grams of the rows currently stored for ``corp_codes``"""
+    # Deleting by full primary key avoids scanning the table by corp_code
+    rows = []
+    for corp_code in corp_codes:
+        stored = conn.execute(
+            "SELECT corp_code, corp_name, stock_code FROM corporations WHERE corp_code = ?", (corp_code,)
+        ).fetchone()
+        if stored:
+            rows.extend(iter_gram_rows([stored]))
+    conn.executemany("DELETE FROM corp_name_grams WHERE gram = ? AND corp_code = ?", rows)
+
+
+def update_records(conn, records: Iterable[Tuple[str, str, str]]):
+    """
+    Replace the index rows of the given (corp_code, corp_name, stock_code)
+    records. Call before the corporations rows themselves are updated.
+    """
+    records = list(records)
+    _delete_current(conn, [record[0] for record in records])
+    add_records(conn, records)
+
+
+def remove_records(conn, corp_codes: Iterable[str]):
+    """Drop the index rows of the given corporations (before deleting the rows)"""
+    _delete_current(conn, corp_codes)
+
+
+def build_search_query(query: str, columns: str, limit: int) -> Tuple[str, tuple]:
+    """
+    Build an indexed substring search with the same ranking as the LIKE search:
+    exact name match, then name prefix, then access_count.
+    
+    Args:
+        query: Substring to look for (must satisfy ``is_indexable``)
+        columns: Column list selected from corporations (aliased ``c``)
+        limit: Maximum number of rows
+        
+    Returns:
+        SQL text and parameters
+    """
+    grams = sorted(extract_ngrams(query))
+    needle = ascii_lower(query)
+    placeholders = ", ".join("?" for _ in grams)
+    sql = f'''
+        SELECT {columns}
+        FROM corporations c
+        JOIN (
+            SELECT corp_code
+            FROM corp_name_grams
+            WHERE gram IN ({placeholders})
+            GROUP BY corp_code
+            HAVING COUNT(*) = ?
+        ) g ON g.corp_code = c.corp_code
+        WHERE (instr(lower(c.corp_name), ?) > 0
+               OR instr(c.corp_code, ?) > 0
+               OR instr(lower(c.stock_code), ?) > 0)
+          AND c.is_deleted = 0
+        ORDER BY
+            CASE
+                WHEN c.corp_name = ? THEN 1
+                WHEN c.corp_name LIKE ? THEN 2
+                ELSE 3
+            END,
+            c.access_count DESC
+        LIMIT ?
+    '''
+    params = (*grams, len(grams), needle, needle, needle, query, f'{query}%', limit)
+    return sql, params
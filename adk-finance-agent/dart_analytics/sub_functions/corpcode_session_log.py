@@ -0,0 +1,160 @@
+"""
+CORPCODE Session Log Module
+===========================
+Append-only search-session log split into daily JSON Lines segments.
+
+Each event is one compact line appended to the current day's segment, so the
+write cost per event is constant. Segments from previous days are compacted
+with gzip and dropped once they fall outside the retention window.
+
+    storage/sessions/sessions-20250101.jsonl.gz
+    storage/sessions/sessions-20250102.jsonl      <- current segment
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SEGMENT_RE = re.compile(r"^sessions-(\d{8})\.jsonl(\.gz)?$")
+
+
+class SessionLog:
+    """
+    Daily-segmented, append-only log of search-session events.
+    """
+
+    def __init__(self, log_dir: Path, retention_days: int = 30):
+        """
+        Args:
+            log_dir: Directory holding the segment files
+            retention_days: Days of segments kept by ``compact``
+        """
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+
+    def _segment_path(self, day: str) -> Path:
+        return self.log_dir / f"sessions-{day}.jsonl"
+
+    def segments(self) -> List[Tuple[str, Path]]:
+        """Return (YYYYMMDD, path) of every segment, oldest first"""
+        found = {}
+        for path in self.log_dir.iterdir():
+            match = _SEGMENT_RE.match(path.name)
+            if match:
+                day = match.group(1)
+                # Prefer the plain segment if a compaction was interrupted
+                if day not in found or not match.group(2):
+                    found[day] = path
+        return sorted(found.items())
+
+    def append(self, events: Iterable[Dict[str, Any]]) -> int:
+        """
+        Append events to the segment of their day.
+
+        Args:
+            events: Dicts with an ISO-8601 ``timestamp`` key
+
+        Returns:
+            Number of events written
+        """
+        by_day: Dict[str, List[str]] = {}
+        for event in events:
+            day = str(event['timestamp'])[:10].replace("-", "")
+            by_day.setdefault(day, []).append(json.dumps(event, ensure_ascii=False, separators=(",", ":")))
+
+        written = 0
+        with self._lock:
+            for day, lines in by_day.items():
+                with open(self._segment_path(day), "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+                written += len(lines)
+        return written
+
+    @staticmethod
+    def _read_segment(path: Path) -> Iterator[Dict[str, Any]]:
+        opener = gzip.open if path.suffix == ".gz" else open
+        try:
+            with opener(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash; skip it
+                        continue
+        except (OSError, EOFError) as e:
+            logger.warning(f"Failed to read session segment {path}: {e}")
+
+    def tail(self, limit: int) -> List[Dict[str, Any]]:
+        """Return the last ``limit`` events, oldest first"""
+        events: deque = deque(maxlen=limit)
+        collected: List[Dict[str, Any]] = []
+        for _, path in reversed(self.segments()):
+            events.clear()
+            events.extend(self._read_segment(path))
+            collected = list(events) + collected
+            if len(collected) >= limit:
+                break
+        return collected[-limit:]
+
+    def window(self, start: datetime, end: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield events with ``start <= timestamp < end``, reading only the segments
+        of the days in range.
+        """
+        end = end or datetime.now() + timedelta(seconds=1)
+        first_day, last_day = start.strftime("%Y%m%d"), end.strftime("%Y%m%d")
+        start_iso, end_iso = start.isoformat(), end.isoformat()
+        for day, path in self.segments():
+            if first_day <= day <= last_day:
+                for event in self._read_segment(path):
+                    if start_iso <= event['timestamp'] < end_iso:
+                        yield event
+
+    def compact(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Gzip finished segments and delete those outside the retention window.
+
+        Returns:
+            Counts of compressed and deleted segments
+        """
+        now = now or datetime.now()
+        today = now.strftime("%Y%m%d")
+        cutoff = (now - timedelta(days=self.retention_days)).strftime("%Y%m%d")
+        stats = {'compressed': 0, 'deleted': 0}
+
+        with self._lock:
+            for path in list(self.log_dir.iterdir()):
+                match = _SEGMENT_RE.match(path.name)
+                if not match:
+                    continue
+                day, compressed = match.group(1), bool(match.group(2))
+                if day < cutoff:
+                    path.unlink()
+                    stats['deleted'] += 1
+                elif not compressed and day < today:
+                    gz_path = path.with_name(path.name + ".gz")
+                    tmp_path = path.with_name(path.name + ".gz.tmp")
+                    with open(path, "rb") as src, gzip.open(tmp_path, "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+                    os.replace(tmp_path, gz_path)
+                    path.unlink()
+                    stats['compressed'] += 1
+        return stats
+
+    def size_bytes(self) -> int:
+        return sum(path.stat().st_size for _, path in self.segments())
@@ -0,0 +1,255 @@
+"""
+CORPCODE Multi-Process Coordination Module
+==========================================
+Lets every worker process on a host (uvicorn/gunicorn workers, the DART and
+ECOS agents) share one warm copy of the corporation data and one SQLite
+writer.
+
+- A non-blocking file lock elects a single *stats writer*. Other processes
+  spool their access statistics and search sessions to small JSON Lines
+  files that the writer ingests, so SQLite sees one serialised writer.
+- A generation file, bumped after every import or sync, lets processes
+  detect new data with a single ``stat`` call.
+- The memory-mapped corporation snapshot is the shared read cache: all
+  workers map the same file and share its pages through the page cache.
+"""
+
+import json
+import logging
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .corpcode_snapshot import CorpCodeSnapshot, open_snapshot
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+
+class FileLock:
+    """Exclusive advisory lock on a file, held until ``release`` or process exit"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Args:
+            blocking: Wait for the lock instead of failing immediately
+
+        Returns:
+            True if the lock is now held by this process
+        """
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    @property
+    def replaced(self) -> bool:
+        """True if the held file was unlinked or replaced since it was opened (the lock no longer excludes anyone)"""
+        try:
+            return not os.path.samestat(os.fstat(self._fd), os.stat(self.path))
+        except OSError:
+            return True
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+
+class SharedCoordinator:
+    """
+    Writer election, generation publishing, stats spooling and the shared
+    snapshot for one storage directory.
+    """
+
+    def __init__(self, storage_dir: Path, snapshot_path: Path):
+        """
+        Args:
+            storage_dir: Directory shared by all processes using the storage
+            snapshot_path: Memory-mapped snapshot used as the shared read cache
+        """
+        self.storage_dir = Path(storage_dir)
+        self.snapshot_path = Path(snapshot_path)
+        self.generation_path = self.storage_dir / "generation"
+        self.spool_dir = self.storage_dir / "spool"
+        self.spool_dir.mkdir(exist_ok=True)
+
+        self._writer_lock = FileLock(self.storage_dir / "writer.lock")
+        self._import_lock_path = self.storage_dir / "import.lock"
+        self._snapshot: Optional[CorpCodeSnapshot] = None
+        self._snapshot_lock = threading.Lock()
+        # (generation, snapshot mtime) of the last failed open, to avoid retrying per lookup
+        self._snapshot_miss: Optional[Tuple[int, Optional[int]]] = None
+        self._generation_mtime: Optional[int] = None
+        self._generation = 0
+
+        self.spooled_events = 0
+        self.ingested_files = 0
+
+    # Writer election --------------------------------------------------------
+
+    def is_writer(self) -> bool:
+        """Return True if this process is (or just became) the stats writer"""
+        return self._writer_lock.held or self._writer_lock.acquire(blocking=False)
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        """Serialise imports and syncs across processes"""
+        lock = FileLock(self._import_lock_path)
+        lock.acquire(blocking=True)
+        try:
+            yield
+        finally:
+            lock.release()
+
+    def close(self):
+        self._writer_lock.release()
+        with self._snapshot_lock:
+            if self._snapshot is not None:
+                self._snapshot.close()
+                self._snapshot = None
+
+    # Generation -------------------------------------------------------------
+
+    def publish_generation(self, generation: int):
+        """Announce a new data generation to other processes"""
+        tmp_path = self.generation_path.with_name(f"generation.{os.getpid()}.tmp")
+        tmp_path.write_text(str(generation))
+        os.replace(tmp_path, self.generation_path)
+        self._generation = generation
+
+    def read_generation(self) -> int:
+        """Return the published generation (re-read only when the file changed)"""
+        try:
+            mtime = self.generation_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return self._generation
+        if mtime != self._generation_mtime:
+            try:
+                self._generation = int(self.generation_path.read_text().strip() or 0)
+                self._generation_mtime = mtime
+            except (OSError, ValueError):
+                pass
+        return self._generation
+
+    # Shared read cache ------------------------------------------------------
+
+    def snapshot(self, generation: int) -> Optional[CorpCodeSnapshot]:
+        """
+        Return the mapped snapshot if it matches ``generation``, remapping it
+        after another process exported a newer one.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.generation == generation:
+            return snapshot
+        try:
+            mtime = self.snapshot_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if self._snapshot_miss == (generation, mtime):
+            return None
+        with self._snapshot_lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.generation != generation:
+                fresh = open_snapshot(self.snapshot_path) if mtime is not None else None
+                if fresh is not None and fresh.generation != generation:
+                    fresh.close()
+                    fresh = None
+                self._snapshot_miss = None if fresh is not None else (generation, mtime)
+                # Old mappings stay valid for readers still holding them
+                self._snapshot = snapshot = fresh
+        return snapshot
+
+    # Stats spooling ---------------------------------------------------------
+
+    def spool(self, access: Dict[str, Tuple[int, str]], sessions: List[Dict[str, Any]]):
+        """Hand buffered stats to the writer process via a spool file"""
+        name = f"{os.getpid()}-{uuid.uuid4().hex}"
+        tmp_path = self.spool_dir / f"{name}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for corp_code, (count, last_accessed) in access.items():
+                f.write(json.dumps({'a': [corp_code, count, last_accessed]}, ensure_ascii=False) + "\n")
+            for session in sessions:
+                f.write(json.dumps({'s': session}, ensure_ascii=False) + "\n")
+        # Only complete files carry the .jsonl suffix the writer looks for
+        os.replace(tmp_path, self.spool_dir / f"{name}.jsonl")
+        self.spooled_events += len(access) + len(sessions)
+
+    def claim_spool(self, max_files: int = 100) -> Tuple[Dict[str, Tuple[int, str]], List[Dict[str, Any]], List[Path]]:
+        """
+        Read pending spool files (writer only).
+
+        Returns:
+            Merged access updates, session dicts, and the files to pass to
+            ``release_spool`` once they are persisted
+        """
+        access: Dict[str, Tuple[int, str]] = {}
+        sessions: List[Dict[str, Any]] = []
+        paths = sorted(self.spool_dir.glob("*.jsonl"))[:max_files]
+        for path in paths:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        event = json.loads(line)
+                        if 'a' in event:
+                            corp_code, count, last_accessed = event['a']
+                            current_count, current_accessed = access.get(corp_code, (0, last_accessed))
+                            access[corp_code] = (current_count + count, max(current_accessed, last_accessed))
+                        elif 's' in event:
+                            sessions.append(event['s'])
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable spool file {path}: {e}")
+        return access, sessions, paths
+
+    def release_spool(self, paths: List[Path]):
+        for path in paths:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        self.ingested_files += len(paths)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            'pid': os.getpid(),
+            'is_writer': self._writer_lock.held,
+            'generation': self._generation,
+            'snapshot_generation': snapshot.generation if snapshot is not None else None,
+            'pending_spool_files': sum(1 for _ in self.spool_dir.glob("*.jsonl")),
+            'spooled_events': self.spooled_events,
+            'ingested_spool_files': self.ingested_files,
+        }
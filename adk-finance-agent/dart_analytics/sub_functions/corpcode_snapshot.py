@@ -0,0 +1,261 @@
+"""
+CORPCODE Snapshot Module
+========================
+Compact, read-only binary snapshot of the corporation table for serving
+processes that only need lookups.
+
+The snapshot is opened with ``mmap`` so every worker process shares the same
+pages through the OS page cache. Lookups bisect directly over the mapped
+bytes; no per-record Python objects are built at startup.
+
+File layout (little endian):
+
+    header     magic, version, record count, generation, section offsets
+    records    fixed-size entries sorted by corp_code
+    name_order u32 record indexes sorted by UTF-8 corp_name
+    stock_order u32 record indexes of listed corporations sorted by stock_code
+    heap       UTF-8 corp_name / corp_eng_name bytes referenced by records
+"""
+
+import logging
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CORPSNAP"
+VERSION = 1
+
+# magic, version, count, generation, records_off, name_order_off, stock_order_off, stock_count, heap_off
+_HEADER = struct.Struct("<8sIIQQQQIQ")
+# corp_code, stock_code, modify_date, name_off, name_len, eng_off, eng_len
+_RECORD = struct.Struct("<8s6s8sIHIH")
+_INDEX = struct.Struct("<I")
+
+# (corp_code, corp_name, corp_eng_name, stock_code, modify_date)
+SnapshotRow = Tuple[str, str, str, str, str]
+
+
+def _ascii(value: Optional[str], size: int) -> bytes:
+    return (value or "").strip().encode("ascii", "ignore")[:size]
+
+
+def _is_listed(stock_code: Optional[str]) -> bool:
+    return bool(stock_code and stock_code.strip())
+
+
+def write_snapshot(path: Path, rows: Iterable[SnapshotRow], generation: int = 0) -> int:
+    """
+    Write a snapshot file atomically.
+
+    Args:
+        path: Destination file
+        rows: (corp_code, corp_name, corp_eng_name, stock_code, modify_date) rows
+        generation: Data generation the rows were read under
+
+    Returns:
+        Number of records written
+    """
+    rows = sorted(rows, key=lambda row: row[0])
+    count = len(rows)
+
+    heap = bytearray()
+    records = bytearray()
+    names = []
+    for index, (corp_code, corp_name, corp_eng_name, stock_code, modify_date) in enumerate(rows):
+        name = (corp_name or "").encode("utf-8")[:0xFFFF]
+        eng = (corp_eng_name or "").encode("utf-8")[:0xFFFF]
+        name_off = len(heap)
+        heap += name
+        eng_off = len(heap)
+        heap += eng
+        records += _RECORD.pack(_ascii(corp_code, 8), _ascii(stock_code, 6), _ascii(modify_date, 8),
+                                name_off, len(name), eng_off, len(eng))
+        # Listed corporations win ties on the same name, then lower corp_code
+        names.append((name, not _is_listed(stock_code), corp_code, index))
+
+    names.sort()
+    name_order = b"".join(_INDEX.pack(index) for _, _, _, index in names)
+    listed = sorted((_ascii(row[3], 6), index) for index, row in enumerate(rows) if _is_listed(row[3]))
+    stock_order = b"".join(_INDEX.pack(index) for _, index in listed)
+
+    records_off = _HEADER.size
+    name_order_off = records_off + len(records)
+    stock_order_off = name_order_off + len(name_order)
+    heap_off = stock_order_off + len(stock_order)
+
+    header = _HEADER.pack(MAGIC, VERSION, count, generation, records_off, name_order_off,
+                          stock_order_off, len(listed), heap_off)
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        for section in (header, records, name_order, stock_order, heap):
+            f.write(section)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return count
+
+
+class _KeyView:
+    """Sequence of sort keys computed lazily from the mapped file, for bisect"""
+
+    def __init__(self, length: int, key: Callable[[int], bytes]):
+        self._length = length
+        self._key = key
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, position: int) -> bytes:
+        return self._key(position)
+
+
+class CorpCodeSnapshot:
+    """
+    Read-only, memory-mapped corporation snapshot.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Snapshot file written by ``write_snapshot``
+
+        Raises:
+            ValueError: If the file is not a snapshot of a supported version
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self.count, self.generation, self._records_off, self._name_order_off,
+         self._stock_order_off, self._stock_count, self._heap_off) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"Unsupported corporation snapshot: {self.path}")
+
+        self._by_code = _KeyView(self.count, lambda i: self._code_bytes(i))
+        self._by_name = _KeyView(self.count, lambda i: self._name_bytes(self._name_index(i)))
+        self._by_stock = _KeyView(self._stock_count, lambda i: self._stock_bytes(self._stock_index(i)))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Raw field access -------------------------------------------------------
+
+    def _record_offset(self, index: int) -> int:
+        return self._records_off + index * _RECORD.size
+
+    def _code_bytes(self, index: int) -> bytes:
+        offset = self._record_offset(index)
+        return self._mmap[offset:offset + 8].rstrip(b"\0")
+
+    def _stock_bytes(self, index: int) -> bytes:
+        offset = self._record_offset(index) + 8
+        return self._mmap[offset:offset + 6].rstrip(b"\0")
+
+    def _name_bytes(self, index: int) -> bytes:
+        _, _, _, name_off, name_len, _, _ = _RECORD.unpack_from(self._mmap, self._record_offset(index))
+        start = self._heap_off + name_off
+        return self._mmap[start:start + name_len]
+
+    def _name_index(self, position: int) -> int:
+        return _INDEX.unpack_from(self._mmap, self._name_order_off + position * _INDEX.size)[0]
+
+    def _stock_index(self, position: int) -> int:
+        return _INDEX.unpack_from(self._mmap, self._stock_order_off + position * _INDEX.size)[0]
+
+    def _record(self, index: int) -> Dict[str, str]:
+        corp_code, stock_code, modify_date, name_off, name_len, eng_off, eng_len = \
+            _RECORD.unpack_from(self._mmap, self._record_offset(index))
+        heap = self._heap_off
+        return {
+            'corp_code': corp_code.rstrip(b"\0").decode("ascii"),
+            'corp_name': self._mmap[heap + name_off:heap + name_off + name_len].decode("utf-8"),
+            'corp_eng_name': self._mmap[heap + eng_off:heap + eng_off + eng_len].decode("utf-8"),
+            'stock_code': stock_code.rstrip(b"\0").decode("ascii"),
+            'modify_date': modify_date.rstrip(b"\0").decode("ascii"),
+        }
+
+    # Lookups ----------------------------------------------------------------
+
+    def get(self, corp_code: str) -> Optional[Dict[str, str]]:
+        """Return the record for ``corp_code``, or None"""
+        key = _ascii(corp_code, 8)
+        position = bisect_left(self._by_code, key)
+        if position < self.count and self._code_bytes(position) == key:
+            return self._record(position)
+        return None
+
+    def get_corp_code(self, corp_name: str) -> Optional[str]:
+        """Return the corp_code for an exact corporation name, or None"""
+        key = corp_name.encode("utf-8")
+        position = bisect_left(self._by_name, key)
+        if position < self.count:
+            index = self._name_index(position)
+            if self._name_bytes(index) == key:
+                return self._code_bytes(index).decode("ascii")
+        return None
+
+    def get_by_stock_code(self, stock_code: str) -> Optional[Dict[str, str]]:
+        """Return the record of the corporation listed under ``stock_code``, or None"""
+        key = _ascii(stock_code, 6)
+        position = bisect_left(self._by_stock, key)
+        if position < self._stock_count:
+            index = self._stock_index(position)
+            if self._stock_bytes(index) == key:
+                return self._record(index)
+        return None
+
+    def prefix_search(self, prefix: str, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        Return corporations whose name starts with ``prefix``, in name order.
+
+        Args:
+            prefix: Name prefix
+            limit: Maximum number of results
+        """
+        key = prefix.encode("utf-8")
+        position = bisect_left(self._by_name, key)
+        results = []
+        while position < self.count and len(results) < limit:
+            index = self._name_index(position)
+            if not self._name_bytes(index).startswith(key):
+                break
+            results.append(self._record(index))
+            position += 1
+        return results
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            'path': str(self.path),
+            'records': self.count,
+            'listed': self._stock_count,
+            'generation': self.generation,
+            'size_bytes': len(self._mmap),
+        }
+
+
+def open_snapshot(path: Path) -> Optional[CorpCodeSnapshot]:
+    """Open a snapshot if it exists and is valid, otherwise return None"""
+    try:
+        return CorpCodeSnapshot(path)
+    except FileNotFoundError:
+        return None
+    except (ValueError, OSError, struct.error) as e:
+        logger.warning(f"Failed to open corporation snapshot {path}: {e}")
+        return None
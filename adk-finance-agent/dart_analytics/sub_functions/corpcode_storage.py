@@ -9,23 +9,283 @@ Features:
 - Fast search and retrieval of corporation codes
 - Session management for tracking usage patterns
 - Support for fuzzy matching and partial searches
+- Pooled, long-lived SQLite connections (WAL mode, tuned pragmas)
+- Write-behind batching of access statistics and search sessions
+- Bigram inverted index for partial-name search
+- Korean-aware fuzzy matching (jamo edit distance, choseong queries)
+- Streaming, batched CORPCODE.xml import
+- Incremental delta sync (upsert changed rows, tombstone removed ones)
+- Bounded LRU/TTL lookup cache invalidated by data generation
+- Memory-mapped read-only snapshot export for serving processes
+- Bulk name/code resolution in chunked IN queries
+- corp_code / stock_code / ISIN / name translation index
+- Append-only daily session log segments with retention and compaction
+- Cross-process coordination: single stats writer, generation file, shared mmap snapshot
+- Memoised search results keyed on (query, limit) and data generation
+- Materialised statistics counters and incremental top-K popularity ranking
+- Compact sorted-array autocomplete index of listed corporations, ranked by popularity
+- Blue/green reload: build and validate a new database file, then swap it in atomically
 """
 
+import atexit
+import hashlib
 import json
 import os
-import pickle
+import queue
 import sqlite3
+import struct
+import threading
+import time
 import xml.etree.ElementTree as ET
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 from dataclasses import dataclass, asdict
 import logging
 from pathlib import Path
-from functools import lru_cache
+
+from . import corpcode_autocomplete, corpcode_search_index, corpcode_snapshot
+from .corpcode_cache import LookupCache
+from .corpcode_identifiers import CorpIdentifierIndex
+from .corpcode_popularity import TopKTracker
+from .corpcode_session_log import SessionLog
+from .corpcode_shared import SharedCoordinator
+from .corpcode_fuzzy import LazyFuzzyIndex
+from .corpcode_writer import WriteBehindBuffer, AccessUpdates
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Pragmas applied to every pooled connection. WAL lets readers proceed while
+# a writer commits; synchronous=NORMAL is safe under WAL and avoids an fsync
+# per transaction.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=67108864",
+)
+
+# Sessions kept in memory, and seconds between session retention passes
+_RECENT_SESSIONS = 1000
+_SESSION_MAINTENANCE_INTERVAL = 3600.0
+
+# Corporations tracked by the incremental popularity ranking
+_POPULARITY_CAPACITY = 100
+
+# Parameters per IN (...) query; stays under SQLite's default variable limit
+_BULK_CHUNK_SIZE = 500
+
+# Tie-break for corporations sharing a name: listed first, then lowest corp_code.
+# The mmap snapshot and the identifier index order duplicates the same way, so
+# every exact-name lookup path resolves a name to the same corporation.
+_SQL_NAME_TIE_BREAK = "(COALESCE(TRIM(stock_code), '') = ''), corp_code"
+
+# Hot-path statements. sqlite3 caches compiled statements per connection keyed
+# by SQL text, so long-lived pooled connections reuse their prepared form.
+_SQL_SELECT_BY_NAME = f'''
+    SELECT corp_code, corp_name, corp_eng_name, stock_code, modify_date
+    FROM corporations
+    WHERE corp_name = ? AND is_deleted = 0
+    ORDER BY {_SQL_NAME_TIE_BREAK}
+    LIMIT 1
+'''
+
+_SQL_SELECT_INFO = '''
+    SELECT corp_code, corp_name, corp_eng_name, stock_code,
+           modify_date, last_accessed, access_count
+    FROM corporations
+    WHERE corp_code = ? AND is_deleted = 0
+'''
+
+_SQL_UPDATE_ACCESS = '''
+    UPDATE corporations
+    SET last_accessed = ?, access_count = access_count + ?
+    WHERE corp_code = ?
+'''
+
+_SQL_INSERT_CORPORATION = '''
+    INSERT OR REPLACE INTO corporations
+    (corp_code, corp_name, corp_eng_name, stock_code, modify_date, content_hash)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+# Delta sync upsert: refreshes content but keeps access statistics
+_SQL_UPSERT_CORPORATION = '''
+    INSERT INTO corporations
+    (corp_code, corp_name, corp_eng_name, stock_code, modify_date, content_hash)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(corp_code) DO UPDATE SET
+        corp_name = excluded.corp_name,
+        corp_eng_name = excluded.corp_eng_name,
+        stock_code = excluded.stock_code,
+        modify_date = excluded.modify_date,
+        content_hash = excluded.content_hash,
+        is_deleted = 0
+'''
+
+# Secondary indexes on corporations; dropped during bulk import and rebuilt once
+_CORPORATION_INDEXES = {
+    'idx_corp_name': "CREATE INDEX IF NOT EXISTS idx_corp_name ON corporations(corp_name)",
+    'idx_stock_code': "CREATE INDEX IF NOT EXISTS idx_stock_code ON corporations(stock_code)",
+}
+
+_CORPCODE_FIELDS = ('corp_code', 'corp_name', 'corp_eng_name', 'stock_code', 'modify_date')
+
+_SQL_INSERT_SESSION = '''
+    INSERT OR IGNORE INTO search_sessions (session_id, timestamp, query, results, success)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+# Statistics kept as running totals in storage_meta so get_statistics never scans
+_COUNTER_QUERIES = {
+    'total_corporations': "SELECT COUNT(*) FROM corporations WHERE is_deleted = 0",
+    'listed_corporations': "SELECT COUNT(*) FROM corporations WHERE stock_code != '' AND stock_code != ' ' AND is_deleted = 0",
+    'total_searches': "SELECT COUNT(*) FROM search_sessions",
+    'successful_searches': "SELECT COUNT(*) FROM search_sessions WHERE success = 1",
+}
+
+_SQL_ADD_COUNTER = "UPDATE storage_meta SET value = CAST(value AS INTEGER) + ? WHERE key = ?"
+
+# Seconds between stat() calls for the storage_size_mb figures
+_SIZE_REFRESH_INTERVAL = 30.0
+
+# Re-export the autocomplete index after this many seconds so popularity stays current
+_AUTOCOMPLETE_REFRESH_INTERVAL = 600.0
+
+
+def iter_corpcode_records(xml_path: str) -> Iterator[Tuple[str, str, str, str, str]]:
+    """
+    Stream (corp_code, corp_name, corp_eng_name, stock_code, modify_date) tuples
+    from CORPCODE.xml without building the whole tree in memory.
+    
+    Args:
+        xml_path: Path to CORPCODE.xml file
+    """
+    context = ET.iterparse(str(xml_path), events=("start", "end"))
+    _, root = next(context)
+    
+    for event, elem in context:
+        if event != "end" or elem.tag != "list":
+            continue
+        
+        values = {}
+        for child in elem:
+            if child.tag in _CORPCODE_FIELDS:
+                values[child.tag] = (child.text or '').strip()
+        
+        # Drop parsed elements so memory stays flat across ~100k records
+        root.clear()
+        
+        if values.get('corp_code') and values.get('corp_name'):
+            yield tuple(values.get(field, '') for field in _CORPCODE_FIELDS)
+
+
+def count_corpcode_records(xml_path: str) -> int:
+    """Count corporations in CORPCODE.xml with constant memory"""
+    return sum(1 for _ in iter_corpcode_records(xml_path))
+
+
+def record_content_hash(record: Tuple[str, str, str, str, str]) -> str:
+    """Stable hash of a parsed CORPCODE record's content"""
+    return hashlib.blake2b("\x1f".join(record).encode('utf-8'), digest_size=8).hexdigest()
+
+
+class SQLiteConnectionPool:
+    """
+    Thread-safe pool of long-lived SQLite connections.
+
+    Connections are opened lazily up to ``max_size`` and lent to one caller at
+    a time, so each keeps its page cache and statement cache warm.
+    """
+
+    def __init__(self, db_path: Path, max_size: int = 8, timeout: float = 30.0):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._retired = False
+
+    def _open(self) -> sqlite3.Connection:
+        """Open a new connection with the pool pragmas applied"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, open a new one, or wait for one to return"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._connections) < self.max_size:
+                conn = self._open()
+                self._connections.append(conn)
+                return conn
+
+        return self._idle.get(timeout=self.timeout)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for the duration of the ``with`` block"""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._retired:
+                self._discard(conn)
+            else:
+                self._idle.put(conn)
+
+    def _discard(self, conn: sqlite3.Connection):
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to close connection: {e}")
+
+    def retire(self):
+        """
+        Stop lending connections after a database swap.
+    
+        Idle connections are closed now; connections still borrowed by
+        in-flight readers are closed when they are returned.
+        """
+        self._retired = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def close(self):
+        """Close every connection owned by the pool"""
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to close connection: {e}")
+            self._connections.clear()
+            self._idle = queue.LifoQueue()
+
 
 @dataclass
 class Corporation:
@@ -55,12 +315,25 @@ class CorpCodeStorage:
     Implements caching and session tracking for improved performance.
     """
     
-    def __init__(self, base_dir: str = None):
+    def __init__(self, base_dir: str = None, pool_size: int = 8, flush_interval: float = 2.0,
+                 cache_size: int = 10000, cache_ttl: Optional[float] = 3600.0, persist_cache: bool = True,
+                 session_retention_days: int = 30, shared: bool = True,
+                 search_cache_size: int = 2000, search_cache_ttl: Optional[float] = 300.0):
         """
         Initialize the CorpCodeStorage with specified base directory.
         
         Args:
             base_dir: Base directory for storage files. Defaults to dart_analytics directory.
+            pool_size: Maximum number of pooled SQLite connections.
+            flush_interval: Seconds between write-behind flushes of access stats and sessions.
+            cache_size: Maximum number of cached name lookups.
+            cache_ttl: Seconds a cached lookup stays valid (None disables expiry).
+            persist_cache: Save the lookup cache to disk in the background.
+            session_retention_days: Days of search sessions kept in the log and database.
+            shared: Coordinate with other processes using the same storage directory
+                (one stats writer, shared snapshot read cache, generation file).
+            search_cache_size: Maximum number of memoised search_corporations results.
+            search_cache_ttl: Seconds before a memoised search is re-ranked by access_count.
         """
         if base_dir is None:
             base_dir = Path(__file__).parent.parent
@@ -69,26 +342,245 @@ class CorpCodeStorage:
         self.storage_dir = self.base_dir / "storage"
         self.storage_dir.mkdir(exist_ok=True)
         
-        # File paths
-        self.db_path = self.storage_dir / "corpcode.db"
+        # File paths; the live database is the one named by the pointer file
+        self.db_pointer_path = self.storage_dir / "corpcode.current"
+        self.db_path = self._resolve_db_path()
         self.cache_path = self.storage_dir / "corpcode_cache.pkl"
-        self.session_path = self.storage_dir / "sessions.json"
-        self.index_path = self.storage_dir / "corpcode_index.json"
+        self.session_path = self.storage_dir / "sessions.json"  # legacy, read once for migration
+        self.session_log_dir = self.storage_dir / "sessions"
+        self.index_path = self.storage_dir / "corpcode_autocomplete.idx"
+        self.legacy_index_path = self.storage_dir / "corpcode_index.json"
+        self.snapshot_path = self.storage_dir / "corpcode.snapshot"
+        
+        # Cross-process coordination for multi-worker deployments
+        self._shared = SharedCoordinator(self.storage_dir, self.snapshot_path) if shared else None
+        
+        # Long-lived connections shared by every thread using this storage
+        self.pool_size = pool_size
+        self._pool = SQLiteConnectionPool(self.db_path, max_size=pool_size)
+        # Held while stats are copied into a reloaded database and it is swapped in
+        self._swap_lock = threading.Lock()
         
         # Initialize database
         self._init_database()
         
-        # Load cache
-        self.cache = self._load_cache()
+        # Lookup cache, tagged with the generation of the imported data
+        self.persist_cache = persist_cache
+        self.cache = LookupCache(max_size=cache_size, ttl=cache_ttl, generation=self.get_generation())
+        if persist_cache:
+            self.cache.load(self.cache_path)
+        
+        # Memoised search_corporations results; the TTL bounds ranking drift
+        self.search_cache = LookupCache(max_size=search_cache_size, ttl=search_cache_ttl,
+                                        generation=self.cache.generation)
         
-        # Load sessions
+        # Session log; the most recent sessions are also kept in memory
+        self.session_retention_days = session_retention_days
+        self._session_log = SessionLog(self.session_log_dir, retention_days=session_retention_days)
         self.sessions = self._load_sessions()
+        self._last_session_maintenance: Optional[float] = None
+        
+        # Throughput of the most recent import_from_xml call
+        self.last_import_stats: Dict[str, float] = {}
+        
+        # Fuzzy name index, built on first fuzzy lookup
+        self._fuzzy_index = LazyFuzzyIndex(self._load_fuzzy_rows)
+        
+        # Most accessed corporations, updated as access stats are flushed
+        self._popularity = TopKTracker(capacity=_POPULARITY_CAPACITY)
+        self._storage_sizes: Optional[Dict[str, float]] = None
+        self._storage_sizes_at = 0.0
+        
+        # Identifier translation index, rebuilt when the data generation changes
+        self._identifier_index: Optional[CorpIdentifierIndex] = None
+        self._identifier_lock = threading.Lock()
+        
+        # Autocomplete index, reloaded on generation change or when its popularity is stale
+        self._autocomplete: Optional[corpcode_autocomplete.AutocompleteIndex] = None
+        self._autocomplete_loaded_at = 0.0
+        self._autocomplete_lock = threading.Lock()
+        
+        # Access stats, sessions and cache persistence are flushed in the background
+        self._writer = WriteBehindBuffer(self._flush_pending, flush_interval=flush_interval,
+                                         tick_callback=self._housekeeping)
+        self._writer.start()
+        self._closed = False
+        atexit.register(self.close)
+    
+    def _connection(self):
+        """Borrow a pooled connection (use as a context manager)"""
+        return self._pool.connection()
+    
+    def _resolve_db_path(self) -> Path:
+        """Live database file: the one named by the pointer file, else corpcode.db"""
+        try:
+            name = self.db_pointer_path.read_text(encoding='utf-8').strip()
+        except FileNotFoundError:
+            name = ""
+        if name and (self.storage_dir / name).exists():
+            return self.storage_dir / name
+        return self.storage_dir / "corpcode.db"
+    
+    def _swap_database(self, db_path: Path):
+        """Point the connection pool at another database file (caller holds _swap_lock)"""
+        old_pool = self._pool
+        self.db_path = db_path
+        self._pool = SQLiteConnectionPool(db_path, max_size=self.pool_size)
+        # In-flight readers finish on the old file; their connections close when returned
+        old_pool.retire()
+        self._storage_sizes = None
+    
+    def flush(self) -> int:
+        """Persist buffered access statistics, sessions and cache immediately"""
+        return self._writer.flush()
+    
+    def close(self):
+        """Flush pending writes and close all pooled database connections"""
+        if self._closed:
+            return
+        self._closed = True
+        self._writer.close()
+        if self._is_writer():
+            self._save_cache()
+        if self._shared is not None:
+            self._shared.close()
+        self._pool.close()
+    
+    def _is_writer(self) -> bool:
+        """True unless another process holds the shared stats-writer role"""
+        return self._shared is None or self._shared.is_writer()
+    
+    def _exclusive(self):
+        """Serialise imports and syncs with other processes"""
+        return self._shared.exclusive() if self._shared is not None else nullcontext()
+    
+    def _flush_pending(self, access: AccessUpdates, sessions: List[SearchSession]):
+        """Write one batch of buffered events (runs on the write-behind thread)"""
+        if not self._is_writer():
+            # The writer process persists these when it ingests the spool
+            self._shared.spool(access, [self._session_to_dict(session) for session in sessions])
+            return
+        
+        self._write_stats(access, sessions)
+        self._save_cache()
+        
+        last_maintenance = self._last_session_maintenance
+        if last_maintenance is None or time.monotonic() - last_maintenance >= _SESSION_MAINTENANCE_INTERVAL:
+            self.compact_sessions()
+    
+    def _housekeeping(self):
+        """Periodic cross-process work (runs on the write-behind thread)"""
+        if self._shared is None:
+            return
+        
+        # Pick up imports, syncs and reloads done by other processes
+        generation = self._shared.read_generation()
+        if generation > self.cache.generation:
+            db_path = self._resolve_db_path()
+            if db_path != self.db_path:
+                with self._swap_lock:
+                    self._swap_database(db_path)
+            self._set_generation(generation)
+        
+        if self._shared.is_writer():
+            access, session_dicts, paths = self._shared.claim_spool()
+            if paths:
+                self._write_stats(access, [self._session_from_dict(data) for data in session_dicts])
+                self._shared.release_spool(paths)
+            
+            # Make sure the shared read cache exists for the current data
+            if self._shared.snapshot(self.cache.generation) is None:
+                self._publish_generation(self.get_generation())
+    
+    def _publish_generation(self, generation: int):
+        """Export the shared snapshot and announce a new data generation"""
+        if self._shared is None:
+            return
+        self.export_snapshot()
+        self._shared.publish_generation(generation)
+    
+    def _shared_snapshot(self):
+        """Mapped snapshot for the current generation, if one is available"""
+        if self._shared is None:
+            return None
+        return self._shared.snapshot(self.cache.generation)
+    
+    def _write_stats(self, access: AccessUpdates, sessions: List[SearchSession]):
+        """Persist access deltas and sessions to SQLite and the session log"""
+        with self._swap_lock, self._connection() as conn:
+            if access:
+                conn.executemany(_SQL_UPDATE_ACCESS, [
+                    (last_accessed, count, corp_code)
+                    for corp_code, (count, last_accessed) in access.items()
+                ])
+            if sessions:
+                inserted = {}
+                for success in (True, False):
+                    inserted[success] = conn.executemany(_SQL_INSERT_SESSION, [
+                        (session.session_id, session.timestamp.isoformat(),
+                         session.query, json.dumps(session.results), int(session.success))
+                        for session in sessions if session.success == success
+                    ]).rowcount
+                conn.executemany(_SQL_ADD_COUNTER, [
+                    (inserted[True] + inserted[False], 'total_searches'),
+                    (inserted[True], 'successful_searches'),
+                ])
+            conn.commit()
+            
+            if access and self._popularity.loaded:
+                self._popularity.update(self._fetch_popularity_rows(conn, list(access)))
+        
+        if sessions:
+            self._session_log.append(self._session_to_dict(session) for session in sessions)
+    
+    def _fetch_popularity_rows(self, conn: sqlite3.Connection, corp_codes: List[str]) -> List[tuple]:
+        """Current access counts of the given corporations, for the popularity ranking"""
+        rows = []
+        for start in range(0, len(corp_codes), _BULK_CHUNK_SIZE):
+            chunk = corp_codes[start:start + _BULK_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(conn.execute(f'''
+                SELECT corp_code, corp_name, stock_code, access_count
+                FROM corporations
+                WHERE corp_code IN ({placeholders}) AND is_deleted = 0
+            ''', chunk))
+        return rows
+    
+    @staticmethod
+    def _recount(cursor: sqlite3.Cursor, *keys: str):
+        """Recompute materialised counters from the tables (after bulk changes)"""
+        for key in keys:
+            value = cursor.execute(_COUNTER_QUERIES[key]).fetchone()[0]
+            cursor.execute(
+                "INSERT INTO storage_meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, str(value))
+            )
     
     def _init_database(self):
         """Initialize SQLite database for corporation data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            self._create_schema(cursor)
+            
+            # Substring search index; build it for databases imported before it existed
+            has_corps = cursor.execute("SELECT 1 FROM corporations WHERE is_deleted = 0 LIMIT 1").fetchone()
+            has_grams = cursor.execute("SELECT 1 FROM corp_name_grams LIMIT 1").fetchone()
+            if has_corps and not has_grams:
+                logger.info("Building corporation search index")
+                corpcode_search_index.rebuild(conn)
+            
+            # Materialise statistics counters for databases created before they existed
+            stored = {row[0] for row in cursor.execute("SELECT key FROM storage_meta")}
+            missing = [key for key in _COUNTER_QUERIES if key not in stored]
+            if missing:
+                self._recount(cursor, *missing)
+            
+            conn.commit()
+    
+    @staticmethod
+    def _create_schema(cursor: sqlite3.Cursor):
+        """Create (or migrate) every table and index the storage uses"""
         # Create corporations table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS corporations (
@@ -98,19 +590,29 @@ class CorpCodeStorage:
                 stock_code TEXT,
                 modify_date TEXT,
                 last_accessed TEXT,
-                access_count INTEGER DEFAULT 0
+                access_count INTEGER DEFAULT 0,
+                content_hash TEXT,
+                is_deleted INTEGER NOT NULL DEFAULT 0
             )
         ''')
         
+        # Migrate databases created before these columns existed
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(corporations)")}
+        if 'content_hash' not in columns:
+            cursor.execute("ALTER TABLE corporations ADD COLUMN content_hash TEXT")
+        if 'is_deleted' not in columns:
+            cursor.execute("ALTER TABLE corporations ADD COLUMN is_deleted INTEGER NOT NULL DEFAULT 0")
+        
         # Create search index
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_corp_name 
-            ON corporations(corp_name)
-        ''')
+        for create_sql in _CORPORATION_INDEXES.values():
+            cursor.execute(create_sql)
         
+        # Key/value metadata such as the data generation
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_stock_code 
-            ON corporations(stock_code)
+            CREATE TABLE IF NOT EXISTS storage_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
         ''')
         
         # Create sessions table
@@ -123,128 +625,469 @@ class CorpCodeStorage:
                 success INTEGER NOT NULL
             )
         ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON search_sessions(timestamp)")
         
-        conn.commit()
-        conn.close()
-    
-    def _load_cache(self) -> Dict[str, Corporation]:
-        """Load cache from pickle file"""
-        if self.cache_path.exists():
-            try:
-                with open(self.cache_path, 'rb') as f:
-                    return pickle.load(f)
-            except Exception as e:
-                logger.warning(f"Failed to load cache: {e}")
-        return {}
+        # Substring search index
+        cursor.execute(corpcode_search_index.SCHEMA)
     
     def _save_cache(self):
-        """Save cache to pickle file"""
-        try:
-            with open(self.cache_path, 'wb') as f:
-                pickle.dump(self.cache, f)
-        except Exception as e:
-            logger.error(f"Failed to save cache: {e}")
+        """Persist the lookup cache if enabled and changed since the last save"""
+        if self.persist_cache:
+            self.cache.save(self.cache_path)
+    
+    def get_generation(self) -> int:
+        """Return the data generation, bumped by every import or sync that changes data"""
+        with self._connection() as conn:
+            row = conn.execute("SELECT value FROM storage_meta WHERE key = 'generation'").fetchone()
+        return int(row[0]) if row else 0
     
-    def _load_sessions(self) -> List[SearchSession]:
-        """Load search sessions from JSON file"""
-        if self.session_path.exists():
+    @staticmethod
+    def _bump_generation(cursor: sqlite3.Cursor) -> int:
+        """Increment the data generation within the caller's transaction"""
+        cursor.execute(
+            "INSERT INTO storage_meta (key, value) VALUES ('generation', '1') "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+        )
+        return int(cursor.execute("SELECT value FROM storage_meta WHERE key = 'generation'").fetchone()[0])
+    
+    @staticmethod
+    def _session_to_dict(session: SearchSession) -> Dict[str, Any]:
+        session_dict = asdict(session)
+        # Handle both datetime objects and strings
+        if hasattr(session.timestamp, 'isoformat'):
+            session_dict['timestamp'] = session.timestamp.isoformat()
+        else:
+            session_dict['timestamp'] = str(session.timestamp)
+        return session_dict
+    
+    @staticmethod
+    def _session_from_dict(session_data: Dict[str, Any]) -> SearchSession:
+        session_data = dict(session_data)
+        # Convert timestamp string to datetime if needed
+        if isinstance(session_data.get('timestamp'), str):
             try:
-                with open(self.session_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    sessions = []
-                    for session_data in data:
-                        # Convert timestamp string to datetime if needed
-                        if isinstance(session_data.get('timestamp'), str):
-                            try:
-                                session_data['timestamp'] = datetime.fromisoformat(session_data['timestamp'])
-                            except:
-                                session_data['timestamp'] = datetime.now()
-                        sessions.append(SearchSession(**session_data))
-                    return sessions
-            except Exception as e:
-                logger.warning(f"Failed to load sessions: {e}")
-        return []
-    
-    def _save_sessions(self):
-        """Save search sessions to JSON file"""
+                session_data['timestamp'] = datetime.fromisoformat(session_data['timestamp'])
+            except ValueError:
+                session_data['timestamp'] = datetime.now()
+        return SearchSession(**session_data)
+    
+    def _load_sessions(self) -> deque:
+        """Load the most recent sessions from the session log (or the legacy JSON file)"""
+        sessions = deque(maxlen=_RECENT_SESSIONS)
         try:
-            sessions_data = []
-            for session in self.sessions[-1000:]:  # Keep last 1000 sessions
-                session_dict = asdict(session)
-                # Handle both datetime objects and strings
-                if hasattr(session.timestamp, 'isoformat'):
-                    session_dict['timestamp'] = session.timestamp.isoformat()
-                else:
-                    session_dict['timestamp'] = str(session.timestamp)
-                sessions_data.append(session_dict)
-            
-            with open(self.session_path, 'w', encoding='utf-8') as f:
-                json.dump(sessions_data, f, ensure_ascii=False, indent=2)
+            events = self._session_log.tail(_RECENT_SESSIONS)
+            if not events and self.session_path.exists():
+                # Move the legacy sessions.json into the log once
+                with open(self.session_path, 'r', encoding='utf-8') as f:
+                    events = [self._session_to_dict(self._session_from_dict(data)) for data in json.load(f)]
+                self._session_log.append(events)
+                self.session_path.rename(self.session_path.with_suffix('.json.migrated'))
+            sessions.extend(self._session_from_dict(event) for event in events)
         except Exception as e:
-            logger.error(f"Failed to save sessions: {e}")
+            logger.warning(f"Failed to load sessions: {e}")
+        return sessions
+    
+    def compact_sessions(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Apply session retention: compress finished log segments, drop expired
+        ones and purge expired rows from search_sessions.
+        
+        Runs automatically from the write-behind flusher at most once per
+        maintenance interval.
+        
+        Returns:
+            Counts of compressed/deleted segments and purged rows
+        """
+        self._last_session_maintenance = time.monotonic()
+        now = now or datetime.now()
+        stats = self._session_log.compact(now)
+        
+        cutoff = (now - timedelta(days=self.session_retention_days)).isoformat()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            stats['purged_rows'] = cursor.execute(
+                "DELETE FROM search_sessions WHERE timestamp < ?", (cutoff,)
+            ).rowcount
+            if stats['purged_rows']:
+                self._recount(cursor, 'total_searches', 'successful_searches')
+            conn.commit()
+        
+        if any(stats.values()):
+            logger.info(f"Session maintenance: {stats}")
+        return stats
     
-    def import_from_xml(self, xml_path: str, force_reload: bool = False) -> int:
+    def import_from_xml(self, xml_path: str, force_reload: bool = False, batch_size: int = 5000) -> int:
         """
         Import corporation data from CORPCODE.xml file.
         
+        The file is streamed with iterparse and written with executemany batches
+        inside a single transaction; secondary indexes are rebuilt once after load.
+        Throughput is logged and kept in ``last_import_stats``.
+        
         Args:
             xml_path: Path to CORPCODE.xml file
             force_reload: Force reload even if data exists
+            batch_size: Rows per executemany batch
             
         Returns:
             Number of corporations imported
         """
+        with self._exclusive():
+            return self._import_from_xml(xml_path, force_reload, batch_size)
+    
+    def _import_from_xml(self, xml_path: str, force_reload: bool, batch_size: int) -> int:
+        """import_from_xml body; the caller holds the cross-process import lock"""
         # Check if data already exists
         if not force_reload:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM corporations")
-            count = cursor.fetchone()[0]
-            conn.close()
+            with self._connection() as conn:
+                count = conn.execute("SELECT COUNT(*) FROM corporations WHERE is_deleted = 0").fetchone()[0]
             
             if count > 0:
                 logger.info(f"Data already exists ({count} corporations). Use force_reload=True to reimport.")
                 return 0
         
-        # Parse XML
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
+        started = time.perf_counter()
+        
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            
+            # Clear existing data if force reload
+            if force_reload:
+                cursor.execute("DELETE FROM corporations")
+            cursor.execute("DELETE FROM corp_name_grams")
+            
+            # Defer secondary index maintenance until the table is loaded
+            for index_name in _CORPORATION_INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+            
+            # Import data
+            count = 0
+            batch = []
+            for record in iter_corpcode_records(xml_path):
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    count += self._insert_batch(cursor, batch)
+                    batch = []
+            if batch:
+                count += self._insert_batch(cursor, batch)
+            loaded = time.perf_counter()
+            
+            for create_sql in _CORPORATION_INDEXES.values():
+                cursor.execute(create_sql)
+            
+            self._recount(cursor, 'total_corporations', 'listed_corporations')
+            generation = self._bump_generation(cursor)
+            conn.commit()
+        
+        # A reload resets access counts; rebuild the ranking on next use
+        self._popularity.loaded = False
+        elapsed = time.perf_counter() - started
+        self.last_import_stats = {
+            'records': count,
+            'seconds': round(elapsed, 3),
+            'load_seconds': round(loaded - started, 3),
+            'index_seconds': round(elapsed - (loaded - started), 3),
+            'records_per_sec': round(count / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+        
+        # Entries cached under the previous generation are now stale
+        self._set_generation(generation)
+        self._publish_generation(generation)
+        
+        logger.info(
+            f"Imported {count} corporations from {xml_path} in {elapsed:.2f}s "
+            f"({self.last_import_stats['records_per_sec']:,.0f} records/s)"
+        )
+        return count
+    
+    def sync_from_xml(self, xml_path: str, batch_size: int = 5000) -> Dict[str, Any]:
+        """
+        Incrementally synchronise the database with a newer CORPCODE.xml.
+        
+        Each record's modify_date and content hash are compared with the stored
+        row; only new or changed corporations are upserted (access statistics are
+        kept) and corporations missing from the file are tombstoned.
+        
+        Args:
+            xml_path: Path to CORPCODE.xml file
+            batch_size: Rows per executemany batch
+            
+        Returns:
+            Changeset with added/updated/restored/removed corp_codes and counters
+        """
+        with self._exclusive():
+            return self._sync_from_xml(xml_path, batch_size)
+    
+    def _sync_from_xml(self, xml_path: str, batch_size: int) -> Dict[str, Any]:
+        """sync_from_xml body; the caller holds the cross-process import lock"""
+        started = time.perf_counter()
+        
+        with self._connection() as conn:
+            changeset, changed = self._apply_delta(conn, xml_path, batch_size)
+            generation = self._bump_generation(conn.cursor()) if changed else None
+            conn.commit()
+        
+        if changed:
+            self._popularity.loaded = False
+            self._invalidate_corporations(changed, generation)
+            self._publish_generation(generation)
+        
+        changeset['seconds'] = round(time.perf_counter() - started, 3)
+        logger.info(
+            f"Delta sync from {xml_path}: {len(changeset['added'])} added, {len(changeset['updated'])} updated, "
+            f"{len(changeset['restored'])} restored, {len(changeset['removed'])} removed, "
+            f"{changeset['unchanged']} unchanged in {changeset['seconds']}s"
+        )
+        return changeset
+    
+    def _apply_delta(self, conn: sqlite3.Connection, xml_path: str, batch_size: int) -> Tuple[Dict[str, Any], set]:
+        """
+        Upsert new and changed corporations from CORPCODE.xml and tombstone the
+        ones missing from it, inside a transaction the caller commits.
+        
+        Returns:
+            Changeset (added/updated/restored/removed/unchanged/total/writes) and
+            the set of corp_codes written
+        
+        Raises:
+            ValueError: If the file holds no corporations (the transaction is rolled back)
+        """
+        existing = {
+            corp_code: (content_hash, modify_date, is_deleted)
+            for corp_code, content_hash, modify_date, is_deleted in conn.execute(
+                "SELECT corp_code, content_hash, modify_date, is_deleted FROM corporations"
+            )
+        }
+        
+        changeset = {'added': [], 'updated': [], 'restored': [], 'removed': [], 'unchanged': 0}
+        seen = set()
+        pending = []
         
-        conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
+        cursor.execute("BEGIN")
         
-        # Clear existing data if force reload
-        if force_reload:
-            cursor.execute("DELETE FROM corporations")
-        
-        # Import data
-        count = 0
-        for corp in root.findall('.//list'):
-            corp_code = corp.findtext('corp_code', '').strip()
-            corp_name = corp.findtext('corp_name', '').strip()
-            corp_eng_name = corp.findtext('corp_eng_name', '').strip()
-            stock_code = corp.findtext('stock_code', '').strip()
-            modify_date = corp.findtext('modify_date', '').strip()
+        for record in iter_corpcode_records(xml_path):
+            corp_code, modify_date = record[0], record[4]
+            if corp_code in seen:
+                continue
+            seen.add(corp_code)
+            content_hash = record_content_hash(record)
             
-            if corp_code and corp_name:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO corporations 
-                    (corp_code, corp_name, corp_eng_name, stock_code, modify_date)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (corp_code, corp_name, corp_eng_name, stock_code, modify_date))
-                count += 1
+            stored = existing.get(corp_code)
+            if stored is None:
+                changeset['added'].append(corp_code)
+            elif stored[2]:
+                changeset['restored'].append(corp_code)
+            elif stored[0] != content_hash or stored[1] != modify_date:
+                changeset['updated'].append(corp_code)
+            else:
+                changeset['unchanged'] += 1
+                continue
+            
+            pending.append((*record, content_hash))
+            if len(pending) >= batch_size:
+                self._upsert_batch(cursor, pending)
+                pending = []
+        if pending:
+            self._upsert_batch(cursor, pending)
         
-        conn.commit()
-        conn.close()
+        if not seen:
+            conn.rollback()
+            raise ValueError(f"No corporations found in {xml_path}; refusing to tombstone all rows")
         
-        # Clear cache after import
-        self.cache.clear()
-        self._save_cache()
+        changeset['removed'] = [
+            corp_code for corp_code, (_, _, is_deleted) in existing.items()
+            if corp_code not in seen and not is_deleted
+        ]
+        if changeset['removed']:
+            corpcode_search_index.remove_records(cursor, changeset['removed'])
+            cursor.executemany("UPDATE corporations SET is_deleted = 1 WHERE corp_code = ?",
+                               [(corp_code,) for corp_code in changeset['removed']])
         
-        logger.info(f"Imported {count} corporations from {xml_path}")
-        return count
+        changed = set(changeset['added']) | set(changeset['updated']) | set(changeset['restored']) | set(changeset['removed'])
+        if changed:
+            self._recount(cursor, 'total_corporations', 'listed_corporations')
+        
+        changeset['total'] = len(seen)
+        changeset['writes'] = len(changed)
+        return changeset, changed
+    
+    def reload_from_xml(self, xml_path: str, batch_size: int = 5000, min_ratio: float = 0.5) -> Dict[str, Any]:
+        """
+        Blue/green reload: copy the live database next to it, apply the delta
+        sync to the copy, validate it and swap it in atomically.
+        
+        Lookups are served from the live database for the whole build, and only
+        new, changed, restored or removed corporations are written to the copy.
+        The swap is a rename of the pointer file plus a generation bump; this
+        process switches its connection pool immediately and other workers
+        switch on their next housekeeping tick, while in-flight queries finish
+        on the old file. Access statistics, tombstones and search sessions come
+        with the copy, and those recorded while it was synced are carried over
+        at the swap (statistics another worker writes during the swap itself may
+        be lost, at most one flush interval's worth).
+        
+        Args:
+            xml_path: Path to CORPCODE.xml file
+            batch_size: Rows per executemany batch
+            min_ratio: Reject the new data if it holds fewer than this fraction
+                of the live database's active corporations
+        
+        Returns:
+            Changeset in the ``sync_from_xml`` format plus the new generation
+            and database file name
+        
+        Raises:
+            ValueError: If the new database fails validation (the live one stays in place)
+        """
+        with self._exclusive():
+            return self._reload_from_xml(xml_path, batch_size, min_ratio)
+    
+    def _reload_from_xml(self, xml_path: str, batch_size: int, min_ratio: float) -> Dict[str, Any]:
+        """reload_from_xml body; the caller holds the cross-process import lock"""
+        started = time.perf_counter()
+        live_path = self.db_path
+        generation = self.get_generation() + 1
+        db_path = self.storage_dir / f"corpcode-{generation}.db"
+        build_path = db_path.with_name(db_path.name + ".building")
+        # Leftovers of an interrupted reload
+        for stale in (build_path, db_path):
+            stale.unlink(missing_ok=True)
+        
+        # Statistics buffered so far land in the live database before it is copied
+        self.flush()
+        conn = sqlite3.connect(build_path)
+        try:
+            # Page-level copy of a consistent snapshot; no row is rewritten
+            with self._connection() as live:
+                live.backup(conn)
+                live_count = live.execute("SELECT COUNT(*) FROM corporations WHERE is_deleted = 0").fetchone()[0]
+            # Nobody reads the file until it is renamed, so skip journaling while syncing
+            conn.execute("PRAGMA journal_mode=OFF")
+            conn.execute("PRAGMA synchronous=OFF")
+            
+            changeset, changed = self._apply_delta(conn, xml_path, batch_size)
+            cursor = conn.cursor()
+            cursor.execute("INSERT OR REPLACE INTO storage_meta (key, value) VALUES ('generation', ?)",
+                           (str(generation),))
+            self._validate_reload(cursor, xml_path, changeset['total'], live_count, min_ratio)
+            conn.commit()
+            
+            with self._swap_lock:
+                cursor.execute("ATTACH DATABASE ? AS live", (str(live_path),))
+                cursor.execute("BEGIN")
+                # Statistics and sessions recorded since the copy was taken
+                cursor.execute('''
+                    UPDATE corporations
+                    SET (access_count, last_accessed) = (
+                        SELECT l.access_count, l.last_accessed
+                        FROM live.corporations l
+                        WHERE l.corp_code = corporations.corp_code
+                    )
+                    WHERE corp_code IN (
+                        SELECT l.corp_code
+                        FROM live.corporations l JOIN corporations c ON c.corp_code = l.corp_code
+                        WHERE l.access_count != c.access_count
+                    )
+                ''')
+                cursor.execute('''
+                    INSERT OR IGNORE INTO search_sessions (session_id, timestamp, query, results, success)
+                    SELECT session_id, timestamp, query, results, success FROM live.search_sessions
+                    WHERE timestamp >= (SELECT COALESCE(MAX(timestamp), '') FROM main.search_sessions)
+                ''')
+                conn.commit()
+                cursor.execute("DETACH DATABASE live")
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.close()
+                
+                os.replace(build_path, db_path)
+                self._write_db_pointer(db_path)
+                self._swap_database(db_path)
+        except BaseException:
+            conn.close()
+            build_path.unlink(missing_ok=True)
+            raise
+        
+        self._popularity.loaded = False
+        # The generation moves even without changes so every worker follows the new file
+        self._invalidate_corporations(changed, generation)
+        self._publish_generation(generation)
+        self._remove_old_databases(keep={db_path, live_path})
+        
+        changeset['generation'] = generation
+        changeset['database'] = db_path.name
+        changeset['seconds'] = round(time.perf_counter() - started, 3)
+        logger.info(
+            f"Blue/green reload from {xml_path} into {db_path.name}: {len(changeset['added'])} added, "
+            f"{len(changeset['updated'])} updated, {len(changeset['restored'])} restored, "
+            f"{len(changeset['removed'])} removed, {changeset['unchanged']} unchanged in {changeset['seconds']}s"
+        )
+        return changeset
+    
+    @staticmethod
+    def _validate_reload(cursor: sqlite3.Cursor, xml_path: str, expected: int, live_count: int, min_ratio: float):
+        """Check the synced copy before the swap"""
+        count = cursor.execute("SELECT COUNT(*) FROM corporations WHERE is_deleted = 0").fetchone()[0]
+        if count == 0:
+            raise ValueError(f"No corporations found in {xml_path}; keeping the live database")
+        if count != expected:
+            raise ValueError(
+                f"Reload has {count} active corporations but {xml_path} has {expected}; keeping the live database"
+            )
+        if count < live_count * min_ratio:
+            raise ValueError(
+                f"Reload has {count} corporations against {live_count} live "
+                f"(below the {min_ratio:.0%} minimum); keeping the live database"
+            )
+        check = cursor.execute("PRAGMA main.quick_check").fetchone()[0]
+        if check != 'ok':
+            raise ValueError(f"Reloaded database failed quick_check: {check}")
+    
+    def _write_db_pointer(self, db_path: Path):
+        """Atomically name ``db_path`` as the live database"""
+        tmp_path = self.db_pointer_path.with_name(f"{self.db_pointer_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(db_path.name, encoding='utf-8')
+        os.replace(tmp_path, self.db_pointer_path)
+    
+    def _remove_old_databases(self, keep: set):
+        """Delete database versions other than ``keep`` (the live and previous files)"""
+        candidates = [self.storage_dir / "corpcode.db", *self.storage_dir.glob("corpcode-*.db")]
+        for path in candidates:
+            if path in keep:
+                continue
+            for suffix in ("", "-wal", "-shm"):
+                try:
+                    Path(f"{path}{suffix}").unlink(missing_ok=True)
+                except OSError as e:
+                    # Still open by a lagging worker (Windows); retried after the next reload
+                    logger.warning(f"Could not remove old database {path}{suffix}: {e}")
+    
+    def _upsert_batch(self, cursor: sqlite3.Cursor, batch: List[tuple]):
+        """Upsert changed records and refresh their search-index grams"""
+        corpcode_search_index.update_records(cursor, [(r[0], r[1], r[3]) for r in batch])
+        cursor.executemany(_SQL_UPSERT_CORPORATION, batch)
+    
+    def _invalidate_corporations(self, corp_codes: set, generation: int):
+        """Move to a new generation, keeping cached lookups of unchanged corporations"""
+        # A new or restored corporation may now answer a name that previously missed,
+        # so only entries pointing at an unchanged corp_code survive
+        self._set_generation(generation, retain=lambda corp: corp.corp_code not in corp_codes)
+    
+    def _set_generation(self, generation: int, retain=None):
+        """Invalidate every in-memory structure derived from an older data generation"""
+        self.cache.set_generation(generation, retain=retain)
+        # Any change can add or reorder search results, so nothing is retained here
+        self.search_cache.set_generation(generation)
+        self._fuzzy_index.invalidate()
+    
+    def _insert_batch(self, cursor: sqlite3.Cursor, batch: List[tuple]) -> int:
+        """Insert one batch of parsed records and their search-index grams"""
+        cursor.executemany(_SQL_INSERT_CORPORATION, [(*r, record_content_hash(r)) for r in batch])
+        # Keep the search index in sync within the same transaction
+        corpcode_search_index.add_records(cursor, [(r[0], r[1], r[3]) for r in batch])
+        return len(batch)
     
-    @lru_cache(maxsize=1000)
     def get_corp_code(self, corp_name: str) -> Optional[str]:
         """
         Get corporation code by exact name match.
@@ -257,28 +1100,24 @@ class CorpCodeStorage:
         """
         # Check cache first
         cache_key = f"exact_{corp_name}"
-        if cache_key in self.cache:
-            corp = self.cache[cache_key]
+        corp = self.cache.get(cache_key)
+        if corp is not None:
             self._update_access_stats(corp.corp_code)
             return corp.corp_code
         
-        # Query database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT corp_code, corp_name, corp_eng_name, stock_code, modify_date
-            FROM corporations
-            WHERE corp_name = ?
-        ''', (corp_name,))
-        
-        result = cursor.fetchone()
-        conn.close()
+        # Shared mmap snapshot, then the database
+        snapshot = self._shared_snapshot()
+        if snapshot is not None:
+            corp_code = snapshot.get_corp_code(corp_name)
+            result = snapshot.get(corp_code) if corp_code else None
+            corp = Corporation(**result) if result else None
+        else:
+            with self._connection() as conn:
+                result = conn.execute(_SQL_SELECT_BY_NAME, (corp_name,)).fetchone()
+            corp = Corporation(*result) if result else None
         
-        if result:
-            corp = Corporation(*result)
-            self.cache[cache_key] = corp
-            self._save_cache()
+        if corp is not None:
+            self.cache.put(cache_key, corp)
             self._update_access_stats(corp.corp_code)
             self._record_session(corp_name, [corp.corp_code], True)
             return corp.corp_code
@@ -286,6 +1125,97 @@ class CorpCodeStorage:
         self._record_session(corp_name, [], False)
         return None
     
+    def get_corp_codes_bulk(self, corp_names: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Resolve many corporation names by exact match at once.
+        
+        Cached names are answered from memory; the rest are fetched with
+        chunked ``IN (...)`` queries over idx_corp_name. Access statistics for
+        all hits and a single search session are buffered together.
+        
+        Args:
+            corp_names: Corporation names to resolve
+            
+        Returns:
+            Mapping of each distinct name to its corporation code, or None if not found
+        """
+        names = list(dict.fromkeys(corp_names))
+        results: Dict[str, Optional[str]] = {}
+        missing = []
+        for name in names:
+            corp = self.cache.get(f"exact_{name}")
+            if corp is not None:
+                results[name] = corp.corp_code
+            else:
+                missing.append(name)
+        
+        if missing:
+            found: Dict[str, Corporation] = {}
+            with self._connection() as conn:
+                for start in range(0, len(missing), _BULK_CHUNK_SIZE):
+                    chunk = missing[start:start + _BULK_CHUNK_SIZE]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = conn.execute(f'''
+                        SELECT corp_code, corp_name, corp_eng_name, stock_code, modify_date
+                        FROM corporations
+                        WHERE corp_name IN ({placeholders}) AND is_deleted = 0
+                        ORDER BY corp_name, {_SQL_NAME_TIE_BREAK}
+                    ''', chunk)
+                    for row in rows:
+                        # Rows arrive in tie-break order, so the first per name is the one get_corp_code returns
+                        found.setdefault(row[1], Corporation(*row))
+            
+            for name in missing:
+                corp = found.get(name)
+                if corp is not None:
+                    self.cache.put(f"exact_{name}", corp)
+                results[name] = corp.corp_code if corp is not None else None
+        
+        resolved = [code for code in (results[name] for name in names) if code]
+        if resolved:
+            self._writer.record_accesses(resolved, datetime.now().isoformat())
+        self._record_session(f"[bulk:{len(names)}] " + ", ".join(names[:5]), resolved, len(resolved) == len(names))
+        return {name: results[name] for name in names}
+    
+    def get_corporations_by_codes(self, corp_codes: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Fetch detailed information for many corporation codes at once.
+        
+        Args:
+            corp_codes: Corporation codes to fetch
+            
+        Returns:
+            Mapping of each distinct code to its information dictionary
+            (same shape as get_corporation_info), or None if not found
+        """
+        codes = list(dict.fromkeys(corp_codes))
+        found: Dict[str, Dict[str, Any]] = {}
+        with self._connection() as conn:
+            for start in range(0, len(codes), _BULK_CHUNK_SIZE):
+                chunk = codes[start:start + _BULK_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(f'''
+                    SELECT corp_code, corp_name, corp_eng_name, stock_code,
+                           modify_date, last_accessed, access_count
+                    FROM corporations
+                    WHERE corp_code IN ({placeholders}) AND is_deleted = 0
+                ''', chunk)
+                for row in rows:
+                    pending_count, pending_accessed = self._writer.pending_access(row[0])
+                    found[row[0]] = {
+                        'corp_code': row[0],
+                        'corp_name': row[1],
+                        'corp_eng_name': row[2],
+                        'stock_code': row[3],
+                        'modify_date': row[4],
+                        'last_accessed': pending_accessed or row[5],
+                        'access_count': row[6] + pending_count
+                    }
+        
+        if found:
+            self._writer.record_accesses(list(found), datetime.now().isoformat())
+        return {code: found.get(code) for code in codes}
+    
     def search_corporations(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
         """
         Search corporations with partial matching.
@@ -297,28 +1227,28 @@ class CorpCodeStorage:
         Returns:
             List of matching corporations
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # Matching is ASCII case-insensitive, so "SK" and "sk" share an entry
+        cache_key = (corpcode_search_index.ascii_lower(query), limit)
+        cached = self.search_cache.get(cache_key)
+        if cached is not None:
+            self._record_session(query, [r['corp_code'] for r in cached], len(cached) > 0)
+            return [dict(result) for result in cached]
         
-        # Search by name or code
-        cursor.execute('''
-            SELECT corp_code, corp_name, corp_eng_name, stock_code, modify_date
-            FROM corporations
-            WHERE corp_name LIKE ? OR corp_code LIKE ? OR stock_code LIKE ?
-            ORDER BY 
-                CASE 
-                    WHEN corp_name = ? THEN 1
-                    WHEN corp_name LIKE ? THEN 2
-                    ELSE 3
-                END,
-                access_count DESC
-            LIMIT ?
-        ''', (f'%{query}%', f'%{query}%', f'%{query}%', query, f'{query}%', limit))
+        with self._connection() as conn:
+            if corpcode_search_index.is_indexable(query):
+                sql, params = corpcode_search_index.build_search_query(
+                    query,
+                    "c.corp_code, c.corp_name, c.corp_eng_name, c.stock_code, c.modify_date",
+                    limit
+                )
+                rows = conn.execute(sql, params).fetchall()
+            else:
+                rows = self._scan_corporations(conn, query, limit)
         
         results = []
         corp_codes = []
         
-        for row in cursor.fetchall():
+        for row in rows:
             corp = Corporation(*row)
             results.append({
                 'corp_code': corp.corp_code,
@@ -329,13 +1259,87 @@ class CorpCodeStorage:
             })
             corp_codes.append(corp.corp_code)
         
-        conn.close()
+        self.search_cache.put(cache_key, [dict(result) for result in results])
         
         # Record session
         self._record_session(query, corp_codes, len(results) > 0)
         
         return results
     
+    def _scan_corporations(self, conn: sqlite3.Connection, query: str, limit: int) -> List[tuple]:
+        """LIKE-based full scan for queries the bigram index cannot serve"""
+        # Search by name or code
+        return conn.execute('''
+            SELECT corp_code, corp_name, corp_eng_name, stock_code, modify_date
+            FROM corporations
+            WHERE (corp_name LIKE ? OR corp_code LIKE ? OR stock_code LIKE ?) AND is_deleted = 0
+            ORDER BY 
+                CASE 
+                    WHEN corp_name = ? THEN 1
+                    WHEN corp_name LIKE ? THEN 2
+                    ELSE 3
+                END,
+                access_count DESC
+            LIMIT ?
+        ''', (f'%{query}%', f'%{query}%', f'%{query}%', query, f'{query}%', limit)).fetchall()
+    
+    def _load_fuzzy_rows(self) -> List[tuple]:
+        """Rows used to build the fuzzy name index"""
+        with self._connection() as conn:
+            return conn.execute('''
+                SELECT corp_code, corp_name, corp_eng_name, stock_code
+                FROM corporations
+                WHERE is_deleted = 0
+            ''').fetchall()
+    
+    def fuzzy_search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Find corporations whose names approximately match the query.
+        
+        Handles typos, spacing differences, "(주)"/"주식회사" variants, English
+        names and choseong-only queries such as "ㅅㅅㅈㅈ".
+        
+        Args:
+            query: Corporation name as typed by the user
+            limit: Maximum number of candidates
+            
+        Returns:
+            Candidates ordered by score (1.0 = equivalent name)
+        """
+        results = self._fuzzy_index.get().search(query, limit)
+        self._record_session(query, [r['corp_code'] for r in results], len(results) > 0)
+        return results
+    
+    def get_identifier_index(self) -> CorpIdentifierIndex:
+        """Return the corp_code/stock_code/ISIN/name index for the current data generation"""
+        generation = self.cache.generation
+        index = self._identifier_index
+        if index is None or index.generation != generation:
+            with self._identifier_lock:
+                index = self._identifier_index
+                if index is None or index.generation != generation:
+                    with self._connection() as conn:
+                        rows = conn.execute('''
+                            SELECT corp_code, corp_name, stock_code
+                            FROM corporations
+                            WHERE is_deleted = 0
+                        ''').fetchall()
+                    index = CorpIdentifierIndex.build(rows, generation)
+                    self._identifier_index = index
+        return index
+    
+    def resolve_identifier(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        Translate a corp_code, stock_code, ISIN or exact name into all of them.
+        
+        Args:
+            identifier: Any supported corporation identifier
+            
+        Returns:
+            Dict with corp_code, corp_name, stock_code and isin, or None if unknown
+        """
+        return self.get_identifier_index().resolve(identifier)
+    
     def get_corporation_info(self, corp_code: str) -> Optional[Dict[str, Any]]:
         """
         Get detailed corporation information by code.
@@ -346,20 +1350,12 @@ class CorpCodeStorage:
         Returns:
             Corporation information dictionary if found
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT corp_code, corp_name, corp_eng_name, stock_code, 
-                   modify_date, last_accessed, access_count
-            FROM corporations
-            WHERE corp_code = ?
-        ''', (corp_code,))
-        
-        result = cursor.fetchone()
-        conn.close()
+        with self._connection() as conn:
+            result = conn.execute(_SQL_SELECT_INFO, (corp_code,)).fetchone()
         
         if result:
+            # Include accesses still waiting in the write-behind buffer
+            pending_count, pending_accessed = self._writer.pending_access(corp_code)
             self._update_access_stats(corp_code)
             return {
                 'corp_code': result[0],
@@ -367,25 +1363,15 @@ class CorpCodeStorage:
                 'corp_eng_name': result[2],
                 'stock_code': result[3],
                 'modify_date': result[4],
-                'last_accessed': result[5],
-                'access_count': result[6]
+                'last_accessed': pending_accessed or result[5],
+                'access_count': result[6] + pending_count
             }
         
         return None
     
     def _update_access_stats(self, corp_code: str):
-        """Update access statistics for a corporation"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE corporations
-            SET last_accessed = ?, access_count = access_count + 1
-            WHERE corp_code = ?
-        ''', (datetime.now().isoformat(), corp_code))
-        
-        conn.commit()
-        conn.close()
+        """Update access statistics for a corporation (buffered)"""
+        self._writer.record_access(corp_code, datetime.now().isoformat())
     
     def _record_session(self, query: str, results: List[str], success: bool):
         """Record a search session"""
@@ -399,37 +1385,41 @@ class CorpCodeStorage:
         
         self.sessions.append(session)
         
-        # Save to database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO search_sessions (session_id, timestamp, query, results, success)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (session.session_id, session.timestamp.isoformat(), 
-              session.query, json.dumps(session.results), int(session.success)))
-        
-        conn.commit()
-        conn.close()
-        
-        # Save sessions to file
-        self._save_sessions()
+        # Database row and sessions file are written by the next flush
+        self._writer.record_session(session)
     
     def get_popular_corporations(self, limit: int = 20) -> List[Dict[str, Any]]:
-        """Get most frequently accessed corporations"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """
+        Get most frequently accessed corporations.
         
-        cursor.execute('''
-            SELECT corp_code, corp_name, stock_code, access_count
-            FROM corporations
-            WHERE access_count > 0
-            ORDER BY access_count DESC
-            LIMIT ?
-        ''', (limit,))
+        In the stats-writer process the ranking is served from a top-K tracker
+        that is updated on every flush; other processes (or limits beyond the
+        tracker capacity) query the table.
+        """
+        self.flush()
+        if limit <= self._popularity.capacity and self._is_writer():
+            if not self._popularity.loaded:
+                with self._connection() as conn:
+                    self._popularity.load(conn.execute('''
+                        SELECT corp_code, corp_name, stock_code, access_count
+                        FROM corporations
+                        WHERE access_count > 0 AND is_deleted = 0
+                        ORDER BY access_count DESC
+                        LIMIT ?
+                    ''', (self._popularity.capacity,)).fetchall())
+            return self._popularity.top(limit)
+        
+        with self._connection() as conn:
+            rows = conn.execute('''
+                SELECT corp_code, corp_name, stock_code, access_count
+                FROM corporations
+                WHERE access_count > 0 AND is_deleted = 0
+                ORDER BY access_count DESC
+                LIMIT ?
+            ''', (limit,)).fetchall()
         
         results = []
-        for row in cursor.fetchall():
+        for row in rows:
             results.append({
                 'corp_code': row[0],
                 'corp_name': row[1],
@@ -437,23 +1427,48 @@ class CorpCodeStorage:
                 'access_count': row[3]
             })
         
-        conn.close()
         return results
     
     def get_recent_searches(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent search sessions"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self.flush()
+        with self._connection() as conn:
+            rows = conn.execute('''
+                SELECT timestamp, query, results, success
+                FROM search_sessions
+                ORDER BY timestamp DESC
+                LIMIT ?
+            ''', (limit,)).fetchall()
         
-        cursor.execute('''
-            SELECT timestamp, query, results, success
-            FROM search_sessions
-            ORDER BY timestamp DESC
-            LIMIT ?
-        ''', (limit,))
+        return self._session_rows_to_dicts(rows)
+    
+    def get_searches_between(self, start: datetime, end: Optional[datetime] = None,
+                             limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Get search sessions recorded in ``[start, end)``, newest first.
         
+        Args:
+            start: Window start
+            end: Window end (defaults to now)
+            limit: Maximum number of sessions
+        """
+        self.flush()
+        end = end or datetime.now()
+        with self._connection() as conn:
+            rows = conn.execute('''
+                SELECT timestamp, query, results, success
+                FROM search_sessions
+                WHERE timestamp >= ? AND timestamp < ?
+                ORDER BY timestamp DESC
+                LIMIT ?
+            ''', (start.isoformat(), end.isoformat(), limit)).fetchall()
+        
+        return self._session_rows_to_dicts(rows)
+    
+    @staticmethod
+    def _session_rows_to_dicts(rows: List[tuple]) -> List[Dict[str, Any]]:
         results = []
-        for row in cursor.fetchall():
+        for row in rows:
             results.append({
                 'timestamp': row[0],
                 'query': row[1],
@@ -461,66 +1476,143 @@ class CorpCodeStorage:
                 'success': bool(row[3])
             })
         
-        conn.close()
         return results
     
-    def export_index(self):
-        """Export a lightweight index for quick lookups"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def export_index(self) -> int:
+        """
+        Export the autocomplete index of listed corporations.
         
-        cursor.execute('''
-            SELECT corp_code, corp_name, stock_code
-            FROM corporations
-            WHERE stock_code != '' AND stock_code != ' '
-        ''')
+        Names are written as a compact sorted array (see
+        ``corpcode_autocomplete``) together with the current access counts,
+        which rank the completions.
         
-        index = {}
-        for row in cursor.fetchall():
-            corp_code, corp_name, stock_code = row
-            index[corp_name] = {
-                'code': corp_code,
-                'stock': stock_code
-            }
+        Returns:
+            Number of corporations written
+        """
+        self.flush()
+        with self._connection() as conn:
+            conn.execute("BEGIN")
+            generation_row = conn.execute("SELECT value FROM storage_meta WHERE key = 'generation'").fetchone()
+            rows = conn.execute('''
+                SELECT corp_code, corp_name, corp_eng_name, stock_code, access_count
+                FROM corporations
+                WHERE stock_code != '' AND stock_code != ' ' AND is_deleted = 0
+            ''').fetchall()
+            conn.rollback()
+        
+        generation = int(generation_row[0]) if generation_row else 0
+        count = corpcode_autocomplete.write_autocomplete_index(self.index_path, rows, generation=generation)
+        # The pretty-printed JSON index it replaces was never read back
+        self.legacy_index_path.unlink(missing_ok=True)
+        
+        logger.info(f"Exported autocomplete index with {count} entries to {self.index_path}")
+        return count
+    
+    def _get_autocomplete_index(self) -> corpcode_autocomplete.AutocompleteIndex:
+        """
+        Return the autocomplete index for the current data generation.
+        
+        Another process's export is reused if it is recent enough; otherwise
+        the index is re-exported so popularity ranking stays current.
+        """
+        generation = self.cache.generation
+        index = self._autocomplete
+        now = time.monotonic()
+        if (index is not None and index.generation == generation
+                and now - self._autocomplete_loaded_at < _AUTOCOMPLETE_REFRESH_INTERVAL):
+            return index
+        
+        with self._autocomplete_lock:
+            index = self._autocomplete
+            if (index is not None and index.generation == generation
+                    and now - self._autocomplete_loaded_at < _AUTOCOMPLETE_REFRESH_INTERVAL):
+                return index
+            
+            index = None
+            try:
+                age = time.time() - self.index_path.stat().st_mtime
+                if age < _AUTOCOMPLETE_REFRESH_INTERVAL:
+                    index = corpcode_autocomplete.AutocompleteIndex.load(self.index_path)
+            except (OSError, ValueError, struct.error):
+                index = None
+            if index is None or index.generation != generation:
+                self.export_index()
+                index = corpcode_autocomplete.AutocompleteIndex.load(self.index_path)
+            
+            self._autocomplete = index
+            self._autocomplete_loaded_at = time.monotonic()
+        return index
+    
+    def autocomplete(self, prefix: str, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Complete a name prefix to listed corporations.
+        
+        Args:
+            prefix: Beginning of a Korean or English corporation name
+            k: Maximum number of completions
+            
+        Returns:
+            Up to ``k`` listed corporations, most accessed first
+        """
+        return self._get_autocomplete_index().complete(prefix, k)
+    
+    def export_snapshot(self, path: Optional[Path] = None) -> int:
+        """
+        Write a memory-mappable snapshot of all active corporations.
         
-        conn.close()
+        Serving processes can open it with ``corpcode_snapshot.CorpCodeSnapshot``
+        instead of instantiating a storage.
         
-        # Save index
-        with open(self.index_path, 'w', encoding='utf-8') as f:
-            json.dump(index, f, ensure_ascii=False, indent=2)
+        Args:
+            path: Destination file. Defaults to storage/corpcode.snapshot.
+            
+        Returns:
+            Number of corporations written
+        """
+        path = Path(path) if path else self.snapshot_path
+        with self._connection() as conn:
+            conn.execute("BEGIN")
+            generation_row = conn.execute("SELECT value FROM storage_meta WHERE key = 'generation'").fetchone()
+            rows = conn.execute('''
+                SELECT corp_code, corp_name, corp_eng_name, stock_code, modify_date
+                FROM corporations
+                WHERE is_deleted = 0
+            ''').fetchall()
+            conn.rollback()
         
-        logger.info(f"Exported index with {len(index)} entries to {self.index_path}")
-        return len(index)
+        generation = int(generation_row[0]) if generation_row else 0
+        count = corpcode_snapshot.write_snapshot(path, rows, generation=generation)
+        logger.info(f"Exported snapshot with {count} corporations to {path}")
+        return count
     
     def clear_cache(self):
         """Clear in-memory cache"""
-        self.cache.clear()
+        self.cache.invalidate()
+        self.search_cache.invalidate()
         self._save_cache()
-        self.get_corp_code.cache_clear()
         logger.info("Cache cleared")
     
     def get_statistics(self) -> Dict[str, Any]:
-        """Get storage statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Total corporations
-        cursor.execute("SELECT COUNT(*) FROM corporations")
-        total_corps = cursor.fetchone()[0]
-        
-        # Corporations with stock codes
-        cursor.execute("SELECT COUNT(*) FROM corporations WHERE stock_code != '' AND stock_code != ' '")
-        listed_corps = cursor.fetchone()[0]
-        
-        # Total searches
-        cursor.execute("SELECT COUNT(*) FROM search_sessions")
-        total_searches = cursor.fetchone()[0]
+        """
+        Get storage statistics.
         
-        # Successful searches
-        cursor.execute("SELECT COUNT(*) FROM search_sessions WHERE success = 1")
-        successful_searches = cursor.fetchone()[0]
+        Counts come from materialised counters plus not-yet-flushed sessions,
+        and file sizes are refreshed at most every few seconds, so this is
+        cheap enough to poll at high frequency.
+        """
+        placeholders = ",".join("?" * len(_COUNTER_QUERIES))
+        with self._connection() as conn:
+            counters = {
+                key: int(value) for key, value in conn.execute(
+                    f"SELECT key, value FROM storage_meta WHERE key IN ({placeholders})", tuple(_COUNTER_QUERIES)
+                )
+            }
         
-        conn.close()
+        pending = self._writer.pending_sessions()
+        total_corps = counters.get('total_corporations', 0)
+        listed_corps = counters.get('listed_corporations', 0)
+        total_searches = counters.get('total_searches', 0) + len(pending)
+        successful_searches = counters.get('successful_searches', 0) + sum(1 for session in pending if session.success)
         
         return {
             'total_corporations': total_corps,
@@ -529,12 +1621,24 @@ class CorpCodeStorage:
             'successful_searches': successful_searches,
             'success_rate': successful_searches / total_searches if total_searches > 0 else 0,
             'cache_size': len(self.cache),
-            'storage_size_mb': {
+            'cache': self.cache.get_metrics(),
+            'search_cache': self.search_cache.get_metrics(),
+            'write_behind': self._writer.get_metrics(),
+            'shared': self._shared.get_metrics() if self._shared is not None else None,
+            'storage_size_mb': self._get_storage_sizes()
+        }
+    
+    def _get_storage_sizes(self) -> Dict[str, float]:
+        """File sizes in MB, re-measured at most every _SIZE_REFRESH_INTERVAL seconds"""
+        now = time.monotonic()
+        if self._storage_sizes is None or now - self._storage_sizes_at >= _SIZE_REFRESH_INTERVAL:
+            self._storage_sizes = {
                 'database': self.db_path.stat().st_size / 1024 / 1024 if self.db_path.exists() else 0,
                 'cache': self.cache_path.stat().st_size / 1024 / 1024 if self.cache_path.exists() else 0,
-                'sessions': self.session_path.stat().st_size / 1024 / 1024 if self.session_path.exists() else 0
+                'sessions': self._session_log.size_bytes() / 1024 / 1024
             }
-        }
+            self._storage_sizes_at = now
+        return self._storage_sizes
 
 
 # Singleton instance
@@ -581,4 +1685,28 @@ def quick_search(query: str) -> List[Dict[str, str]]:
 def get_corp_code_quick(corp_name: str) -> Optional[str]:
     """Quick lookup for corporation code"""
     storage = get_storage()
-    return storage.get_corp_code(corp_name)
\ No newline at end of file
+    return storage.get_corp_code(corp_name)
+
+
+def get_corp_codes_bulk(corp_names: List[str]) -> Dict[str, Optional[str]]:
+    """Resolve many corporation names to codes in one pass"""
+    storage = get_storage()
+    return storage.get_corp_codes_bulk(corp_names)
+
+
+def resolve_identifier(identifier: str) -> Optional[Dict[str, Any]]:
+    """Translate between corp_code, stock_code, ISIN and name"""
+    storage = get_storage()
+    return storage.resolve_identifier(identifier)
+
+
+def fuzzy_search(query: str, limit: int = 5) -> List[Dict[str, Any]]:
+    """Quick fuzzy search for corporations"""
+    storage = get_storage()
+    return storage.fuzzy_search(query, limit)
+
+
+def autocomplete(prefix: str, k: int = 10) -> List[Dict[str, Any]]:
+    """Complete a name prefix to the most popular listed corporations"""
+    storage = get_storage()
+    return storage.autocomplete(prefix, k)
@@ -0,0 +1,176 @@
+"""
+CORPCODE Write-Behind Module
+============================
+Keeps access counters and search-session events in memory and flushes them to
+persistent storage in batches from a background thread, so lookups never wait
+on bookkeeping I/O.
+
+Flushes happen when the flush interval elapses, when the number of pending
+events reaches a threshold, and on shutdown.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (access_count_delta, last_accessed) per corp_code
+AccessUpdates = Dict[str, Tuple[int, str]]
+FlushCallback = Callable[[AccessUpdates, List[Any]], None]
+
+
+class WriteBehindBuffer:
+    """
+    Buffers access statistics and session events for batched persistence.
+
+    The flush callback receives the aggregated access updates and the list of
+    session events and is always invoked from a single thread at a time.
+    """
+
+    def __init__(self, flush_callback: FlushCallback, flush_interval: float = 2.0,
+                 max_pending: int = 500, max_retained: int = 50000,
+                 tick_callback: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            flush_callback: Persists one batch of access updates and sessions
+            flush_interval: Seconds between background flushes
+            max_pending: Pending event count that triggers an early flush
+            max_retained: Upper bound on session events kept after failed flushes
+            tick_callback: Optional housekeeping run on the flusher thread every interval
+        """
+        self._flush_callback = flush_callback
+        self._tick_callback = tick_callback
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retained = max_retained
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._access: AccessUpdates = {}
+        self._sessions: List[Any] = []
+        self._pending = 0
+
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.flush_count = 0
+        self.flushed_events = 0
+
+    def start(self):
+        """Start the background flusher thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="corpcode-write-behind", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+            if self._tick_callback is not None:
+                try:
+                    self._tick_callback()
+                except Exception as e:
+                    logger.error(f"Write-behind housekeeping failed: {e}")
+
+    def record_access(self, corp_code: str, timestamp: str):
+        """Count one access to a corporation"""
+        with self._lock:
+            count, _ = self._access.get(corp_code, (0, timestamp))
+            self._access[corp_code] = (count + 1, timestamp)
+            self._pending += 1
+            full = self._pending >= self.max_pending
+        if full:
+            self._wakeup.set()
+
+    def record_accesses(self, corp_codes: Iterable[str], timestamp: str):
+        """Count one access to each of several corporations under a single lock"""
+        with self._lock:
+            for corp_code in corp_codes:
+                count, _ = self._access.get(corp_code, (0, timestamp))
+                self._access[corp_code] = (count + 1, timestamp)
+                self._pending += 1
+            full = self._pending >= self.max_pending
+        if full:
+            self._wakeup.set()
+
+    def record_session(self, session: Any):
+        """Queue one search-session event"""
+        with self._lock:
+            self._sessions.append(session)
+            self._pending += 1
+            full = self._pending >= self.max_pending
+        if full:
+            self._wakeup.set()
+
+    def pending_access(self, corp_code: str) -> Tuple[int, Optional[str]]:
+        """Return the not-yet-flushed access delta and timestamp for a corporation"""
+        with self._lock:
+            return self._access.get(corp_code, (0, None))
+
+    def pending_sessions(self) -> List[Any]:
+        """Return a copy of the not-yet-flushed session events"""
+        with self._lock:
+            return list(self._sessions)
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._pending
+
+    def flush(self) -> int:
+        """
+        Persist everything buffered so far.
+        
+        Returns:
+            Number of events flushed
+        """
+        with self._flush_lock:
+            with self._lock:
+                access, self._access = self._access, {}
+                sessions, self._sessions = self._sessions, []
+                pending, self._pending = self._pending, 0
+
+            if not pending:
+                return 0
+
+            try:
+                self._flush_callback(access, sessions)
+            except Exception as e:
+                logger.error(f"Write-behind flush failed, retrying later: {e}")
+                self._requeue(access, sessions)
+                return 0
+
+            self.flush_count += 1
+            self.flushed_events += pending
+            return pending
+
+    def _requeue(self, access: AccessUpdates, sessions: List[Any]):
+        """Merge a failed batch back in front of newer events"""
+        with self._lock:
+            for corp_code, (count, timestamp) in access.items():
+                newer_count, newer_timestamp = self._access.get(corp_code, (0, timestamp))
+                self._access[corp_code] = (count + newer_count, newer_timestamp)
+            self._sessions = (sessions + self._sessions)[-self.max_retained:]
+            self._pending = sum(count for count, _ in self._access.values()) + len(self._sessions)
+
+    def close(self):
+        """Stop the flusher thread and flush remaining events"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Return flush counters for monitoring"""
+        return {
+            'pending_events': self.pending_count,
+            'flush_count': self.flush_count,
+            'flushed_events': self.flushed_events,
+        }
@@ -0,0 +1,333 @@
+"""
+DART Open API HTTP 클라이언트 모듈
+
+모든 DART 호출이 하나의 keep-alive 커넥션 풀을 공유하도록 requests.Session
+기반 클라이언트를 제공합니다. 도구 호출마다 새 TCP/TLS 연결을 맺지 않고
+기존 연결을 재사용하며, 엔드포인트별 타임아웃과 gzip 전송을 적용합니다.
+
+대용량 ZIP은 download()로 받습니다. 전송이 끊기면 HTTP Range로 받은 지점부터
+이어 받고, 서버가 Range를 지원하지 않으면 처음부터 다시 받되 이미 기록한 부분은
+건너뛰어(체크포인트) 대상 파일에는 새 바이트만 덧붙입니다.
+
+모든 요청은 API 키별 공용 속도 제한기(rate_limiter.get_rate_limiter('dart', ...))의
+우선순위 큐와 일일 한도를 거치며, HTTP 429와 DART 020 응답은 적응형 백오프로 이어집니다.
+
+테스트에서는 set_dart_client()로 가짜 세션을 주입할 수 있습니다.
+"""
+
+import random
+import re
+import threading
+import time
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..config import config
+from .rate_limiter import ProviderRateLimiter, get_rate_limiter
+
+DART_API_BASE_URL = "https://opendart.fss.or.kr/api"
+
+# (connect, read) 타임아웃 초. 대용량 ZIP 엔드포인트는 읽기 시간을 길게 둠
+Timeout = Union[float, Tuple[float, float]]
+DEFAULT_TIMEOUT: Timeout = (5.0, 30.0)
+ENDPOINT_TIMEOUTS: Dict[str, Timeout] = {
+    'corpCode.xml': (5.0, 120.0),
+    'document.xml': (5.0, 120.0),
+    'fnlttXbrl.xml': (5.0, 120.0),
+    'list.json': (5.0, 15.0),
+}
+
+# download()가 연결 끊김/5xx 후 이어 받기를 시도하는 횟수
+DEFAULT_DOWNLOAD_RETRIES = 3
+
+_CONTENT_RANGE = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+|\*)')
+
+
+class IncompleteDownloadError(requests.exceptions.RequestException):
+    """응답이 Content-Length보다 짧게 끝나거나 길게 온 경우"""
+
+
+def _parse_content_range(value: Optional[str]) -> Optional[Tuple[int, Optional[int]]]:
+    """'bytes 100-199/1000' → (100, 1000). 전체 크기를 모르면 (100, None)"""
+    match = _CONTENT_RANGE.match(value or '')
+    if not match:
+        return None
+    total = match.group(3)
+    return int(match.group(1)), (int(total) if total != '*' else None)
+
+
+class DartClient:
+    """
+    커넥션 풀을 가진 DART Open API 클라이언트
+    """
+
+    def __init__(self, api_key: Optional[str] = None, pool_size: Optional[int] = None,
+                 timeouts: Optional[Dict[str, Timeout]] = None, default_timeout: Timeout = DEFAULT_TIMEOUT,
+                 session: Optional[requests.Session] = None, base_url: str = DART_API_BASE_URL,
+                 download_retries: int = DEFAULT_DOWNLOAD_RETRIES, retry_backoff: float = 1.0,
+                 rate_limiter: Optional[ProviderRateLimiter] = None):
+        """
+        Args:
+            api_key: DART API 키 (기본값: config.DART_API_KEY)
+            pool_size: 호스트당 유지할 keep-alive 연결 수 (기본값: config.DART_HTTP_POOL_SIZE)
+            timeouts: 엔드포인트별 타임아웃 덮어쓰기
+            default_timeout: 목록에 없는 엔드포인트의 타임아웃
+            session: 주입할 세션 (테스트용). 없으면 풀링 세션을 생성
+            base_url: API 기본 URL
+            download_retries: download()의 이어 받기 재시도 횟수
+            retry_backoff: 이어 받기 전 첫 대기 시간(초), 이후 2배씩 증가
+            rate_limiter: 속도 제한기 (기본값: API 키별 공용 제한기)
+        """
+        self.api_key = api_key if api_key is not None else config.DART_API_KEY
+        self.pool_size = pool_size or config.DART_HTTP_POOL_SIZE
+        self.timeouts = {**ENDPOINT_TIMEOUTS, **(timeouts or {})}
+        self.default_timeout = default_timeout
+        self.base_url = base_url.rstrip('/')
+        self.session = session if session is not None else self._create_session(self.pool_size)
+        self.download_retries = download_retries
+        self.retry_backoff = retry_backoff
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter('dart', self.api_key)
+
+        self._lock = threading.Lock()
+        self.request_counts: Dict[str, int] = {}
+        self.download_stats = {'downloads': 0, 'bytes': 0, 'seconds': 0.0, 'retries': 0,
+                               'resumed': 0, 'restarted': 0, 'failed': 0}
+
+    @staticmethod
+    def _create_session(pool_size: int) -> requests.Session:
+        """keep-alive 커넥션 풀과 gzip 헤더가 설정된 세션 생성"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+            'User-Agent': 'adk-finance-agent/dart-analytics',
+        })
+        return session
+
+    def timeout_for(self, endpoint: str) -> Timeout:
+        """엔드포인트에 적용할 (connect, read) 타임아웃"""
+        return self.timeouts.get(endpoint, self.default_timeout)
+
+    def url(self, endpoint: str) -> str:
+        return f"{self.base_url}/{endpoint}"
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, stream: bool = False,
+            timeout: Optional[Timeout] = None, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        DART API GET 요청 (crtfc_key 자동 추가, 속도 제한기 차례를 기다림)
+
+        stream=True 응답은 연결이 풀로 반환되도록 with 문으로 사용하세요.
+        스트리밍 XML 응답의 DART 020은 본문을 읽는 쪽에서 report_throttled()로 알려야 합니다.
+
+        Args:
+            endpoint: API 엔드포인트 (예: 'document.xml', 'list.json')
+            params: crtfc_key를 제외한 요청 파라미터
+            stream: 본문을 스트리밍으로 읽을지 여부
+            timeout: 타임아웃 덮어쓰기
+            headers: 추가 요청 헤더
+
+        Returns:
+            requests.Response
+
+        Raises:
+            RateLimitError: 일일 한도 소진 또는 대기 시간 초과
+        """
+        self.rate_limiter.acquire()
+        full_params = {'crtfc_key': self.api_key, **(params or {})}
+        with self._lock:
+            self.request_counts[endpoint] = self.request_counts.get(endpoint, 0) + 1
+        response = self.session.get(
+            self.url(endpoint),
+            params=full_params,
+            timeout=timeout if timeout is not None else self.timeout_for(endpoint),
+            stream=stream,
+            headers=headers,
+        )
+        if response.status_code == 429:
+            self.rate_limiter.report_throttled()
+        elif not stream:
+            self.rate_limiter.report(response.text)
+        elif 'xml' not in response.headers.get('content-type', ''):
+            self.rate_limiter.report_success()
+        return response
+
+    def report_throttled(self) -> float:
+        """DART 020(요청 제한 초과) 응답을 받았음을 속도 제한기에 알림"""
+        return self.rate_limiter.report_throttled()
+
+    def download(self, endpoint: str, params: Optional[Dict[str, Any]], target: BinaryIO,
+                 check_response: Optional[Callable[[requests.Response], None]] = None,
+                 max_retries: Optional[int] = None) -> Dict[str, Any]:
+        """
+        응답 본문을 target에 기록합니다. 끊기면 이어 받습니다.
+
+        - 서버가 Range를 지원하면(206) 받은 지점부터 이어 받기
+        - 지원하지 않으면(200) 처음부터 다시 받되 이미 기록한 바이트는 건너뜀
+        - Content-Length/Content-Range의 전체 크기와 받은 크기가 다르면 재시도
+        - 연결 오류, 타임아웃, 429/5xx는 지수 백오프 후 재시도
+
+        ZIP은 이미 압축되어 있으므로 Range 오프셋이 원본 바이트와 일치하도록 identity 전송을 요청합니다.
+
+        Args:
+            endpoint: API 엔드포인트
+            params: crtfc_key를 제외한 요청 파라미터
+            target: 기록할 바이너리 파일 객체 (append만 수행)
+            check_response: 첫 전체 응답(200 등)을 검사하는 함수. 예외를 던지면 재시도 없이 중단
+            max_retries: 재시도 횟수 덮어쓰기
+
+        Returns:
+            bytes, expected_bytes, seconds, bytes_per_sec, retries, resumed, restarted
+
+        Raises:
+            requests.RequestException: 재시도를 모두 소진한 경우
+        """
+        max_retries = self.download_retries if max_retries is None else max_retries
+        written = 0
+        expected: Optional[int] = None
+        use_range = True
+        checked = False
+        retries = resumed = restarted = 0
+        started = time.perf_counter()
+
+        while True:
+            headers = {'Accept-Encoding': 'identity'}
+            if written and use_range:
+                headers['Range'] = f'bytes={written}-'
+            try:
+                with self.get(endpoint, params, stream=True, headers=headers) as response:
+                    if response.status_code == 429 or response.status_code >= 500:
+                        raise requests.exceptions.HTTPError(
+                            f"HTTP {response.status_code}", response=response)
+
+                    content_range = _parse_content_range(response.headers.get('Content-Range'))
+                    if response.status_code == 206 and content_range and content_range[0] <= written:
+                        # 이어 받기: 서버가 보낸 시작점이 앞서면 겹치는 부분만 건너뜀
+                        skip = written - content_range[0]
+                        if content_range[1] is not None:
+                            expected = content_range[1]
+                        resumed += 1
+                    elif response.status_code == 416 or response.status_code == 206:
+                        # 범위를 맞출 수 없음 → 이후로는 Range 없이 체크포인트 방식으로 재시도
+                        use_range = False
+                        raise IncompleteDownloadError(f"Range 응답을 사용할 수 없음: HTTP {response.status_code}")
+                    else:
+                        if not checked and check_response is not None:
+                            check_response(response)
+                        checked = True
+                        if response.status_code != 200:
+                            response.raise_for_status()
+                        # Range 미지원(또는 첫 요청): 처음부터 오므로 이미 기록한 부분은 건너뜀
+                        skip = written
+                        if written:
+                            restarted += 1
+                        length = response.headers.get('Content-Length')
+                        if length and not response.headers.get('Content-Encoding'):
+                            expected = int(length)
+
+                    for chunk in response.iter_content(chunk_size=65536):
+                        if not chunk:
+                            continue
+                        if skip:
+                            if len(chunk) <= skip:
+                                skip -= len(chunk)
+                                continue
+                            chunk = chunk[skip:]
+                            skip = 0
+                        target.write(chunk)
+                        written += len(chunk)
+
+                if expected is not None and written != expected:
+                    raise IncompleteDownloadError(f"크기 불일치: {written}/{expected} 바이트")
+                break
+            except requests.exceptions.RequestException:
+                if retries >= max_retries:
+                    with self._lock:
+                        self.download_stats['failed'] += 1
+                        self.download_stats['retries'] += retries
+                    raise
+                retries += 1
+                time.sleep(self.retry_backoff * (2 ** (retries - 1)) * random.uniform(0.5, 1.5))
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            stats = self.download_stats
+            stats['downloads'] += 1
+            stats['bytes'] += written
+            stats['seconds'] += elapsed
+            stats['retries'] += retries
+            stats['resumed'] += resumed
+            stats['restarted'] += restarted
+        return {
+            'bytes': written,
+            'expected_bytes': expected,
+            'seconds': round(elapsed, 4),
+            'bytes_per_sec': round(written / elapsed, 1) if elapsed > 0 else 0.0,
+            'retries': retries,
+            'resumed': resumed,
+            'restarted': restarted,
+        }
+
+    def get_json(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        JSON 엔드포인트 호출
+
+        Raises:
+            requests.HTTPError: HTTP 상태 코드가 200이 아닌 경우
+        """
+        with self.get(endpoint, params) as response:
+            response.raise_for_status()
+            return response.json()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self.request_counts)
+            downloads = dict(self.download_stats)
+        downloads['bytes_per_sec'] = round(downloads['bytes'] / downloads['seconds'], 1) if downloads['seconds'] > 0 else 0.0
+        downloads['seconds'] = round(downloads['seconds'], 3)
+        return {
+            'pool_size': self.pool_size,
+            'requests': sum(counts.values()),
+            'requests_by_endpoint': counts,
+            'downloads': downloads,
+            'rate_limiter': self.rate_limiter.get_metrics(),
+        }
+
+    def close(self):
+        """세션과 풀링된 연결을 모두 닫음"""
+        self.session.close()
+
+
+# 프로세스 전역 클라이언트
+_client: Optional[DartClient] = None
+_client_lock = threading.Lock()
+
+
+def get_dart_client() -> DartClient:
+    """공유 DART 클라이언트를 반환 (없으면 생성)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = DartClient()
+    return _client
+
+
+def set_dart_client(client: Optional[DartClient]) -> Optional[DartClient]:
+    """
+    공유 DART 클라이언트를 교체합니다 (테스트 주입용).
+
+    Args:
+        client: 새 클라이언트. None이면 다음 호출 시 기본 클라이언트를 다시 생성
+
+    Returns:
+        이전 클라이언트 (닫지 않음)
+    """
+    global _client
+    with _client_lock:
+        previous, _client = _client, client
+    return previous
@@ -3,9 +3,7 @@ DART ZIP 파일 처리 유틸리티
 공시서류 원본파일(ZIP)을 자동으로 분석하고 구조화된 데이터를 추출합니다.
 """
 
-import zipfile
 import os
-import tempfile
 import shutil
 from pathlib import Path
 import xml.etree.ElementTree as ET
@@ -14,6 +12,7 @@ import re
 import json
 from typing import Dict, List, Optional, Any
 import logging
+from .filing_archive import FilingArchive
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -39,7 +38,7 @@ class DartZipProcessor:
 
     def analyze_dart_zip_file(self, zip_file_path: str) -> Dict[str, Any]:
         """
-        DART ZIP 파일을 자동으로 압축 해제하고 내용을 분석
+        DART ZIP 파일의 내용을 분석 (압축을 풀지 않고 FilingArchive로 멤버를 직접 읽음)
         
         Args:
             zip_file_path: ZIP 파일 경로
@@ -64,20 +63,11 @@ class DartZipProcessor:
                 analysis_result["error"] = "ZIP 파일을 찾을 수 없습니다."
                 return analysis_result
             
-            # 임시 디렉토리 생성
-            temp_dir = tempfile.mkdtemp(prefix="dart_analysis_")
-            self.temp_dirs.append(temp_dir)
-            
-            # ZIP 파일 압축 해제 (인코딩 문제 우회)
-            with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-            
-            # 압축 해제된 파일들 분석
-            for root, dirs, files in os.walk(temp_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
+            # 멤버 목록만 읽고, 각 파일은 분석할 때 필요한 만큼만 압축 해제
+            with FilingArchive(zip_file_path) as archive:
+                for member in archive.members:
                     try:
-                        file_info = self._analyze_file(file_path)
+                        file_info = self._analyze_file(archive, member)
                         analysis_result["files"].append(file_info)
                         analysis_result["file_count"] += 1
                         analysis_result["total_size"] += file_info["size"]
@@ -86,7 +76,7 @@ class DartZipProcessor:
                         self._classify_file(file_info, analysis_result)
                         
                     except Exception as e:
-                        logger.warning(f"파일 분석 중 오류 발생 {file}: {str(e)}")
+                        logger.warning(f"파일 분석 중 오류 발생 {member['name']}: {str(e)}")
             
             # 요약 생성
             analysis_result["summary"] = self._generate_file_summary(analysis_result)
@@ -98,13 +88,15 @@ class DartZipProcessor:
         
         return analysis_result
 
-    def _analyze_file(self, file_path: str) -> Dict[str, Any]:
-        """개별 파일 분석"""
+    def _analyze_file(self, archive: FilingArchive, member: Dict[str, Any]) -> Dict[str, Any]:
+        """개별 파일 분석 (ZIP 멤버)"""
         file_info = {
-            "name": os.path.basename(file_path),
-            "path": file_path,
-            "size": os.path.getsize(file_path),
-            "type": Path(file_path).suffix.lower(),
+            "name": member["name"],
+            "path": member["path"],
+            "archive": archive.path,
+            "size": member["size"],
+            "compressed_size": member["compressed_size"],
+            "type": member["type"],
             "content_summary": "",
             "encoding": "unknown",
             "is_main_document": False,
@@ -113,11 +105,11 @@ class DartZipProcessor:
         
         # 파일 유형별 분석
         if file_info["type"] in ['.xml', '.html', '.htm']:
-            file_info["content_summary"] = self._extract_xml_html_summary(file_path)
+            file_info["content_summary"] = self._extract_xml_html_summary(archive, member)
             file_info["document_type"] = self._identify_document_type(file_info["name"])
             file_info["is_main_document"] = self._is_main_document(file_info["name"])
         elif file_info["type"] == '.txt':
-            file_info["content_summary"] = self._extract_text_summary(file_path)
+            file_info["content_summary"] = self._extract_text_summary(archive, member)
         
         return file_info
 
@@ -132,20 +124,12 @@ class DartZipProcessor:
         elif file_info["type"] in ['.pdf', '.hwp', '.doc', '.docx']:
             analysis_result["attachments"].append(file_info)
 
-    def _extract_xml_html_summary(self, file_path: str) -> str:
+    def _extract_xml_html_summary(self, archive: FilingArchive, member: Dict[str, Any]) -> str:
         """XML/HTML 파일에서 주요 내용 추출"""
         try:
             # 인코딩 시도 목록
             encodings = ['utf-8', 'cp949', 'euc-kr', 'latin1']
-            content = None
-            
-            for encoding in encodings:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        content = f.read()
-                    break
-                except UnicodeDecodeError:
-                    continue
+            content = archive.read_text(member, encodings)
             
             if content is None:
                 return "인코딩 오류로 내용을 읽을 수 없습니다."
@@ -181,25 +165,19 @@ class DartZipProcessor:
         except Exception as e:
             return f"분석 오류: {str(e)}"
 
-    def _extract_text_summary(self, file_path: str) -> str:
+    def _extract_text_summary(self, archive: FilingArchive, member: Dict[str, Any]) -> str:
         """텍스트 파일에서 요약 추출"""
         try:
-            encodings = ['utf-8', 'cp949', 'euc-kr']
-            for encoding in encodings:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        content = f.read()
-                    
-                    # 처음 500자만 요약으로 사용
-                    summary = content[:500].strip()
-                    if len(content) > 500:
-                        summary += "..."
-                    
-                    return summary
-                except UnicodeDecodeError:
-                    continue
+            content = archive.read_text(member, ['utf-8', 'cp949', 'euc-kr'])
+            if content is None:
+                return "텍스트 인코딩 오류"
             
-            return "텍스트 인코딩 오류"
+            # 처음 500자만 요약으로 사용
+            summary = content[:500].strip()
+            if len(content) > 500:
+                summary += "..."
+            
+            return summary
         except Exception as e:
             return f"텍스트 분석 오류: {str(e)}"
 
@@ -310,8 +288,7 @@ class DartZipProcessor:
         
         try:
             if main_doc["type"] in ['.xml', '.html', '.htm']:
-                with open(main_doc["path"], 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
+                content = self._read_member(main_doc)
                 
                 soup = BeautifulSoup(content, 'html.parser')
                 
@@ -379,8 +356,7 @@ class DartZipProcessor:
         
         try:
             if financial_file["type"] in ['.xml', '.html', '.htm']:
-                with open(financial_file["path"], 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
+                content = self._read_member(financial_file)
                 
                 soup = BeautifulSoup(content, 'html.parser')
                 
@@ -401,6 +377,11 @@ class DartZipProcessor:
         
         return financial_data
 
+    def _read_member(self, file_info: Dict[str, Any]) -> str:
+        """분석 결과의 파일 정보로 ZIP 멤버를 다시 열어 읽기"""
+        with FilingArchive(file_info["archive"]) as archive:
+            return archive.read_bytes(file_info).decode('utf-8', errors='ignore')
+
     def _get_current_time(self) -> str:
         """현재 시간 반환"""
         from datetime import datetime
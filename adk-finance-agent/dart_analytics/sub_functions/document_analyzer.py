@@ -10,7 +10,7 @@ import zipfile
 from pathlib import Path
 from bs4 import BeautifulSoup
 from .dart_zip_processor import DartZipProcessor
-from .file_handlers import download_document_zip
+from .file_handlers import download_document_zip, open_document_archive, open_document_files
 
 
 # ZIP 파일 처리기 인스턴스 생성
@@ -19,7 +19,7 @@ zip_processor = DartZipProcessor()
 
 def check_extracted_files_exist(rcept_no: str, download_folder: str = "./downloads") -> str:
     """
-    이미 압축 해제된 파일들이 있는지 확인합니다.
+    이미 받아 둔 공시서류 파일들(캐시된 ZIP 또는 압축 해제 폴더)이 있는지 확인합니다.
     
     Args:
         rcept_no: 접수번호 (14자리)
@@ -29,25 +29,20 @@ def check_extracted_files_exist(rcept_no: str, download_folder: str = "./downloa
         파일 존재 여부 및 파일 목록
     """
     try:
-        extract_folder = os.path.join(download_folder, f"extracted_{rcept_no}")
-        
-        if not os.path.exists(extract_folder):
-            return f"❌ 압축 해제된 폴더가 없습니다: {extract_folder}"
-        
-        # 압축 해제된 파일 목록 확인
-        extracted_files = []
-        for root, dirs, files in os.walk(extract_folder):
-            for file in files:
-                file_path = os.path.join(root, file)
-                extracted_files.append({
-                    'name': file,
-                    'path': file_path,
-                    'size_kb': os.path.getsize(file_path) / 1024
-                })
+        files = open_document_files(rcept_no, download_folder)
+        if files is None:
+            return f"❌ 다운로드된 공시서류가 없습니다 (접수번호: {rcept_no})"
+        
+        # 파일 목록 확인 (ZIP이면 압축을 풀지 않고 멤버 목록만 읽음)
+        with files:
+            extracted_files = [
+                {'name': member['name'], 'size_kb': member['size'] / 1024}
+                for member in files.members
+            ]
         
         result = []
-        result.append(f"✅ 압축 해제된 파일들이 이미 존재합니다")
-        result.append(f"📁 폴더 경로: {extract_folder}")
+        result.append(f"✅ 공시서류 파일들이 이미 존재합니다")
+        result.append(f"📁 위치: {files.path}")
         result.append(f"📋 총 {len(extracted_files)}개 파일")
         
         if extracted_files:
@@ -68,7 +63,8 @@ def check_extracted_files_exist(rcept_no: str, download_folder: str = "./downloa
 
 def read_extracted_file_content(rcept_no: str, filename: str, download_folder: str = "./downloads") -> str:
     """
-    압축 해제된 특정 파일의 내용을 읽어서 보여줍니다.
+    공시서류의 특정 파일 내용을 읽어서 보여줍니다.
+    캐시된 ZIP에서는 해당 멤버만 열어 읽으므로 전체를 압축 해제하지 않습니다.
     
     Args:
         rcept_no: 접수번호 (14자리)
@@ -79,103 +75,80 @@ def read_extracted_file_content(rcept_no: str, filename: str, download_folder: s
         파일 내용 또는 오류 메시지
     """
     try:
-        extract_folder = os.path.join(download_folder, f"extracted_{rcept_no}")
+        files = open_document_files(rcept_no, download_folder)
+        if files is None:
+            return f"❌ 다운로드된 공시서류가 없습니다 (접수번호: {rcept_no})\n먼저 download_and_extract_dart_document 함수를 실행해주세요."
         
-        if not os.path.exists(extract_folder):
-            return f"❌ 압축 해제된 폴더가 없습니다: {extract_folder}\n먼저 download_and_extract_dart_document 함수를 실행해주세요."
+        with files:
+            return _read_document_member(files, filename)
         
-        # 파일 찾기
-        target_file = None
-        for root, dirs, files in os.walk(extract_folder):
-            for file in files:
-                if file == filename or file.lower() == filename.lower():
-                    target_file = os.path.join(root, file)
-                    break
-            if target_file:
-                break
-        
-        if not target_file:
-            # 사용가능한 파일 목록 제공
-            available_files = []
-            for root, dirs, files in os.walk(extract_folder):
-                for file in files:
-                    available_files.append(file)
-            
-            result = [f"❌ '{filename}' 파일을 찾을 수 없습니다."]
-            result.append("\n📄 사용 가능한 파일들:")
-            for file in available_files[:10]:
-                result.append(f"   • {file}")
-            if len(available_files) > 10:
-                result.append(f"   ... 및 {len(available_files) - 10}개 추가 파일")
-            
-            return "\n".join(result)
-        
-        # 파일 내용 읽기
-        file_size = os.path.getsize(target_file)
-        file_ext = os.path.splitext(target_file)[1].lower()
+    except Exception as e:
+        return f"❌ 파일 읽기 중 오류 발생: {str(e)}"
+
+
+def _read_document_member(files, filename: str) -> str:
+    """FilingArchive/ExtractedFolder에서 파일 하나를 찾아 내용 표시 (해당 멤버만 읽음)"""
+    # 파일 찾기
+    member = files.find(filename)
+    
+    if not member:
+        # 사용가능한 파일 목록 제공
+        available_files = [m['name'] for m in files.members]
         
-        result = []
-        result.append(f"📄 파일 내용: {filename}")
-        result.append("=" * 50)
-        result.append(f"📁 파일 경로: {target_file}")
-        result.append(f"💾 파일 크기: {file_size / 1024:.1f} KB")
-        result.append("")
+        result = [f"❌ '{filename}' 파일을 찾을 수 없습니다."]
+        result.append("\n📄 사용 가능한 파일들:")
+        for file in available_files[:10]:
+            result.append(f"   • {file}")
+        if len(available_files) > 10:
+            result.append(f"   ... 및 {len(available_files) - 10}개 추가 파일")
         
-        # 파일 유형별 처리
-        if file_ext in ['.xml', '.html', '.htm']:
-            # XML/HTML 파일 처리
-            encodings = ['utf-8', 'cp949', 'euc-kr', 'latin1']
-            content = None
-            
-            for encoding in encodings:
-                try:
-                    with open(target_file, 'r', encoding=encoding) as f:
-                        content = f.read()
-                    break
-                except UnicodeDecodeError:
-                    continue
+        return "\n".join(result)
+    
+    # 파일 내용 읽기
+    file_size = member['size']
+    file_ext = member['type']
+    
+    result = []
+    result.append(f"📄 파일 내용: {filename}")
+    result.append("=" * 50)
+    result.append(f"📁 파일 경로: {files.display_path(member)}")
+    result.append(f"💾 파일 크기: {file_size / 1024:.1f} KB")
+    result.append("")
+    
+    # 파일 유형별 처리
+    if file_ext in ['.xml', '.html', '.htm']:
+        # XML/HTML 파일 처리
+        content = files.read_text(member, ['utf-8', 'cp949', 'euc-kr', 'latin1'])
+        
+        if content:
+            # BeautifulSoup으로 정리된 텍스트 추출
+            soup = BeautifulSoup(content, 'html.parser')
+            text_content = soup.get_text()
             
-            if content:
-                # BeautifulSoup으로 정리된 텍스트 추출
-                soup = BeautifulSoup(content, 'html.parser')
-                text_content = soup.get_text()
+            # 처음 2000자만 표시
+            if len(text_content) > 2000:
+                result.append(f"📝 내용 (처음 2000자):")
+                result.append(text_content[:2000] + "\n...")
+            else:
+                result.append(f"📝 전체 내용:")
+                result.append(text_content)
                 
-                # 처음 2000자만 표시
-                if len(text_content) > 2000:
-                    result.append(f"📝 내용 (처음 2000자):")
-                    result.append(text_content[:2000] + "\n...")
-                else:
-                    result.append(f"📝 전체 내용:")
-                    result.append(text_content)
-                    
-        elif file_ext == '.txt':
-            # 텍스트 파일 처리
-            encodings = ['utf-8', 'cp949', 'euc-kr']
-            content = None
-            
-            for encoding in encodings:
-                try:
-                    with open(target_file, 'r', encoding=encoding) as f:
-                        content = f.read()
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            if content:
-                if len(content) > 2000:
-                    result.append(f"📝 내용 (처음 2000자):")
-                    result.append(content[:2000] + "\n...")
-                else:
-                    result.append(f"📝 전체 내용:")
-                    result.append(content)
-        else:
-            result.append(f"⚠️  {file_ext} 파일은 직접 읽기를 지원하지 않습니다.")
-            result.append("💡 analyze_extracted_dart_document 함수를 사용하여 분석하세요.")
-        
-        return "\n".join(result)
-        
-    except Exception as e:
-        return f"❌ 파일 읽기 중 오류 발생: {str(e)}"
+    elif file_ext == '.txt':
+        # 텍스트 파일 처리
+        content = files.read_text(member, ['utf-8', 'cp949', 'euc-kr'])
+        
+        if content:
+            if len(content) > 2000:
+                result.append(f"📝 내용 (처음 2000자):")
+                result.append(content[:2000] + "\n...")
+            else:
+                result.append(f"📝 전체 내용:")
+                result.append(content)
+    else:
+        result.append(f"⚠️  {file_ext} 파일은 직접 읽기를 지원하지 않습니다.")
+        result.append("💡 analyze_extracted_dart_document 함수를 사용하여 분석하세요.")
+    
+    return "\n".join(result)
 
 
 def analyze_extracted_dart_document(rcept_no: str, user_query: str = "", analysis_focus: str = "all", download_folder: str = "./downloads") -> str:
@@ -192,28 +165,34 @@ def analyze_extracted_dart_document(rcept_no: str, user_query: str = "", analysi
         분석 결과
     """
     try:
-        # 압축 해제된 폴더 경로
-        extract_folder = os.path.join(download_folder, f"extracted_{rcept_no}")
-        
-        if not os.path.exists(extract_folder):
-            return f"❌ 압축 해제된 폴더를 찾을 수 없습니다: {extract_folder}\n먼저 download_and_extract_dart_document 함수를 실행해주세요."
-        
-        # 임시 ZIP 파일 생성 (DartZipProcessor 호환성을 위해)
-        temp_zip_path = os.path.join(download_folder, f"temp_{rcept_no}.zip")
-        
-        with zipfile.ZipFile(temp_zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
-            for root, dirs, files in os.walk(extract_folder):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    # 폴더 구조 유지하면서 ZIP에 추가
-                    arcname = os.path.relpath(file_path, extract_folder)
-                    zip_ref.write(file_path, arcname)
-        
-        # ZIP 파일 분석
-        response = zip_processor.process_document_zip(temp_zip_path, user_query, analysis_focus)
-        
-        # 임시 ZIP 파일 삭제
-        os.remove(temp_zip_path)
+        # 캐시된 ZIP이 있으면 그대로 분석 (압축 해제 불필요)
+        archive = open_document_archive(rcept_no, download_folder)
+        if archive is not None:
+            with archive:
+                response = zip_processor.process_document_zip(archive.path, user_query, analysis_focus)
+        else:
+            # 압축 해제된 폴더 경로
+            extract_folder = os.path.join(download_folder, f"extracted_{rcept_no}")
+            
+            if not os.path.exists(extract_folder):
+                return f"❌ 압축 해제된 폴더를 찾을 수 없습니다: {extract_folder}\n먼저 download_and_extract_dart_document 함수를 실행해주세요."
+            
+            # 임시 ZIP 파일 생성 (DartZipProcessor 호환성을 위해)
+            temp_zip_path = os.path.join(download_folder, f"temp_{rcept_no}.zip")
+            
+            with zipfile.ZipFile(temp_zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+                for root, dirs, files in os.walk(extract_folder):
+                    for file in files:
+                        file_path = os.path.join(root, file)
+                        # 폴더 구조 유지하면서 ZIP에 추가
+                        arcname = os.path.relpath(file_path, extract_folder)
+                        zip_ref.write(file_path, arcname)
+            
+            # ZIP 파일 분석
+            response = zip_processor.process_document_zip(temp_zip_path, user_query, analysis_focus)
+            
+            # 임시 ZIP 파일 삭제
+            os.remove(temp_zip_path)
         
         if response["status"] != "success":
             return f"❌ 문서 분석 실패: {response.get('message', '알 수 없는 오류')}"
@@ -235,7 +214,8 @@ def analyze_extracted_dart_document(rcept_no: str, user_query: str = "", analysi
 
 def parse_xml_file_to_readable(rcept_no: str, filename: str, download_folder: str = "./downloads", show_full_content: bool = False, max_length: int = 10000) -> str:
     """
-    압축 해제된 XML 파일을 사용자 친화적인 형태로 파싱하여 보여줍니다.
+    공시서류의 XML 파일을 사용자 친화적인 형태로 파싱하여 보여줍니다.
+    캐시된 ZIP에서는 해당 멤버만 열어 읽으므로 전체를 압축 해제하지 않습니다.
     
     Args:
         rcept_no: 접수번호 (14자리)
@@ -248,52 +228,34 @@ def parse_xml_file_to_readable(rcept_no: str, filename: str, download_folder: st
         파싱된 XML 내용 또는 오류 메시지
     """
     try:
-        extract_folder = os.path.join(download_folder, f"extracted_{rcept_no}")
+        files = open_document_files(rcept_no, download_folder)
+        if files is None:
+            return f"❌ 다운로드된 공시서류가 없습니다 (접수번호: {rcept_no})\n먼저 download_and_extract_dart_document 함수를 실행해주세요."
         
-        if not os.path.exists(extract_folder):
-            return f"❌ 압축 해제된 폴더가 없습니다: {extract_folder}\n먼저 download_and_extract_dart_document 함수를 실행해주세요."
-        
-        # XML 파일 찾기
-        target_file = None
-        for root, dirs, files in os.walk(extract_folder):
-            for file in files:
-                if (file == filename or file.lower() == filename.lower()) and file.lower().endswith('.xml'):
-                    target_file = os.path.join(root, file)
-                    break
-            if target_file:
-                break
-        
-        if not target_file:
-            # 사용가능한 XML 파일 목록 제공
-            xml_files = []
-            for root, dirs, files in os.walk(extract_folder):
-                for file in files:
-                    if file.lower().endswith('.xml'):
-                        xml_files.append(file)
+        with files:
+            # XML 파일 찾기
+            target = files.find(filename, extensions=('.xml',))
             
-            result = [f"❌ '{filename}' XML 파일을 찾을 수 없습니다."]
-            if xml_files:
-                result.append("\n📄 사용 가능한 XML 파일들:")
-                for xml_file in xml_files[:10]:
-                    result.append(f"   • {xml_file}")
-                if len(xml_files) > 10:
-                    result.append(f"   ... 및 {len(xml_files) - 10}개 추가 XML 파일")
-            else:
-                result.append("\n⚠️  압축 해제된 폴더에 XML 파일이 없습니다.")
+            if not target:
+                # 사용가능한 XML 파일 목록 제공
+                xml_files = [member['name'] for member in files.filter(('.xml',))]
+                
+                result = [f"❌ '{filename}' XML 파일을 찾을 수 없습니다."]
+                if xml_files:
+                    result.append("\n📄 사용 가능한 XML 파일들:")
+                    for xml_file in xml_files[:10]:
+                        result.append(f"   • {xml_file}")
+                    if len(xml_files) > 10:
+                        result.append(f"   ... 및 {len(xml_files) - 10}개 추가 XML 파일")
+                else:
+                    result.append("\n⚠️  공시서류에 XML 파일이 없습니다.")
+                
+                return "\n".join(result)
             
-            return "\n".join(result)
-        
-        # XML 파일 읽기 및 파싱
-        encodings = ['utf-8', 'cp949', 'euc-kr', 'latin1']
-        xml_content = None
-        
-        for encoding in encodings:
-            try:
-                with open(target_file, 'r', encoding=encoding) as f:
-                    xml_content = f.read()
-                break
-            except UnicodeDecodeError:
-                continue
+            # XML 파일 읽기 (해당 멤버만 압축 해제)
+            xml_content = files.read_text(target, ['utf-8', 'cp949', 'euc-kr', 'latin1'])
+            target_file = files.display_path(target)
+            target_size = target['size']
         
         if not xml_content:
             return f"❌ XML 파일을 읽을 수 없습니다: {filename}"
@@ -302,7 +264,7 @@ def parse_xml_file_to_readable(rcept_no: str, filename: str, download_folder: st
         result.append(f"📄 XML 파일 파싱 결과: {filename}")
         result.append("=" * 60)
         result.append(f"📁 파일 경로: {target_file}")
-        result.append(f"💾 파일 크기: {os.path.getsize(target_file) / 1024:.1f} KB")
+        result.append(f"💾 파일 크기: {target_size / 1024:.1f} KB")
         result.append("")
         
         # BeautifulSoup으로 XML 파싱
@@ -0,0 +1,585 @@
+"""
+DART 다운로드 캐시 모듈
+
+(엔드포인트, 파라미터) 단위로 다운로드 결과를 캐시합니다.
+
+- 응답은 SpooledTemporaryFile에 받아 그 버퍼에서 바로 멤버를 풀고, 멤버 매니페스트를 기록
+- 압축을 풀지 않는 요청의 응답 본문은 SHA-256 해시 이름의 blob으로 보관 (같은 내용은 한 번만 저장)
+  압축 해제 요청은 폴더만 남기고 ZIP은 디스크에 쓰지 않음
+- 압축 해제는 임시 폴더에 한 뒤 rename으로 교체하고, 그 다음에 캐시 항목(완료 표시)을 기록
+  → 캐시 항목이 있으면 폴더는 항상 완전한 상태이며 반쯤 풀린 파일을 읽는 일이 없음
+  → 이미 같은 내용이 풀린 폴더는 그대로 두고, 다른 폴더는 .dart_cache/stale로 옮긴 뒤 교체
+    (읽고 있는 쪽의 파일을 그 자리에서 지우지 않음. 옮긴 폴더는 정리(sweep) 때 삭제)
+- 전송 중 끊김은 download 함수가 이어 받고, 크기와 ZIP CRC가 확인된 내용만 보관
+- 같은 키의 동시 요청은 진행 중인 다운로드 하나에 합류 (single-flight)
+  - 프로세스 내: 스레드가 선행 요청의 결과를 기다림
+  - 프로세스 간: 키별 잠금 파일을 잡은 뒤 캐시를 다시 확인 (다른 키의 다운로드는 서로 기다리지 않음)
+  - 오래된 잠금 파일은 정리(sweep) 때 아무도 잡고 있지 않으면 삭제
+- blob 총량이 상한을 넘거나 오래 쓰지 않은 blob은 주기적인 정리(sweep)에서 최근 사용 순으로 삭제
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from .corpcode_shared import FileLock
+
+# 응답 ZIP을 메모리에 둘 최대 크기. 대부분의 공시서류 ZIP은 이보다 작음
+SPOOL_MAX_BYTES = 32 * 1024 * 1024
+
+# blob 총량 상한과 미사용 보관 기간 (넘으면 가장 오래 쓰지 않은 blob부터 삭제)
+CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+CACHE_MAX_AGE_DAYS = 30
+
+# 키별 잠금 파일을 정리(sweep)에서 지우기까지 기다리는 시간
+_LOCK_GRACE = 86400
+
+# 키 잠금을 기다리는 최대 시간 (Windows의 msvcrt 잠금은 약 10초마다 포기하므로 다시 시도)
+_LOCK_TIMEOUT = 1800
+
+# 교체되어 stale로 옮긴 압축 해제 폴더를 지우기까지 기다리는 시간 (읽던 쪽이 끝낼 여유)
+_STALE_GRACE = 3600
+
+# 다운로드 후 정리를 다시 실행하기까지의 최소 간격 (초)
+_SWEEP_INTERVAL = 3600
+
+# blob 사용 시각(mtime)을 갱신하는 최소 간격 (조회마다 inode를 쓰지 않도록)
+_TOUCH_INTERVAL = 3600
+
+# 캐시 키에서 제외할 파라미터 (API 키는 결과에 영향을 주지 않음)
+_IGNORED_PARAMS = {'crtfc_key'}
+
+
+class _Flight:
+    """진행 중인 다운로드 하나 (합류한 스레드들이 결과를 기다림)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+    def wait(self) -> Dict[str, Any]:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return dict(self.result, source='joined')
+
+
+class _HashingWriter:
+    """쓰는 동안 SHA-256과 크기를 계산하는 파일 래퍼"""
+
+    def __init__(self, target: BinaryIO):
+        self.target = target
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.target.write(data)
+
+
+class DownloadCache:
+    """
+    내용 주소 기반 다운로드 캐시 (download_folder/.dart_cache)
+    """
+
+    def __init__(self, download_folder: str, spool_max_bytes: int = SPOOL_MAX_BYTES,
+                 max_bytes: Optional[int] = CACHE_MAX_BYTES,
+                 max_age_days: Optional[float] = CACHE_MAX_AGE_DAYS):
+        """
+        Args:
+            download_folder: extracted_* 폴더가 있는 다운로드 폴더
+            spool_max_bytes: 응답을 메모리에 둘 최대 크기 (넘으면 임시 파일로 넘침)
+            max_bytes: blob 총량 상한 (None이면 제한 없음)
+            max_age_days: 이 기간 동안 쓰지 않은 blob은 삭제 (None이면 제한 없음)
+        """
+        self.spool_max_bytes = spool_max_bytes
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.download_folder = Path(download_folder)
+        self.root = self.download_folder / ".dart_cache"
+        self.blob_dir = self.root / "blobs"
+        self.entry_dir = self.root / "entries"
+        self.tmp_dir = self.root / "tmp"
+        self.lock_dir = self.root / "locks"
+        self.stale_dir = self.root / "stale"
+
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _Flight] = {}
+        self._last_sweep = 0.0
+        self._sweeping = False
+        self._stored_bytes: Optional[int] = None  # 마지막 정리 이후 blob 총량 추정치
+        self.metrics = {'hits': 0, 'blob_hits': 0, 'downloads': 0, 'joined': 0, 'failures': 0,
+                        'sweeps': 0, 'evicted_blobs': 0, 'evicted_bytes': 0}
+
+    @staticmethod
+    def key_for(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """엔드포인트와 파라미터로 캐시 키 생성 (파라미터 순서 무관)"""
+        normalized = {k: str(v) for k, v in (params or {}).items() if k not in _IGNORED_PARAMS}
+        payload = json.dumps({'endpoint': endpoint, 'params': normalized}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.entry_dir / f"{key}.json"
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.blob_dir / sha256[:2] / f"{sha256}.zip"
+
+    def _lock_path(self, key: str) -> Path:
+        return self.lock_dir / f"{key}.lock"
+
+    def _acquire_key_lock(self, key: str) -> FileLock:
+        """
+        키별 잠금 파일을 잡아 반환 (다른 프로세스가 같은 키를 받는 동안 대기)
+
+        Raises:
+            TimeoutError: _LOCK_TIMEOUT 안에 잠금을 얻지 못한 경우
+        """
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + _LOCK_TIMEOUT
+        while True:
+            lock = FileLock(self._lock_path(key))
+            if lock.acquire():
+                # 기다리는 사이 정리(sweep)가 파일을 지웠으면 새 파일로 다시 잡음
+                if not lock.replaced:
+                    return lock
+                lock.release()
+                continue
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Timed out waiting for the download lock of {key}")
+            time.sleep(0.1)
+
+    @staticmethod
+    def _touch(path: Path, mtime: float):
+        """최근 사용 순 정리를 위해 blob 사용 시각 갱신 (최소 간격마다 한 번)"""
+        now = time.time()
+        if now - mtime >= _TOUCH_INTERVAL:
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+
+    def _read_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_entry(self, key: str, entry: Dict[str, Any]):
+        self.entry_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._entry_path(key).with_suffix(f".{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self._entry_path(key))
+
+    def blob_path(self, entry: Dict[str, Any]) -> Path:
+        """캐시 항목이 가리키는 ZIP blob 경로"""
+        return self._blob_path(entry['sha256'])
+
+    def lookup(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+               extracted: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        완료된 캐시 항목 조회
+
+        Args:
+            endpoint: API 엔드포인트
+            params: 요청 파라미터
+            extracted: True이면 압축 해제 폴더가 남아 있어야 하고, False이면 ZIP blob이 있어야 함
+
+        Returns:
+            캐시 항목 또는 None
+        """
+        entry = self._read_entry(self.key_for(endpoint, params))
+        if not entry:
+            return None
+        if extracted:
+            folder = entry.get('extract_folder')
+            return entry if folder and os.path.isdir(folder) else None
+        # 잘린 blob(디스크 가득 참 등)은 크기로 걸러 다시 받음
+        blob_path = self._blob_path(entry['sha256'])
+        try:
+            stat = blob_path.stat()
+        except OSError:
+            return None
+        if stat.st_size != entry['zip_size']:
+            return None
+        self._touch(blob_path, stat.st_mtime)
+        return entry
+
+    def fetch(self, endpoint: str, params: Dict[str, Any], extract_name: Optional[str],
+              download: Callable[[BinaryIO], Optional[Dict[str, Any]]],
+              extract: Callable[[BinaryIO, Optional[str]], List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        캐시에 있으면 바로 반환하고, 없으면 다운로드합니다.
+
+        Args:
+            endpoint: API 엔드포인트 (캐시 키)
+            params: 요청 파라미터 (캐시 키)
+            extract_name: download_folder 아래 압축 해제 폴더 이름. None이면 ZIP blob과 멤버 목록만 보관
+            download: 응답 본문을 주어진 파일 객체에 쓰는 함수 (실패 시 예외).
+                전송 통계(bytes_per_sec, retries, resumed, restarted)를 반환하면 io에 함께 기록
+            extract: (ZIP 파일 객체, 폴더)에 압축을 풀고 멤버 매니페스트를 반환하는 함수.
+                폴더가 None이면 압축을 풀지 않고 멤버 목록만 반환 (실패 시 예외)
+
+        Returns:
+            extract_folder, files, members, zip_size, sha256, io, source('cache'/'blob'/'download'/'joined')
+        """
+        key = self.key_for(endpoint, params)
+        entry = self.lookup(endpoint, params, extracted=extract_name is not None)
+        if entry:
+            with self._lock:
+                self.metrics['hits'] += 1
+            return dict(entry, source='cache')
+
+        # 압축 해제 요청과 ZIP만 필요한 요청은 결과가 다르므로 따로 합류
+        flight_key = f"{key}:{extract_name or ''}"
+        with self._lock:
+            flight = self._inflight.get(flight_key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[flight_key] = _Flight()
+            else:
+                self.metrics['joined'] += 1
+        if not leader:
+            return flight.wait()
+
+        try:
+            flight.result = self._fetch_locked(key, endpoint, params, extract_name, download, extract)
+            if flight.result['source'] == 'download':
+                self._maybe_sweep(flight.result['zip_size'])
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self.metrics['failures'] += 1
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[flight_key]
+            flight.done.set()
+
+    def _fetch_locked(self, key: str, endpoint: str, params: Dict[str, Any], extract_name: Optional[str],
+                      download: Callable[[BinaryIO], None],
+                      extract: Callable[[BinaryIO, Optional[str]], List[Dict[str, Any]]]) -> Dict[str, Any]:
+        self.entry_dir.mkdir(parents=True, exist_ok=True)
+        lock = self._acquire_key_lock(key)
+        try:
+            # 잠금을 기다리는 동안 다른 프로세스가 끝냈을 수 있음
+            entry = self.lookup(endpoint, params, extracted=extract_name is not None)
+            if entry:
+                with self._lock:
+                    self.metrics['hits'] += 1
+                return dict(entry, source='cache')
+
+            previous = self._read_entry(key)
+            extract_folder = str(self.download_folder / extract_name) if extract_name else None
+            if previous and self._blob_path(previous['sha256']).exists():
+                # 압축 해제 폴더만 지워진 경우 보관된 blob에서 다시 풀기
+                sha256, zip_size, source = previous['sha256'], previous['zip_size'], 'blob'
+                started = time.perf_counter()
+                with open(self._blob_path(sha256), 'rb') as blob:
+                    members = self._extract_to(blob, extract_folder, extract)
+                io_stats = {'extract_seconds': round(time.perf_counter() - started, 4),
+                            'disk_bytes_read': zip_size}
+            else:
+                sha256, zip_size, members, io_stats = self._download_and_extract(download, extract_folder, extract)
+                source = 'download'
+
+            entry = {
+                'key': key,
+                'endpoint': endpoint,
+                'params': {k: str(v) for k, v in params.items() if k not in _IGNORED_PARAMS},
+                'sha256': sha256,
+                'zip_size': zip_size,
+                'extract_folder': extract_folder,
+                'files': [member['path'] for member in members if 'path' in member],
+                'members': members,
+                'io': io_stats,
+                'completed_at': datetime.now().isoformat(),
+            }
+            if extract_folder is None and previous and previous.get('extract_folder') \
+                    and os.path.isdir(previous['extract_folder']):
+                # ZIP만 다시 받은 경우 이전에 풀어 둔 폴더 정보는 유지
+                entry['extract_folder'] = previous['extract_folder']
+                entry['files'] = previous.get('files', [])
+            # 폴더 교체가 끝난 뒤에 기록하므로 항목이 곧 완료 표시
+            self._write_entry(key, entry)
+            with self._lock:
+                self.metrics['blob_hits' if source == 'blob' else 'downloads'] += 1
+                for name in ('download_seconds', 'extract_seconds', 'disk_bytes_read', 'disk_bytes_written',
+                             'bytes_extracted', 'spilled_to_disk', 'download_retries', 'resumed', 'restarted'):
+                    self.metrics[name] = self.metrics.get(name, 0) + io_stats.get(name, 0)
+            return dict(entry, source=source)
+        finally:
+            lock.release()
+
+    def _download_and_extract(self, download: Callable[[BinaryIO], Optional[Dict[str, Any]]],
+                              extract_folder: Optional[str],
+                              extract: Callable[[BinaryIO, Optional[str]], List[Dict[str, Any]]]
+                              ) -> Tuple[str, int, List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        응답을 SpooledTemporaryFile에 받으면서 해시를 계산하고, 같은 버퍼에서 바로 압축 해제합니다.
+        작은 ZIP은 메모리에서 끝나므로 ZIP을 디스크에 썼다가 다시 읽지 않으며, blob은 압축을 풀지 않는
+        요청(extract_folder가 None)일 때만 저장합니다.
+
+        Returns:
+            (sha256, 크기, 멤버 매니페스트, I/O 통계)
+        """
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+        with tempfile.SpooledTemporaryFile(max_size=self.spool_max_bytes, dir=self.tmp_dir) as spool:
+            writer = _HashingWriter(spool)
+            transfer = download(writer) or {}
+            downloaded = time.perf_counter()
+            spilled = bool(getattr(spool, '_rolled', False))
+
+            # 압축 해제(또는 CRC 확인)가 성공한 내용만 보관 (손상된 ZIP은 남기지 않음)
+            spool.seek(0)
+            members = self._extract_to(spool, extract_folder, extract)
+            extracted = time.perf_counter()
+
+            sha256 = writer.sha256.hexdigest()
+            blob_written = self._store_blob(spool, sha256) if extract_folder is None else 0
+
+        bytes_extracted = sum(member['size'] for member in members if 'path' in member)
+        io_stats = {
+            'spooled_in_memory': not spilled,
+            'spilled_to_disk': int(spilled),
+            'download_seconds': round(downloaded - started, 4),
+            'extract_seconds': round(extracted - downloaded, 4),
+            # 스풀이 디스크로 넘친 경우에만 ZIP을 임시 파일에 쓰고 다시 읽음
+            'disk_bytes_read': writer.size if spilled else 0,
+            'disk_bytes_written': bytes_extracted + (writer.size if spilled else 0) + blob_written,
+            'bytes_extracted': bytes_extracted,
+            'bytes_per_sec': transfer.get('bytes_per_sec', 0.0),
+            'download_retries': transfer.get('retries', 0),
+            'resumed': transfer.get('resumed', 0),
+            'restarted': transfer.get('restarted', 0),
+        }
+        return sha256, writer.size, members, io_stats
+
+    def _store_blob(self, spool: BinaryIO, sha256: str) -> int:
+        """스풀 내용을 해시 이름의 blob으로 저장. 이미 같은 내용이 있으면 0 반환"""
+        blob_path = self._blob_path(sha256)
+        try:
+            self._touch(blob_path, blob_path.stat().st_mtime)
+            return 0
+        except OSError:
+            pass
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.tmp_dir / f"{uuid.uuid4().hex}.part"
+        try:
+            spool.seek(0)
+            with open(tmp_path, 'wb') as f:
+                shutil.copyfileobj(spool, f, 1024 * 1024)
+                written = f.tell()
+            os.replace(tmp_path, blob_path)
+            return written
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def _extract_to(self, source: BinaryIO, extract_folder: Optional[str],
+                    extract: Callable[[BinaryIO, Optional[str]], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        임시 폴더에 압축 해제 후 rename으로 교체. 매니페스트 경로를 최종 폴더 기준으로 반환
+        (extract_folder가 None이면 ZIP 유효성만 확인하고 멤버 목록 반환)
+        """
+        if extract_folder is None:
+            return extract(source, None)
+        if os.path.isdir(extract_folder):
+            # 이미 같은 멤버가 모두 풀려 있으면 다시 쓰지 않음 (캐시 항목만 잃은 경우 등)
+            members = extract(source, None)
+            if self._folder_matches(extract_folder, members):
+                for member in members:
+                    member['path'] = os.path.join(extract_folder, member['name'])
+                return members
+            source.seek(0)
+
+        staging = f"{extract_folder}.partial-{uuid.uuid4().hex[:8]}"
+        try:
+            members = extract(source, staging)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        # 이전 버전이 남긴(완료 여부를 알 수 없는) 폴더는 다른 쪽이 읽고 있을 수 있으므로
+        # 지우지 않고 stale로 옮긴 뒤 교체
+        if os.path.isdir(extract_folder):
+            self.stale_dir.mkdir(parents=True, exist_ok=True)
+            stale = self.stale_dir / f"{os.path.basename(extract_folder)}-{uuid.uuid4().hex[:8]}"
+            os.rename(extract_folder, stale)
+            os.utime(stale)
+        os.rename(staging, extract_folder)
+        for member in members:
+            member['path'] = os.path.join(extract_folder, os.path.relpath(member['path'], staging))
+        return members
+
+    def _maybe_sweep(self, added_bytes: int):
+        """blob 총량이 상한을 넘었거나 정리 간격이 지났으면 백그라운드에서 정리"""
+        with self._lock:
+            if self._stored_bytes is not None:
+                self._stored_bytes += added_bytes
+            over = self.max_bytes is not None and (self._stored_bytes or 0) > self.max_bytes
+            due = time.time() - self._last_sweep >= _SWEEP_INTERVAL
+            if self._sweeping or not (over or due):
+                return
+            self._sweeping = True
+        threading.Thread(target=self._sweep_background, name="dart-cache-sweep", daemon=True).start()
+
+    def _sweep_background(self):
+        try:
+            self.sweep()
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self._sweeping = False
+
+    def sweep(self) -> Dict[str, Any]:
+        """
+        오래 쓰지 않은 blob부터 삭제해 총량을 max_bytes 이하로 맞추고, max_age_days 동안 쓰지 않은
+        blob과 가리키는 대상이 모두 사라진 캐시 항목, 남은 임시 파일을 정리합니다.
+        (압축 해제 폴더는 사용자 파일이므로 지우지 않음)
+
+        Returns:
+            blobs_removed, bytes_freed, bytes_kept, entries_removed, locks_removed (다른 프로세스가 정리 중이면 skipped)
+        """
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        sweep_lock = FileLock(self.lock_dir / "sweep.lock")
+        if not sweep_lock.acquire(blocking=False):
+            return {'skipped': True}
+        try:
+            now = time.time()
+            blobs = []
+            for blob_path in self.blob_dir.glob("*/*.zip"):
+                try:
+                    stat = blob_path.stat()
+                except OSError:
+                    continue
+                blobs.append((stat.st_mtime, stat.st_size, blob_path))
+            blobs.sort()
+
+            total = sum(size for _, size, _ in blobs)
+            cutoff = now - self.max_age_days * 86400 if self.max_age_days is not None else None
+            removed = freed = 0
+            for mtime, size, blob_path in blobs:
+                expired = cutoff is not None and mtime < cutoff
+                if not expired and (self.max_bytes is None or total <= self.max_bytes):
+                    break
+                try:
+                    # 열려 있는 blob도 POSIX에서는 읽던 쪽이 끝까지 읽을 수 있음
+                    blob_path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+                freed += size
+
+            entries_removed = 0
+            for entry_path in self.entry_dir.glob("*.json"):
+                entry = self._read_entry(entry_path.stem)
+                if entry is None:
+                    continue
+                folder = entry.get('extract_folder')
+                if self._blob_path(entry['sha256']).exists() or (folder and os.path.isdir(folder)):
+                    continue
+                try:
+                    entry_path.unlink()
+                    entries_removed += 1
+                except OSError:
+                    pass
+
+            # 아무도 잡고 있지 않은 오래된 키별 잠금 파일 (잡은 채로 지우면 기다리던 쪽은 새 파일로 다시 잡음)
+            locks_removed = 0
+            for path in self.lock_dir.glob("*.lock"):
+                if path.name == "sweep.lock":
+                    continue
+                try:
+                    if now - path.stat().st_mtime < _LOCK_GRACE:
+                        continue
+                except OSError:
+                    continue
+                lock = FileLock(path)
+                if not lock.acquire(blocking=False):
+                    continue
+                try:
+                    try:
+                        path.unlink()
+                    except PermissionError:
+                        # Windows는 열린 파일을 지울 수 없으므로 놓은 뒤 지움 (그 사이 누가 열었으면 실패하고 남음)
+                        lock.release()
+                        path.unlink()
+                    locks_removed += 1
+                except OSError:
+                    pass
+                finally:
+                    lock.release()
+
+            # 이전 버전이 남긴 키별 잠금 파일과 중단된 다운로드의 임시 파일
+            stale = [*self.entry_dir.glob("*.lock"), *self.entry_dir.glob("*.tmp")]
+            stale += [path for path in self.tmp_dir.glob("*") if path.is_file()]
+            for path in stale:
+                try:
+                    if now - path.stat().st_mtime >= 86400:
+                        path.unlink()
+                except OSError:
+                    pass
+            # 교체되어 옮겨 둔 압축 해제 폴더
+            for path in self.stale_dir.glob("*"):
+                try:
+                    if now - path.stat().st_mtime >= _STALE_GRACE:
+                        shutil.rmtree(path)
+                except OSError:
+                    pass
+
+            with self._lock:
+                self._last_sweep = now
+                self._stored_bytes = total
+                self.metrics['sweeps'] += 1
+                self.metrics['evicted_blobs'] += removed
+                self.metrics['evicted_bytes'] += freed
+            return {'blobs_removed': removed, 'bytes_freed': freed, 'bytes_kept': total,
+                    'entries_removed': entries_removed, 'locks_removed': locks_removed}
+        finally:
+            sweep_lock.release()
+
+    @staticmethod
+    def _folder_matches(folder: str, members: List[Dict[str, Any]]) -> bool:
+        """폴더에 모든 멤버가 같은 크기로 풀려 있는지 확인"""
+        for member in members:
+            try:
+                if os.path.getsize(os.path.join(folder, member['name'])) != member['size']:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.metrics, in_flight=len(self._inflight))
+
+
+# download_folder별 캐시 (같은 폴더는 같은 인스턴스를 공유해야 single-flight가 동작)
+_caches: Dict[str, DownloadCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_download_cache(download_folder: str = "./downloads") -> DownloadCache:
+    """다운로드 폴더의 공유 캐시를 반환 (없으면 생성)"""
+    path = os.path.abspath(download_folder)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = DownloadCache(download_folder)
+        return cache
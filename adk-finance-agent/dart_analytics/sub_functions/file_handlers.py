@@ -5,10 +5,18 @@ ZIP, XML, JSON 등 다양한 파일 형식의 다운로드 및 처리를 담당
 """
 
 import os
+import re
 import requests
+import shutil
+import tempfile
 import zipfile
+import zlib
 from pathlib import Path
-from ..config import config
+from typing import Any, BinaryIO, Dict, List, Optional, Union
+from .dart_client import get_dart_client
+from .download_cache import SPOOL_MAX_BYTES, get_download_cache
+from .filing_archive import ExtractedFolder, FilingArchive
+from .rate_limiter import RateLimitError
 
 
 def download_and_extract_file(endpoint: str, params: dict, download_folder: str, file_prefix: str) -> str:
@@ -28,90 +36,82 @@ def download_and_extract_file(endpoint: str, params: dict, download_folder: str,
         # 다운로드 폴더 생성
         Path(download_folder).mkdir(parents=True, exist_ok=True)
         
-        # API 호출
-        api_url = f"https://opendart.fss.or.kr/api/{endpoint}"
-        full_params = {'crtfc_key': config.DART_API_KEY, **params}
+        # 첫 응답의 상태와 Content-Type 기록 (이어 받기 응답에는 Content-Type이 없을 수 있음)
+        first_response = {}
         
-        response = requests.get(api_url, params=full_params, timeout=60, stream=True)
+        def remember_response(response):
+            first_response['status'] = response.status_code
+            first_response['content_type'] = response.headers.get('content-type', '').lower()
+            if response.status_code != 200:
+                raise _StopDownload()
         
-        if response.status_code != 200:
-            return f"❌ 다운로드 실패: HTTP {response.status_code}"
-        
-        # Content-Type 확인 및 처리
-        content_type = response.headers.get('content-type', '').lower()
-        
-        if 'application/zip' in content_type or 'application/octet-stream' in content_type:
-            return _handle_zip_response(response, download_folder, file_prefix)
-        elif 'application/xml' in content_type or 'text/xml' in content_type:
-            return _handle_xml_response(response, download_folder, file_prefix)
-        elif 'application/json' in content_type:
-            return _handle_json_response(response, download_folder, file_prefix)
-        else:
-            # 오류 응답 파싱 시도
+        # API 호출 (공유 커넥션 풀 사용, 끊기면 받은 지점부터 이어 받기)
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, dir=download_folder) as spool:
             try:
-                xml_content = response.text
-                if 'status' in xml_content and '000' not in xml_content:
-                    return f"❌ DART API 오류: {xml_content}"
-            except:
-                pass
-            return f"❌ 예상치 못한 응답 형식: {content_type}"
+                get_dart_client().download(endpoint, params, spool, check_response=remember_response)
+            except _StopDownload:
+                return f"❌ 다운로드 실패: HTTP {first_response['status']}"
+            spool.seek(0)
+            
+            # Content-Type 확인 및 처리
+            content_type = first_response.get('content_type', '')
+            
+            if 'application/zip' in content_type or 'application/octet-stream' in content_type:
+                return _handle_zip_response(spool, download_folder, file_prefix)
+            elif 'application/xml' in content_type or 'text/xml' in content_type:
+                return _handle_xml_response(spool, download_folder, file_prefix)
+            elif 'application/json' in content_type:
+                return _handle_json_response(spool, download_folder, file_prefix)
+            else:
+                # 오류 응답 파싱 시도
+                try:
+                    xml_content = spool.read().decode('utf-8')
+                    if 'status' in xml_content and '000' not in xml_content:
+                        return f"❌ DART API 오류: {xml_content}"
+                except:
+                    pass
+                return f"❌ 예상치 못한 응답 형식: {content_type}"
         
     except requests.exceptions.Timeout:
-        return "❌ 다운로드 시간 초과 (60초)"
+        return f"❌ 다운로드 시간 초과 ({endpoint})"
     except requests.exceptions.RequestException as e:
         return f"❌ 네트워크 오류: {str(e)}"
     except Exception as e:
         return f"❌ 처리 중 오류: {str(e)}"
 
 
-def _handle_zip_response(response, download_folder: str, file_prefix: str) -> str:
-    """ZIP 파일 응답 처리"""
+class _StopDownload(Exception):
+    """download_and_extract_file에서 200이 아닌 첫 응답을 받으면 본문을 받지 않고 중단"""
+
+
+def _handle_zip_response(body: BinaryIO, download_folder: str, file_prefix: str) -> str:
+    """ZIP 파일 응답 처리 (스풀 버퍼에서 바로 압축 해제, ZIP 파일을 디스크에 남기지 않음)"""
     try:
-        # ZIP 파일로 저장
-        zip_file_path = os.path.join(download_folder, f"{file_prefix}.zip")
-        with open(zip_file_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-        
         # 파일 크기 확인
-        file_size = os.path.getsize(zip_file_path)
-        if file_size == 0:
-            os.remove(zip_file_path)
+        body.seek(0, os.SEEK_END)
+        if body.tell() == 0:
             return f"❌ 다운로드된 파일이 비어있습니다"
         
-        # 압축 해제
+        # 압축 해제 (멤버마다 CRC 검증)
+        body.seek(0)
         extract_folder = os.path.join(download_folder, f"extracted_{file_prefix}")
-        Path(extract_folder).mkdir(parents=True, exist_ok=True)
+        manifest = _extract_zip(body, extract_folder)
         
-        with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_folder)
+        return f"✅ ZIP 파일 처리 완료: {len(manifest)}개 파일 추출"
         
-        # 압축 해제된 파일 목록 확인
-        extracted_files = []
-        for root, dirs, files in os.walk(extract_folder):
-            for file in files:
-                extracted_files.append(os.path.join(root, file))
-        
-        os.remove(zip_file_path)  # 원본 ZIP 파일 삭제
-        
-        return f"✅ ZIP 파일 처리 완료: {len(extracted_files)}개 파일 추출"
-        
-    except zipfile.BadZipFile:
+    except DartDownloadError:
         return "❌ 손상된 ZIP 파일"
     except Exception as e:
         return f"❌ ZIP 처리 중 오류: {str(e)}"
 
 
-def _handle_xml_response(response, download_folder: str, file_prefix: str) -> str:
+def _handle_xml_response(body: BinaryIO, download_folder: str, file_prefix: str) -> str:
     """XML 파일 응답 처리"""
     try:
         # XML 파일로 저장
         xml_file_path = os.path.join(download_folder, f"{file_prefix}.xml")
         with open(xml_file_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
+            shutil.copyfileobj(body, f, 65536)
         
         file_size = os.path.getsize(xml_file_path)
         return f"✅ XML 파일 저장 완료: {file_size/1024:.1f} KB"
@@ -120,15 +120,13 @@ def _handle_xml_response(response, download_folder: str, file_prefix: str) -> st
         return f"❌ XML 처리 중 오류: {str(e)}"
 
 
-def _handle_json_response(response, download_folder: str, file_prefix: str) -> str:
+def _handle_json_response(body: BinaryIO, download_folder: str, file_prefix: str) -> str:
     """JSON 파일 응답 처리"""
     try:
         # JSON 파일로 저장
         json_file_path = os.path.join(download_folder, f"{file_prefix}.json")
         with open(json_file_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
+            shutil.copyfileobj(body, f, 65536)
         
         file_size = os.path.getsize(json_file_path)
         return f"✅ JSON 파일 저장 완료: {file_size/1024:.1f} KB"
@@ -155,87 +153,271 @@ def download_corp_codes(download_folder: str = "./downloads") -> str:
     )
 
 
-def download_document_zip(rcept_no: str, download_folder: str = "./downloads") -> str:
+class DartDownloadError(Exception):
     """
-    DART API를 통해 공시서류 원본파일(ZIP)을 다운로드하고 압축을 해제합니다.
+    공시서류 다운로드 실패
+    
+    Attributes:
+        retryable: 잠시 후 재시도하면 성공할 수 있는 오류인지 여부 (네트워크, 5xx, 요청 제한)
+        status: DART 응답 status 코드 (있는 경우)
+    """
+    
+    def __init__(self, message: str, retryable: bool = False, status: Optional[str] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.status = status
+
+
+# 재시도 가능한 DART status: 020 요청 제한 초과, 800 시스템 점검
+_RETRYABLE_DART_STATUS = {'020', '800'}
+
+
+def _dart_error_status(xml_content: str) -> Optional[str]:
+    """DART XML 오류 응답에서 status 코드 추출"""
+    match = re.search(r'<status>\s*(\d+)\s*</status>', xml_content)
+    return match.group(1) if match else None
+
+
+def _check_dart_response(response: requests.Response) -> None:
+    """
+    첫 응답의 HTTP 상태와 DART XML 오류를 검사합니다.
+    
+    Raises:
+        DartDownloadError: HTTP/DART 오류
+    """
+    if response.status_code != 200:
+        retryable = response.status_code == 429 or response.status_code >= 500
+        raise DartDownloadError(f"API 호출 실패: HTTP {response.status_code}", retryable=retryable)
+    
+    # Content-Type 확인
+    content_type = response.headers.get('content-type', '')
+    
+    # XML 오류 응답 체크
+    if 'xml' in content_type:
+        xml_content = response.text
+        if 'status' in xml_content and '000' not in xml_content:
+            status = _dart_error_status(xml_content)
+            if status == '020':
+                get_dart_client().report_throttled()
+            raise DartDownloadError(f"DART API 오류: {xml_content}",
+                                    retryable=status in _RETRYABLE_DART_STATUS, status=status)
+
+
+def _download_payload(endpoint: str, params: Dict[str, Any], target: BinaryIO) -> Dict[str, Any]:
+    """
+    DART API 응답 본문(ZIP)을 target에 기록합니다.
+    
+    전송이 중간에 끊기면 DartClient.download()가 받은 지점부터 이어 받고,
+    Content-Length와 받은 크기가 다르면 불완전한 다운로드로 보고 다시 받습니다.
     
-    Args:
-        rcept_no: 접수번호 (14자리)
-        download_folder: 다운로드할 폴더 경로 (기본값: ./downloads)
-        
     Returns:
-        압축 해제된 폴더 경로 또는 오류 메시지
+        전송 통계 (bytes, seconds, bytes_per_sec, retries, resumed, restarted)
+    
+    Raises:
+        DartDownloadError: HTTP/DART 오류, 네트워크 오류, 빈 응답, 요청 한도 소진
     """
     try:
-        # 다운로드 폴더 생성
-        Path(download_folder).mkdir(parents=True, exist_ok=True)
-        
-        # DART API 호출
-        url = "https://opendart.fss.or.kr/api/document.xml"
-        params = {
-            'crtfc_key': config.DART_API_KEY,
-            'rcept_no': rcept_no
-        }
-        
-        response = requests.get(url, params=params, stream=True)
+        # DART API 호출 (공유 커넥션 풀 사용)
+        transfer = get_dart_client().download(endpoint, params, target, check_response=_check_dart_response)
+    except requests.exceptions.RequestException as e:
+        raise DartDownloadError(f"네트워크 오류: {str(e)}", retryable=True) from e
+    except RateLimitError as e:
+        # 일일 한도 소진은 DART 020과 같게 취급하되, 오늘 안에는 재시도해도 소용없음
+        raise DartDownloadError(str(e), retryable=not e.quota_exhausted,
+                                status='020' if e.quota_exhausted else None) from e
+    
+    if transfer['bytes'] == 0:
+        raise DartDownloadError(f"다운로드된 파일이 비어있습니다. 요청 파라미터를 확인해주세요: {params}")
+    return transfer
+
+
+def _extract_zip(source: BinaryIO, extract_folder: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    ZIP 파일 객체에서 멤버를 하나씩 스트리밍으로 압축 해제하고 매니페스트를 기록합니다.
+    
+    Args:
+        source: 읽기/탐색 가능한 ZIP 파일 객체 (스풀 버퍼 또는 열린 파일)
+        extract_folder: 압축 해제 폴더. None이면 압축을 풀지 않고 멤버 목록만 확인
         
-        if response.status_code != 200:
-            return f"❌ API 호출 실패: HTTP {response.status_code}"
+    Returns:
+        멤버별 {name, path, size, compressed_size} 목록 (기록된 순서, 압축을 풀지 않으면 path 없음)
         
-        # Content-Type 확인
-        content_type = response.headers.get('content-type', '')
+    Raises:
+        DartDownloadError: 유효하지 않은 ZIP 파일
+    """
+    if extract_folder is not None:
+        Path(extract_folder).mkdir(parents=True, exist_ok=True)
+    manifest = []
+    try:
+        with zipfile.ZipFile(source, 'r') as zip_ref:
+            for info in zip_ref.infolist():
+                if info.is_dir():
+                    continue
+                if extract_folder is None:
+                    manifest.append({
+                        'name': info.filename,
+                        'size': info.file_size,
+                        'compressed_size': info.compress_size,
+                    })
+                    continue
+                try:
+                    path = zip_ref.extract(info, extract_folder)
+                except UnicodeDecodeError:
+                    # 파일명 인코딩 문제가 있으면 안전한 이름으로 추출
+                    path = os.path.join(extract_folder, f"file_{len(manifest)}.dat")
+                    with zip_ref.open(info) as member, open(path, 'wb') as target:
+                        shutil.copyfileobj(member, target, 1024 * 1024)
+                manifest.append({
+                    'name': info.filename,
+                    'path': path,
+                    'size': info.file_size,
+                    'compressed_size': info.compress_size,
+                })
+            if extract_folder is None:
+                # 압축을 풀지 않는 경우에도 캐시에 넣기 전에 모든 멤버의 CRC를 검증
+                # (압축 해제 경로는 extract()가 멤버마다 CRC를 확인)
+                bad_member = zip_ref.testzip()
+                if bad_member is not None:
+                    raise zipfile.BadZipFile(f"CRC 불일치: {bad_member}")
+    except (zipfile.BadZipFile, zlib.error, EOFError) as e:
+        # 전송 중 잘리거나 손상된 파일일 수 있으므로 재시도 가능
+        raise DartDownloadError(f"유효하지 않은 ZIP 파일입니다: {e}", retryable=True) from e
+    
+    return manifest
+
+
+def fetch_zip(endpoint: str, params: Dict[str, Any], download_folder: str,
+              extract_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    ZIP을 반환하는 DART API를 호출하여 download_folder/extract_name에 압축 해제합니다.
+    extract_name이 None이면 압축을 풀지 않고 ZIP만 캐시에 보관합니다 (FilingArchive로 읽기).
+    
+    다운로드 캐시를 거치므로 같은 (엔드포인트, 파라미터)는 한 번만 다운로드되고,
+    동시에 들어온 같은 요청은 진행 중인 다운로드 하나를 함께 기다립니다.
+    
+    Args:
+        endpoint: API 엔드포인트 (예: 'document.xml', 'fnlttXbrl.xml')
+        params: API 파라미터 딕셔너리
+        download_folder: 다운로드할 폴더 경로
+        extract_name: 압축 해제 폴더 이름 (None이면 압축 해제 안 함)
         
-        # XML 오류 응답 체크
-        if 'xml' in content_type:
-            xml_content = response.text
-            if 'status' in xml_content and '000' not in xml_content:
-                return f"❌ DART API 오류: {xml_content}"
+    Returns:
+        extract_folder, files(추출된 파일 경로 목록), members(매니페스트), zip_size(바이트),
+        sha256, io(다운로드/압축 해제 시간과 디스크 I/O), source
         
-        # ZIP 파일 저장
-        zip_filename = f"dart_document_{rcept_no}.zip"
-        zip_filepath = os.path.join(download_folder, zip_filename)
+    Raises:
+        DartDownloadError: 다운로드 또는 압축 해제 실패
+    """
+    return get_download_cache(download_folder).fetch(
+        endpoint, params, extract_name,
+        download=lambda target: _download_payload(endpoint, params, target),
+        extract=_extract_zip,
+    )
+
+
+def fetch_document_zip(rcept_no: str, download_folder: str = "./downloads") -> Dict[str, Any]:
+    """
+    공시서류 원본파일(ZIP)을 다운로드하여 extracted_{rcept_no} 폴더에 압축 해제합니다.
+    
+    Args:
+        rcept_no: 접수번호 (14자리)
+        download_folder: 다운로드할 폴더 경로
         
-        with open(zip_filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
+    Returns:
+        extract_folder, files(추출된 파일 경로 목록), zip_size(바이트), sha256, source
         
-        # 파일 크기 확인
-        file_size = os.path.getsize(zip_filepath)
-        if file_size == 0:
-            os.remove(zip_filepath)
-            return f"❌ 다운로드된 파일이 비어있습니다. 접수번호를 확인해주세요: {rcept_no}"
+    Raises:
+        DartDownloadError: 다운로드 또는 압축 해제 실패
+    """
+    return fetch_zip('document.xml', {'rcept_no': rcept_no}, download_folder, extract_name=f"extracted_{rcept_no}")
+
+
+def fetch_document_archive(rcept_no: str, download_folder: str = "./downloads") -> FilingArchive:
+    """
+    공시서류 ZIP을 (필요하면 다운로드하여) 압축 해제 없이 FilingArchive로 엽니다.
+    
+    Args:
+        rcept_no: 접수번호 (14자리)
+        download_folder: 다운로드할 폴더 경로
         
-        # 압축 해제 폴더 생성
-        extract_folder = os.path.join(download_folder, f"extracted_{rcept_no}")
-        Path(extract_folder).mkdir(parents=True, exist_ok=True)
+    Returns:
+        FilingArchive (사용 후 close)
         
-        # ZIP 파일 압축 해제 (여러 방법 시도)
-        extracted_count = 0
-        try:
-            with zipfile.ZipFile(zip_filepath, 'r') as zip_ref:
-                zip_ref.extractall(extract_folder)
-        except UnicodeDecodeError:
-            # 인코딩 문제 발생 시 개별 파일별로 추출 시도
-            with zipfile.ZipFile(zip_filepath, 'r') as zip_ref:
-                for member in zip_ref.namelist():
-                    try:
-                        zip_ref.extract(member, extract_folder)
-                        extracted_count += 1
-                    except UnicodeDecodeError:
-                        # 파일명을 안전한 형태로 변경하여 추출
-                        safe_name = f"file_{extracted_count}.dat"
-                        with zip_ref.open(member) as source:
-                            safe_path = os.path.join(extract_folder, safe_name)
-                            with open(safe_path, 'wb') as target:
-                                target.write(source.read())
-                        extracted_count += 1
+    Raises:
+        DartDownloadError: 다운로드 실패 또는 유효하지 않은 ZIP 파일
+    """
+    entry = fetch_zip('document.xml', {'rcept_no': rcept_no}, download_folder)
+    return _open_archive(get_download_cache(download_folder), entry, rcept_no)
+
+
+def open_document_archive(rcept_no: str, download_folder: str = "./downloads") -> Optional[FilingArchive]:
+    """
+    이미 받아 둔 공시서류 ZIP을 FilingArchive로 엽니다 (다운로드하지 않음).
+    
+    Returns:
+        FilingArchive 또는 캐시에 없으면 None
+    """
+    cache = get_download_cache(download_folder)
+    entry = cache.lookup('document.xml', {'rcept_no': rcept_no})
+    if entry is None:
+        return None
+    return _open_archive(cache, entry, rcept_no)
+
+
+def open_document_files(rcept_no: str, download_folder: str = "./downloads") -> Optional[Union[FilingArchive, ExtractedFolder]]:
+    """
+    공시서류 파일 묶음을 엽니다. 캐시된 ZIP을 우선 사용하고, 없으면 이전에 압축 해제된 폴더를 사용합니다.
+    
+    Returns:
+        FilingArchive 또는 ExtractedFolder (사용 후 close), 둘 다 없으면 None
+    """
+    archive = open_document_archive(rcept_no, download_folder)
+    if archive is not None:
+        return archive
+    extract_folder = legacy_extract_folder(rcept_no, download_folder)
+    if extract_folder is not None:
+        return ExtractedFolder(extract_folder, label=rcept_no)
+    return None
+
+
+def legacy_extract_folder(rcept_no: str, download_folder: str = "./downloads") -> Optional[str]:
+    """download_document_zip이나 이전 버전이 압축 해제해 둔 extracted_{rcept_no} 폴더 (비어 있지 않은 경우만)"""
+    extract_folder = os.path.join(download_folder, f"extracted_{rcept_no}")
+    try:
+        with os.scandir(extract_folder) as entries:
+            return extract_folder if any(True for _ in entries) else None
+    except OSError:
+        return None
+
+
+def _open_archive(cache, entry: Dict[str, Any], rcept_no: str) -> FilingArchive:
+    try:
+        return FilingArchive(str(cache.blob_path(entry)), label=rcept_no)
+    except zipfile.BadZipFile as e:
+        raise DartDownloadError(f"유효하지 않은 ZIP 파일입니다: {rcept_no}", retryable=True) from e
+
+
+def is_document_cached(rcept_no: str, download_folder: str = "./downloads") -> bool:
+    """공시서류 ZIP이 다운로드 캐시에 완전한 상태로 있는지 확인"""
+    return get_download_cache(download_folder).lookup('document.xml', {'rcept_no': rcept_no}) is not None
+
+
+def download_document_zip(rcept_no: str, download_folder: str = "./downloads") -> str:
+    """
+    DART API를 통해 공시서류 원본파일(ZIP)을 다운로드하고 압축을 해제합니다.
+    
+    Args:
+        rcept_no: 접수번호 (14자리)
+        download_folder: 다운로드할 폴더 경로 (기본값: ./downloads)
         
-        # 압축 해제된 파일 목록 확인
-        extracted_files = []
-        for root, dirs, files in os.walk(extract_folder):
-            for file in files:
-                extracted_files.append(os.path.join(root, file))
+    Returns:
+        압축 해제된 폴더 경로 또는 오류 메시지
+    """
+    try:
+        downloaded = fetch_document_zip(rcept_no, download_folder)
+        extract_folder = downloaded['extract_folder']
+        extracted_files = downloaded['files']
+        file_size = downloaded['zip_size']
         
         result = []
         result.append(f"✅ ZIP 파일 다운로드 및 압축 해제 완료")
@@ -254,14 +436,9 @@ def download_document_zip(rcept_no: str, download_folder: str = "./downloads") -
             if len(extracted_files) > 5:
                 result.append(f"   ... 및 {len(extracted_files) - 5}개 추가 파일")
         
-        # 원본 ZIP 파일 삭제 (옵션)
-        os.remove(zip_filepath)
-        
         return "\n".join(result)
         
-    except zipfile.BadZipFile:
-        return f"❌ 유효하지 않은 ZIP 파일입니다: {rcept_no}"
-    except requests.exceptions.RequestException as e:
-        return f"❌ 네트워크 오류: {str(e)}"
+    except DartDownloadError as e:
+        return f"❌ {str(e)}"
     except Exception as e:
-        return f"❌ 다운로드 및 압축 해제 중 오류 발생: {str(e)}"
\ No newline at end of file
+        return f"❌ 다운로드 및 압축 해제 중 오류 발생: {str(e)}"
@@ -0,0 +1,169 @@
+"""
+공시서류 ZIP 가상 파일시스템 모듈
+
+공시서류 ZIP을 압축 해제하지 않고 그대로 둔 채 멤버 목록(이름, 크기, 압축 크기, 유형)을
+제공하고, 필요한 멤버만 zipfile로 열어 읽습니다. 대부분의 질문은 ZIP 안의 파일
+한두 개만 보므로 전체를 디스크에 풀 필요가 없습니다.
+
+이전 버전이 압축 해제해 둔 extracted_* 폴더는 같은 인터페이스의 ExtractedFolder로 읽습니다.
+"""
+
+import os
+import threading
+import zipfile
+from abc import ABC, abstractmethod
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional
+
+# 한글 공시서류에서 시도할 인코딩 순서
+TEXT_ENCODINGS = ('utf-8', 'cp949', 'euc-kr', 'latin1')
+
+
+class _FilingSource(ABC):
+    """공시서류 파일 묶음 공통 인터페이스 (_members, open, display_path는 하위 클래스에서 구현)"""
+
+    _members: List[Dict[str, Any]]
+
+    @property
+    def members(self) -> List[Dict[str, Any]]:
+        """멤버 목록 (name, path, size, compressed_size, type)"""
+        return list(self._members)
+
+    @property
+    def total_size(self) -> int:
+        return sum(member['size'] for member in self._members)
+
+    def find(self, filename: str, extensions: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        파일명(대소문자 무시) 또는 내부 경로로 멤버 찾기
+
+        Args:
+            filename: 찾을 파일명
+            extensions: 허용할 확장자 (예: ('.xml',)). None이면 제한 없음
+
+        Returns:
+            멤버 정보 또는 None
+        """
+        wanted = filename.lower()
+        for member in self._members:
+            if extensions is not None and member['type'] not in extensions:
+                continue
+            if member['name'].lower() == wanted or member['path'].lower() == wanted:
+                return member
+        return None
+
+    def filter(self, extensions: Iterable[str]) -> List[Dict[str, Any]]:
+        """확장자로 멤버 목록 필터링"""
+        extensions = tuple(extensions)
+        return [member for member in self._members if member['type'] in extensions]
+
+    @abstractmethod
+    def open(self, member: Dict[str, Any]) -> BinaryIO:
+        """멤버를 바이너리 스트림으로 열기"""
+
+    @abstractmethod
+    def display_path(self, member: Dict[str, Any]) -> str:
+        """사용자에게 보여줄 멤버 경로"""
+
+    def read_bytes(self, member: Dict[str, Any]) -> bytes:
+        with self.open(member) as f:
+            return f.read()
+
+    def read_text(self, member: Dict[str, Any], encodings: Iterable[str] = TEXT_ENCODINGS) -> Optional[str]:
+        """
+        멤버를 텍스트로 읽기 (인코딩을 차례로 시도)
+
+        Returns:
+            텍스트 또는 모든 인코딩이 실패하면 None
+        """
+        data = self.read_bytes(member)
+        for encoding in encodings:
+            try:
+                return data.decode(encoding)
+            except UnicodeDecodeError:
+                continue
+        return None
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class FilingArchive(_FilingSource):
+    """
+    ZIP 파일 위의 읽기 전용 가상 파일시스템
+    """
+
+    def __init__(self, zip_path: str, label: Optional[str] = None):
+        """
+        Args:
+            zip_path: ZIP 파일 경로
+            label: 표시용 이름 (예: 접수번호). 기본값은 ZIP 파일명
+
+        Raises:
+            zipfile.BadZipFile: 유효하지 않은 ZIP 파일
+        """
+        self.path = str(zip_path)
+        self.label = label or os.path.basename(self.path)
+        self._zip = zipfile.ZipFile(self.path, 'r')
+        self._lock = threading.Lock()
+        self._members = [self._member_info(info) for info in self._zip.infolist() if not info.is_dir()]
+
+    @staticmethod
+    def _member_info(info: zipfile.ZipInfo) -> Dict[str, Any]:
+        return {
+            'name': os.path.basename(info.filename),
+            'path': info.filename,
+            'size': info.file_size,
+            'compressed_size': info.compress_size,
+            'type': os.path.splitext(info.filename)[1].lower(),
+        }
+
+    def open(self, member: Dict[str, Any]) -> BinaryIO:
+        """멤버를 스트림으로 열기 (압축 해제는 읽는 만큼만 수행)"""
+        with self._lock:
+            return self._zip.open(member['path'], 'r')
+
+    def display_path(self, member: Dict[str, Any]) -> str:
+        """사용자에게 보여줄 멤버 경로 (ZIP 경로!내부 경로)"""
+        return f"{self.path}!{member['path']}"
+
+    def close(self):
+        self._zip.close()
+
+
+class ExtractedFolder(_FilingSource):
+    """
+    이미 압축 해제된 폴더를 FilingArchive와 같은 방식으로 읽기
+    """
+
+    def __init__(self, folder: str, label: Optional[str] = None):
+        """
+        Args:
+            folder: 압축 해제 폴더 경로
+            label: 표시용 이름 (예: 접수번호)
+        """
+        self.path = str(folder)
+        self.label = label or os.path.basename(self.path)
+        self._members = []
+        for root, dirs, files in os.walk(self.path):
+            for file in files:
+                file_path = os.path.join(root, file)
+                size = os.path.getsize(file_path)
+                self._members.append({
+                    'name': file,
+                    'path': os.path.relpath(file_path, self.path),
+                    'size': size,
+                    'compressed_size': size,
+                    'type': os.path.splitext(file)[1].lower(),
+                })
+
+    def open(self, member: Dict[str, Any]) -> BinaryIO:
+        return open(self.display_path(member), 'rb')
+
+    def display_path(self, member: Dict[str, Any]) -> str:
+        return os.path.join(self.path, member['path'])
@@ -0,0 +1,561 @@
+"""
+요청 속도 제한 모듈
+
+토큰 버킷 방식으로 초당 요청 수를 제한합니다. 버킷은 초당 rate개씩 채워지고
+최대 capacity개까지 쌓이므로, 잠시 쉬었다가 capacity만큼 몰아서 보내는
+버스트는 허용하되 장기 평균은 rate를 넘지 않습니다.
+
+외부 API(DART, ECOS, data.go.kr) 호출은 get_rate_limiter()가 돌려주는
+프로세스 공용 ProviderRateLimiter를 거칩니다.
+
+- 제공자 + API 키별로 하나의 토큰 버킷을 공유 (세션/도구가 달라도 같은 한도)
+- 기다리는 요청은 우선순위 큐에 줄을 서고 버리지 않음 (대화형 요청이 대량 다운로드보다 먼저)
+- 일일 요청 수는 디스크의 장부(QuotaLedger)에 기록하여 프로세스 간, 재시작 후에도 유지
+- 제공자의 요청 제한 응답(DART 020, data.go.kr LIMITED_NUMBER_OF_SERVICE_REQUESTS 등)을
+  받으면 잠시 멈추고 속도를 절반으로 낮춘 뒤, 성공할 때마다 조금씩 원래 속도로 회복
+"""
+
+import asyncio
+import atexit
+import contextlib
+import contextvars
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from .corpcode_shared import FileLock
+
+
+class TokenBucket:
+    """
+    스레드 안전 토큰 버킷
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: 초당 채워지는 토큰 수 (허용 평균 요청 수)
+            capacity: 최대 누적 토큰 수 (버스트 크기, 기본값: max(1, rate))
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.acquired = 0
+        self.waited_seconds = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def set_rate(self, rate: float):
+        """채움 속도 변경 (이미 쌓인 토큰은 유지)"""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """토큰을 얻기까지 남은 시간(초). 지금 얻을 수 있으면 0"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, (tokens - self._tokens) / self.rate)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """토큰이 있으면 즉시 사용하고 True, 없으면 기다리지 않고 False"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                self.acquired += 1
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        토큰을 얻을 때까지 대기합니다.
+
+        Args:
+            tokens: 필요한 토큰 수
+            timeout: 최대 대기 시간(초). None이면 무제한
+
+        Returns:
+            토큰을 얻었으면 True, timeout이 지나면 False
+        """
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.acquired += 1
+                    self.waited_seconds += now - started
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - now
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'rate': self.rate,
+                'capacity': self.capacity,
+                'available_tokens': round(self._tokens, 3),
+                'acquired': self.acquired,
+                'waited_seconds': round(self.waited_seconds, 3),
+            }
+
+
+# 요청 우선순위 (작을수록 먼저). 대화형 도구 호출이 대량 다운로드보다 먼저 처리됨
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 5
+PRIORITY_BULK = 10
+
+_request_priority: contextvars.ContextVar = contextvars.ContextVar('api_request_priority',
+                                                                  default=PRIORITY_NORMAL)
+
+# 제공자별 기본 한도: (초당 요청 수, 버스트, 일일 한도 또는 None)
+PROVIDER_LIMITS: Dict[str, Tuple[float, float, Optional[int]]] = {
+    'dart': (10.0, 10.0, 20000),        # 개인 인증키 일일 20,000건
+    'data_go_kr': (10.0, 10.0, 10000),  # 개발계정 기본 일일 10,000건
+    'ecos': (5.0, 5.0, None),
+}
+
+# 제공자별 요청 제한(스로틀) 응답 패턴
+THROTTLE_PATTERNS: Dict[str, re.Pattern] = {
+    'dart': re.compile(r'"status"\s*:\s*"020"|<status>\s*020\s*</status>'),
+    'data_go_kr': re.compile(r'LIMITED_NUMBER_OF_SERVICE_REQUESTS'),
+    'ecos': re.compile(r'ERROR-602'),
+}
+_HTTP_THROTTLE = re.compile(r'Too Many Requests')
+
+# 일일 한도는 한국 시간 자정에 초기화됨
+_KST = timezone(timedelta(hours=9))
+
+DEFAULT_LEDGER_PATH = Path(os.getenv(
+    'API_QUOTA_LEDGER_PATH',
+    Path(__file__).resolve().parent.parent / 'storage' / 'api_quota_ledger.json',
+))
+
+
+class RateLimitError(Exception):
+    """일일 한도 소진 또는 대기 시간 초과로 요청을 보낼 수 없음"""
+
+    def __init__(self, message: str, provider: str, quota_exhausted: bool = False):
+        super().__init__(message)
+        self.provider = provider
+        self.quota_exhausted = quota_exhausted
+
+
+@contextlib.contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """
+    with 블록 안의 API 요청 우선순위 지정 (스레드/태스크별)
+
+    Args:
+        priority: PRIORITY_INTERACTIVE, PRIORITY_NORMAL, PRIORITY_BULK 등 (작을수록 먼저)
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def current_priority() -> int:
+    return _request_priority.get()
+
+
+def is_throttle_response(provider: str, text: str) -> bool:
+    """응답 본문이 제공자의 요청 제한 응답인지 여부"""
+    pattern = THROTTLE_PATTERNS.get(provider)
+    return bool(text) and (bool(pattern and pattern.search(text)) or bool(_HTTP_THROTTLE.search(text)))
+
+
+class QuotaLedger:
+    """
+    디스크에 기록되는 일일 요청 수 장부
+
+    사용량은 메모리에 모았다가 flush_every건 또는 flush_interval초마다(그리고 종료 시) 한 번에
+    파일 잠금 안에서 읽고-더하고-쓰기를 하므로, 요청마다 파일을 다시 쓰지 않으면서도 여러
+    프로세스가 같은 장부를 공유할 수 있습니다. 한도까지 flush_every건 이내로 남으면 예약마다
+    장부와 동기화하여 프로세스가 여럿이어도 한도를 넘지 않습니다.
+    날짜(KST)가 바뀌면 모든 카운터가 0부터 다시 시작합니다.
+    """
+
+    def __init__(self, path: Path = DEFAULT_LEDGER_PATH, flush_every: int = 50, flush_interval: float = 5.0):
+        """
+        Args:
+            path: 장부 파일 경로
+            flush_every: 이 건수만큼 모이면 장부에 기록
+            flush_interval: 마지막 기록 후 이 시간(초)이 지나면 장부에 기록
+        """
+        self.path = Path(path)
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._date: Optional[str] = None
+        self._base: Dict[str, int] = {}     # 마지막 동기화 때 장부에 있던 사용량
+        self._pending: Dict[str, int] = {}  # 아직 장부에 기록하지 않은 사용량
+        self._pending_total = 0
+        self._flushed_at = time.monotonic()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now(_KST).date().isoformat()
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        if data.get('date') != self.today():
+            data = {'date': self.today(), 'counts': {}}
+        return data
+
+    def _write(self, data: Dict[str, Any]):
+        tmp_path = self.path.with_name(f"{self.path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def _roll_over(self):
+        """날짜가 바뀌었으면 메모리의 사용량을 비움 (호출자가 _lock 보유)"""
+        today = self.today()
+        if self._date != today:
+            if self._date is None:
+                self._sync()
+            else:
+                self._date = today
+                self._base, self._pending, self._pending_total = {}, {}, 0
+
+    def _sync(self):
+        """모아 둔 사용량을 장부에 더하고 다른 프로세스의 사용량을 다시 읽음 (호출자가 _lock 보유)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lock = FileLock(self.path.with_name(self.path.name + '.lock'))
+        lock.acquire()
+        try:
+            data = self._read()
+            if self._pending and data['date'] == self._date:
+                for key, count in self._pending.items():
+                    data['counts'][key] = data['counts'].get(key, 0) + count
+                self._write(data)
+            self._date = data['date']
+            self._base = dict(data['counts'])
+            self._pending, self._pending_total = {}, 0
+            self._flushed_at = time.monotonic()
+        finally:
+            lock.release()
+
+    def reserve(self, key: str, limit: Optional[int], count: int = 1) -> Optional[int]:
+        """
+        오늘 사용량에 count를 더합니다.
+
+        Args:
+            key: 장부 키 (제공자:API 키 해시)
+            limit: 일일 한도. None이면 기록만 하고 제한하지 않음
+            count: 예약할 요청 수
+
+        Returns:
+            예약 후 사용량. 한도를 넘으면 예약하지 않고 None
+        """
+        with self._lock:
+            self._roll_over()
+            used = self._base.get(key, 0) + self._pending.get(key, 0)
+            if limit is not None and used + count > limit - self.flush_every:
+                # 한도 근처: 다른 프로세스 사용량까지 반영한 값으로 판단하고 바로 기록
+                self._sync()
+                used = self._base.get(key, 0)
+                if used + count > limit:
+                    return None
+            self._pending[key] = self._pending.get(key, 0) + count
+            self._pending_total += count
+            if (limit is not None and used + count > limit - self.flush_every) \
+                    or self._pending_total >= self.flush_every \
+                    or time.monotonic() - self._flushed_at >= self.flush_interval:
+                self._sync()
+            return used + count
+
+    def flush(self):
+        """모아 둔 사용량을 장부에 기록"""
+        with self._lock:
+            if self._pending:
+                self._sync()
+
+    def used(self, key: str) -> int:
+        """오늘 사용량 (마지막 동기화 이후 다른 프로세스 사용량은 다음 동기화 때 반영)"""
+        with self._lock:
+            self._roll_over()
+            return self._base.get(key, 0) + self._pending.get(key, 0)
+
+
+class ProviderRateLimiter:
+    """
+    제공자 + API 키 하나에 대한 우선순위 큐, 토큰 버킷, 일일 한도, 적응형 백오프
+    """
+
+    def __init__(self, provider: str, api_key: Optional[str] = None, rate: float = 10.0,
+                 burst: Optional[float] = None, daily_quota: Optional[int] = None,
+                 ledger: Optional[QuotaLedger] = None, backoff_base: float = 1.0,
+                 backoff_max: float = 60.0, max_wait: Optional[float] = None):
+        """
+        Args:
+            provider: 제공자 이름 ('dart', 'ecos', 'data_go_kr')
+            api_key: API 키 (장부에는 해시만 기록)
+            rate: 초당 최대 요청 수
+            burst: 버스트 크기 (기본값: rate)
+            daily_quota: 일일 요청 한도. None이면 제한 없음
+            ledger: 일일 요청 장부 (기본값: 공용 장부)
+            backoff_base: 요청 제한 응답 후 첫 대기 시간(초), 연속될 때마다 2배
+            backoff_max: 최대 대기 시간(초)
+            max_wait: acquire()의 기본 최대 대기 시간(초). None이면 차례가 올 때까지 대기 (요청을 버리지 않음)
+        """
+        self.provider = provider
+        key_hash = hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:12]
+        self.ledger_key = f"{provider}:{key_hash}"
+        self.base_rate = float(rate)
+        self.min_rate = self.base_rate / 10
+        self.bucket = TokenBucket(rate, burst)
+        self.daily_quota = daily_quota
+        self.ledger = ledger if ledger is not None else get_quota_ledger()
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_wait = max_wait
+
+        self._cond = threading.Condition()
+        self._queue: list = []
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self._consecutive_throttles = 0
+
+        self.metrics = {'acquired': 0, 'waited_seconds': 0.0, 'max_queue': 0, 'timeouts': 0,
+                        'quota_rejected': 0, 'throttled': 0}
+
+    def acquire(self, priority: Optional[int] = None, timeout: Optional[float] = None) -> float:
+        """
+        우선순위 순서대로 차례가 오면 토큰과 일일 한도를 하나 사용합니다.
+
+        Args:
+            priority: 우선순위 (기본값: request_priority()로 지정한 값)
+            timeout: 최대 대기 시간(초) (기본값: max_wait)
+
+        Returns:
+            대기한 시간(초)
+
+        Raises:
+            RateLimitError: 일일 한도 소진 또는 대기 시간 초과
+        """
+        priority = current_priority() if priority is None else priority
+        timeout = self.max_wait if timeout is None else timeout
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        ticket = (priority, next(self._seq))
+
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+            self.metrics['max_queue'] = max(self.metrics['max_queue'], len(self._queue))
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None
+                    if self._queue[0] == ticket:
+                        # 줄 맨 앞: 백오프 중이 아니고 토큰이 있으면 통과
+                        wait = self._paused_until - now
+                        if wait <= 0:
+                            if self.bucket.try_acquire():
+                                break
+                            wait = self.bucket.wait_time()
+                    if deadline is not None:
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            self.metrics['timeouts'] += 1
+                            raise RateLimitError(
+                                f"{self.provider} 요청 대기 시간 초과 ({timeout:.0f}초)", self.provider)
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+
+            waited = time.monotonic() - started
+            self.metrics['acquired'] += 1
+            self.metrics['waited_seconds'] += waited
+
+        if self.ledger.reserve(self.ledger_key, self.daily_quota) is None:
+            with self._cond:
+                self.metrics['quota_rejected'] += 1
+            raise RateLimitError(f"{self.provider} 일일 요청 한도({self.daily_quota:,}건)를 모두 사용했습니다",
+                                 self.provider, quota_exhausted=True)
+        return waited
+
+    async def acquire_async(self, priority: Optional[int] = None, timeout: Optional[float] = None) -> float:
+        """acquire()를 스레드에서 실행하여 이벤트 루프를 막지 않음"""
+        priority = current_priority() if priority is None else priority
+        return await asyncio.to_thread(self.acquire, priority, timeout)
+
+    def report_throttled(self) -> float:
+        """
+        요청 제한 응답을 받았을 때 호출. 모든 대기 요청을 잠시 멈추고 속도를 절반으로 낮춥니다.
+
+        Returns:
+            멈추는 시간(초)
+        """
+        with self._cond:
+            self._consecutive_throttles += 1
+            delay = min(self.backoff_max, self.backoff_base * (2 ** (self._consecutive_throttles - 1)))
+            delay *= random.uniform(0.5, 1.5)
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self.bucket.set_rate(max(self.min_rate, self.bucket.rate / 2))
+            self.metrics['throttled'] += 1
+            self._cond.notify_all()
+            return delay
+
+    def report_success(self):
+        """정상 응답을 받았을 때 호출. 낮춘 속도를 조금씩 원래대로 회복합니다."""
+        with self._cond:
+            self._consecutive_throttles = 0
+            if self.bucket.rate < self.base_rate:
+                self.bucket.set_rate(min(self.base_rate, self.bucket.rate + self.base_rate * 0.05))
+
+    def report(self, text: str) -> bool:
+        """
+        응답 본문으로 스로틀 여부를 판단해 report_throttled/report_success 호출
+
+        Returns:
+            요청 제한 응답이었는지 여부
+        """
+        if is_throttle_response(self.provider, text):
+            self.report_throttled()
+            return True
+        self.report_success()
+        return False
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            metrics = dict(self.metrics, queued=len(self._queue),
+                           paused_seconds=round(max(0.0, self._paused_until - time.monotonic()), 3))
+        metrics['waited_seconds'] = round(metrics['waited_seconds'], 3)
+        metrics['current_rate'] = round(self.bucket.rate, 3)
+        metrics['base_rate'] = self.base_rate
+        used = self.ledger.used(self.ledger_key)
+        metrics['quota_used_today'] = used
+        metrics['quota_remaining_today'] = None if self.daily_quota is None else max(0, self.daily_quota - used)
+        return metrics
+
+
+_ledger: Optional[QuotaLedger] = None
+_limiters: Dict[Tuple[str, str], ProviderRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_quota_ledger() -> QuotaLedger:
+    """공용 일일 요청 장부"""
+    global _ledger
+    with _limiters_lock:
+        if _ledger is None:
+            _ledger = QuotaLedger()
+        return _ledger
+
+
+def get_rate_limiter(provider: str, api_key: Optional[str] = None) -> ProviderRateLimiter:
+    """
+    제공자 + API 키별 공용 속도 제한기를 반환 (없으면 PROVIDER_LIMITS로 생성)
+
+    Args:
+        provider: 'dart', 'ecos', 'data_go_kr'
+        api_key: API 키
+    """
+    key = (provider, api_key or '')
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+    if limiter is not None:
+        return limiter
+
+    rate, burst, daily_quota = PROVIDER_LIMITS[provider]
+    created = ProviderRateLimiter(provider, api_key, rate=rate, burst=burst, daily_quota=daily_quota,
+                                  ledger=get_quota_ledger())
+    with _limiters_lock:
+        return _limiters.setdefault(key, created)
+
+
+def set_rate_limiter(provider: str, api_key: Optional[str], limiter: Optional[ProviderRateLimiter]):
+    """속도 제한기 교체 (테스트/설정용). None이면 제거하여 다음 호출 때 기본값으로 다시 생성"""
+    with _limiters_lock:
+        if limiter is None:
+            _limiters.pop((provider, api_key or ''), None)
+        else:
+            _limiters[(provider, api_key or '')] = limiter
+
+
+def get_rate_limiter_metrics() -> Dict[str, Dict[str, Any]]:
+    """모든 속도 제한기의 지표 (제공자:키 해시별)"""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.ledger_key: limiter.get_metrics() for limiter in limiters}
+
+
+def openapi_tool_callbacks(provider: str, api_key: Optional[str] = None
+                           ) -> Tuple[Callable[..., Any], Callable[..., Any]]:
+    """
+    OpenAPIToolset 도구 호출에 속도 제한을 거는 ADK before/after_tool_callback 쌍
+
+    OpenAPIToolset이 만든 RestApiTool만 대상으로 하고, 함수 도구는 자체적으로 제한기를
+    거치므로 건너뜁니다. 한도를 넘으면 도구를 실행하지 않고 오류 응답을 돌려줍니다.
+
+    Args:
+        provider: 'dart', 'ecos', 'data_go_kr'
+        api_key: API 키
+
+    Returns:
+        (before_tool_callback, after_tool_callback)
+    """
+
+    def is_openapi_tool(tool) -> bool:
+        return type(tool).__name__ == 'RestApiTool'
+
+    async def before_tool_callback(tool, args, tool_context):
+        if not is_openapi_tool(tool):
+            return None
+        try:
+            await get_rate_limiter(provider, api_key).acquire_async(PRIORITY_INTERACTIVE)
+        except RateLimitError as e:
+            return {'error': f"❌ {e}"}
+        return None
+
+    def after_tool_callback(tool, args, tool_context, tool_response):
+        if not is_openapi_tool(tool):
+            return None
+        try:
+            text = tool_response if isinstance(tool_response, str) else json.dumps(tool_response, ensure_ascii=False)
+        except (TypeError, ValueError):
+            text = str(tool_response)
+        get_rate_limiter(provider, api_key).report(text)
+        return None
+
+    return before_tool_callback, after_tool_callback
@@ -5,26 +5,37 @@ DART Analytics 유틸리티 모듈
 """
 
 import os
-import requests
-import xml.etree.ElementTree as ET
+import shutil
+import tempfile
 import zipfile
 from pathlib import Path
+from typing import List
 from ..config import config
-from .corpcode_storage import get_corp_code_quick, quick_search, initialize_storage, get_storage
+from .dart_client import get_dart_client
+from .corpcode_storage import (
+    get_corp_code_quick, get_corp_codes_bulk, quick_search, fuzzy_search, autocomplete, initialize_storage, get_storage,
+    iter_corpcode_records, count_corpcode_records
+)
 
 # Initialize storage on module import
 _storage_initialized = False
 
 
-def _download_and_extract_corpcode():
-    """Download and extract CORPCODE.xml from DART API or use existing zip file"""
+def _download_and_extract_corpcode(target_dir: str = None, use_existing_zip: bool = True):
+    """
+    Download and extract CORPCODE.xml from DART API or use existing zip file
+    
+    Args:
+        target_dir: Directory receiving CORPCODE.zip/CORPCODE.xml (defaults to dart_analytics)
+        use_existing_zip: Extract an existing CORPCODE.zip in target_dir instead of downloading
+    """
     try:
-        dart_analytics_dir = os.path.dirname(os.path.dirname(__file__))
+        dart_analytics_dir = target_dir or os.path.dirname(os.path.dirname(__file__))
         xml_path = os.path.join(dart_analytics_dir, 'CORPCODE.xml')
         zip_path = os.path.join(dart_analytics_dir, 'CORPCODE.zip')
         
         # First try to use existing zip file if available
-        if os.path.exists(zip_path):
+        if use_existing_zip and os.path.exists(zip_path):
             print("📂 기존 CORPCODE.zip 파일을 발견했습니다. 압축 해제 중...")
             try:
                 with zipfile.ZipFile(zip_path, 'r') as zip_ref:
@@ -44,20 +55,30 @@ def _download_and_extract_corpcode():
             print("❌ DART API 키가 설정되지 않았습니다. config.py에서 DART_API_KEY를 확인해주세요.")
             return False
         
-        api_url = "https://opendart.fss.or.kr/api/corpCode.xml"
-        params = {'crtfc_key': config.DART_API_KEY}
-        
-        response = requests.get(api_url, params=params, timeout=60, stream=True)
+        def check_status(response):
+            if response.status_code != 200:
+                raise ValueError(f"HTTP {response.status_code}")
         
-        if response.status_code != 200:
-            print(f"❌ 다운로드 실패: HTTP {response.status_code}")
+        # Shared keep-alive connection pool; interrupted transfers resume where they stopped.
+        # Write to a .part file so a truncated download never replaces a good CORPCODE.zip
+        part_path = zip_path + '.part'
+        try:
+            with open(part_path, 'wb') as f:
+                get_dart_client().download('corpCode.xml', None, f, check_response=check_status)
+            
+            # Verify member CRCs before keeping the ZIP
+            with zipfile.ZipFile(part_path, 'r') as zip_ref:
+                bad_member = zip_ref.testzip()
+            if bad_member is not None:
+                print(f"❌ 손상된 ZIP 파일: {bad_member}")
+                return False
+            os.replace(part_path, zip_path)
+        except ValueError as e:
+            print(f"❌ 다운로드 실패: {e}")
             return False
-        
-        # Save as ZIP file
-        with open(zip_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
+        finally:
+            if os.path.exists(part_path):
+                os.remove(part_path)
         
         # Extract ZIP file
         print("📂 압축 해제 중...")
@@ -75,8 +96,13 @@ def _download_and_extract_corpcode():
         return False
 
 
-def _ensure_storage_initialized():
-    """Ensure storage is initialized before use"""
+def ensure_storage_initialized() -> bool:
+    """
+    Ensure storage is initialized before use (downloads CORPCODE.xml if needed)
+
+    Returns:
+        True if the storage is ready, False if only direct XML parsing is possible
+    """
     global _storage_initialized
     if not _storage_initialized:
         xml_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'CORPCODE.xml')
@@ -91,6 +117,7 @@ def _ensure_storage_initialized():
         else:
             initialize_storage(xml_path)
             _storage_initialized = True
+    return _storage_initialized
 
 
 def get_corp_code(corp_name: str) -> str:
@@ -101,27 +128,40 @@ def get_corp_code(corp_name: str) -> str:
     """
     try:
         # Ensure storage is initialized (will download if needed)
-        _ensure_storage_initialized()
+        if ensure_storage_initialized():
+            # Try new storage system first
+            corp_code = get_corp_code_quick(corp_name)
+            if corp_code:
+                return corp_code
         
+        return resolve_corp_code_fallback(corp_name)
+    except Exception as e:
+        return f"오류가 발생했습니다: {e}"
+
+
+def resolve_corp_code_fallback(corp_name: str) -> str:
+    """
+    정확한 이름 조회가 실패한 뒤의 단계만 수행합니다 (표기 변형, 부분 검색, 유사 이름 제안).
+    저장소를 초기화하지 못한 경우에는 CORPCODE.xml을 직접 읽습니다.
+    """
+    try:
         # Check if storage was successfully initialized
         if not _storage_initialized:
             # Try direct XML parsing as fallback
             xml_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'CORPCODE.xml')
             if os.path.exists(xml_path):
-                tree = ET.parse(xml_path)
-                root = tree.getroot()
-                for corp in root.findall('list'):
-                    corp_name_elem = corp.find('corp_name')
-                    if corp_name_elem is not None and corp_name_elem.text == corp_name:
-                        return corp.find('corp_code').text
+                for corp_code, name, _, _, _ in iter_corpcode_records(xml_path):
+                    if name == corp_name:
+                        return corp_code
                 return f"{corp_name}에 해당하는 고유번호를 찾을 수 없습니다."
             else:
                 return f"❌ CORPCODE.xml 파일을 다운로드할 수 없습니다. DART API 키를 확인해주세요."
         
-        # Try new storage system first
-        corp_code = get_corp_code_quick(corp_name)
-        if corp_code:
-            return corp_code
+        # Spelling variants such as "(주)삼성전자" or "삼성 전자" resolve to one company
+        fuzzy_results = fuzzy_search(corp_name)
+        equivalent = [r for r in fuzzy_results if r['match_type'] == 'normalized']
+        if len(equivalent) == 1:
+            return equivalent[0]['corp_code']
         
         # If not found, try partial search
         search_results = quick_search(corp_name)
@@ -134,6 +174,11 @@ def get_corp_code(corp_name: str) -> str:
             suggestions = [f"{r['corp_name']} ({r['corp_code']})" for r in search_results[:3]]
             return f"{corp_name}에 해당하는 정확한 고유번호를 찾을 수 없습니다. 유사한 회사: {', '.join(suggestions)}"
         
+        # Typos and choseong queries: suggest the closest names with scores
+        if fuzzy_results:
+            suggestions = [f"{r['corp_name']} ({r['corp_code']}, 유사도 {r['score']:.2f})" for r in fuzzy_results[:3]]
+            return f"{corp_name}에 해당하는 정확한 고유번호를 찾을 수 없습니다. 유사한 회사: {', '.join(suggestions)}"
+        
         return f"{corp_name}에 해당하는 고유번호를 찾을 수 없습니다."
     except Exception as e:
         return f"오류가 발생했습니다: {e}"
@@ -142,6 +187,7 @@ def get_corp_code(corp_name: str) -> str:
 def refresh_corpcode_data() -> str:
     """
     CORPCODE.xml 파일을 강제로 다시 다운로드하고 갱신합니다.
+    갱신 중에도 기존 데이터로 조회가 계속되며, 새 데이터는 검증 후 한 번에 교체됩니다.
     
     Returns:
         처리 결과 메시지
@@ -152,39 +198,43 @@ def refresh_corpcode_data() -> str:
         xml_path = os.path.join(dart_analytics_dir, 'CORPCODE.xml')
         zip_path = os.path.join(dart_analytics_dir, 'CORPCODE.zip')
         
-        # Delete existing files if exist
-        if os.path.exists(xml_path):
-            os.remove(xml_path)
-            print("🗑️ 기존 CORPCODE.xml 파일 삭제")
-        
-        if os.path.exists(zip_path):
-            os.remove(zip_path)
-            print("🗑️ 기존 CORPCODE.zip 파일 삭제")
-        
-        # Reset initialization flag
-        _storage_initialized = False
-        
-        # Download and extract new file
-        if _download_and_extract_corpcode():
-            # Reinitialize storage
-            if os.path.exists(xml_path):
-                initialize_storage(xml_path)
-                _storage_initialized = True
-                
-                # Provide file statistics
-                file_size = os.path.getsize(xml_path) / (1024*1024)
-                import xml.etree.ElementTree as ET
-                try:
-                    tree = ET.parse(xml_path)
-                    root = tree.getroot()
-                    corp_count = len(root.findall('list'))
-                    return f"✅ CORPCODE.xml 파일이 성공적으로 갱신되었습니다.\n📊 파일 크기: {file_size:.2f} MB\n🏢 총 기업 수: {corp_count:,}개"
-                except:
-                    return f"✅ CORPCODE.xml 파일이 성공적으로 갱신되었습니다.\n📊 파일 크기: {file_size:.2f} MB"
-            else:
+        # 기존 파일은 그대로 두고 임시 디렉터리에 새 파일을 받음
+        staging_dir = tempfile.mkdtemp(prefix='.corpcode-refresh-', dir=dart_analytics_dir)
+        try:
+            if not _download_and_extract_corpcode(target_dir=staging_dir, use_existing_zip=False):
+                return "❌ CORPCODE.xml 파일 갱신에 실패했습니다."
+            
+            new_xml_path = os.path.join(staging_dir, 'CORPCODE.xml')
+            if not os.path.exists(new_xml_path):
                 return "❌ 파일 다운로드는 성공했으나 CORPCODE.xml을 찾을 수 없습니다."
-        else:
-            return "❌ CORPCODE.xml 파일 갱신에 실패했습니다."
+            
+            # 라이브 DB 복사본에 변경분만 반영해 검증한 뒤 원자적으로 교체 (접근 통계 유지, 다른 워커에도 전파)
+            changeset = get_storage().reload_from_xml(new_xml_path)
+            
+            # 교체가 끝난 뒤에 XML/ZIP 파일도 새 버전으로 바꿈
+            os.replace(new_xml_path, xml_path)
+            new_zip_path = os.path.join(staging_dir, 'CORPCODE.zip')
+            if os.path.exists(new_zip_path):
+                os.replace(new_zip_path, zip_path)
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        
+        _storage_initialized = True
+        
+        # Provide file statistics
+        file_size = os.path.getsize(xml_path) / (1024*1024)
+        result = [
+            "✅ CORPCODE.xml 파일이 성공적으로 갱신되었습니다.",
+            f"📊 파일 크기: {file_size:.2f} MB",
+            f"🏢 총 기업 수: {changeset['total']:,}개",
+            f"🔄 변경 사항: 신규 {len(changeset['added']):,}개, 수정 {len(changeset['updated']):,}개, "
+            f"복원 {len(changeset['restored']):,}개, 삭제 {len(changeset['removed']):,}개 "
+            f"(변경 없음 {changeset['unchanged']:,}개)",
+            f"🔁 무중단 교체 완료: {changeset['database']} (세대 {changeset['generation']}, {changeset['seconds']}초)",
+        ]
+        return "\n".join(result)
+    except ValueError as e:
+        return f"❌ 새 데이터 검증 실패로 기존 데이터를 유지합니다: {str(e)}"
     except Exception as e:
         return f"❌ 갱신 중 오류 발생: {str(e)}"
 
@@ -217,10 +267,7 @@ def get_corpcode_file_info() -> str:
             
             # Parse and count corporations
             try:
-                import xml.etree.ElementTree as ET
-                tree = ET.parse(xml_path)
-                root = tree.getroot()
-                corp_count = len(root.findall('list'))
+                corp_count = count_corpcode_records(xml_path)
                 result.append(f"   🏢 기업 수: {corp_count:,}개")
             except:
                 result.append("   ⚠️ XML 파싱 오류")
@@ -257,29 +304,149 @@ def search_corporations(query: str, limit: int = 10) -> str:
         검색 결과를 포맷팅한 문자열
     """
     try:
-        _ensure_storage_initialized()
+        ensure_storage_initialized()
         
         results = quick_search(query)[:limit]
+        return format_search_results(query, results)
+    except Exception as e:
+        return f"검색 중 오류 발생: {str(e)}"
+
+
+def format_search_results(query: str, results: list) -> str:
+    """기업 검색 결과를 출력용 문자열로 변환합니다 (내부 함수)"""
+    if not results:
+        return f"'{query}'에 대한 검색 결과가 없습니다."
+    
+    output = []
+    output.append(f"🔍 '{query}' 검색 결과 (상위 {len(results)}개):")
+    output.append("=" * 50)
+    
+    for i, corp in enumerate(results, 1):
+        output.append(f"{i}. {corp['corp_name']}")
+        output.append(f"   - 고유번호: {corp['corp_code']}")
+        if corp['stock_code'].strip():
+            output.append(f"   - 종목코드: {corp['stock_code']}")
+        if corp['corp_eng_name']:
+            output.append(f"   - 영문명: {corp['corp_eng_name']}")
+        output.append("")
+    
+    return "\n".join(output)
+
+
+def find_similar_corporations(corp_name: str, limit: int = 5) -> str:
+    """
+    오타, 띄어쓰기, (주)/주식회사 표기 차이, 초성(예: "ㅅㅅㅈㅈ")을 허용하여
+    기업명과 유사한 기업 후보를 유사도 점수와 함께 반환합니다.
+    
+    Args:
+        corp_name: 기업명 (오타나 초성 입력 가능)
+        limit: 최대 후보 개수
+        
+    Returns:
+        유사도 순으로 정렬된 기업 후보 목록
+    """
+    try:
+        ensure_storage_initialized()
+        
+        results = fuzzy_search(corp_name, limit)
         
         if not results:
-            return f"'{query}'에 대한 검색 결과가 없습니다."
+            return f"'{corp_name}'와 유사한 기업을 찾을 수 없습니다."
         
         output = []
-        output.append(f"🔍 '{query}' 검색 결과 (상위 {len(results)}개):")
+        output.append(f"🔎 '{corp_name}' 유사 기업 후보 (상위 {len(results)}개):")
         output.append("=" * 50)
         
         for i, corp in enumerate(results, 1):
-            output.append(f"{i}. {corp['corp_name']}")
+            output.append(f"{i}. {corp['corp_name']} (유사도 {corp['score']:.2f})")
             output.append(f"   - 고유번호: {corp['corp_code']}")
-            if corp['stock_code'].strip():
+            if corp['stock_code']:
                 output.append(f"   - 종목코드: {corp['stock_code']}")
-            if corp['corp_eng_name']:
-                output.append(f"   - 영문명: {corp['corp_eng_name']}")
-            output.append("")
         
         return "\n".join(output)
     except Exception as e:
-        return f"검색 중 오류 발생: {str(e)}"
+        return f"유사 기업 검색 중 오류 발생: {str(e)}"
+
+
+def autocomplete_corporations(prefix: str, limit: int = 10) -> str:
+    """
+    기업명 앞부분으로 상장기업을 자동완성합니다.
+    "삼성", "현대", "SK"처럼 같은 이름으로 시작하는 기업이 여러 개일 때
+    조회 빈도가 높은 순으로 후보를 보여주어 기업을 특정하는 데 사용하세요.
+    
+    Args:
+        prefix: 기업명 앞부분 (한글/영문, 예: "삼성", "hyundai")
+        limit: 최대 후보 개수
+        
+    Returns:
+        조회 빈도순 상장기업 후보 목록
+    """
+    try:
+        ensure_storage_initialized()
+        
+        results = autocomplete(prefix, limit)
+        
+        if not results:
+            return f"'{prefix}'(으)로 시작하는 상장기업이 없습니다."
+        
+        output = []
+        output.append(f"⌨️ '{prefix}' 자동완성 (상장기업 {len(results)}개, 조회 빈도순):")
+        output.append("=" * 50)
+        
+        for i, corp in enumerate(results, 1):
+            output.append(f"{i}. {corp['corp_name']} - 고유번호 {corp['corp_code']}, 종목코드 {corp['stock_code']}")
+        
+        return "\n".join(output)
+    except Exception as e:
+        return f"자동완성 중 오류 발생: {str(e)}"
+
+
+def resolve_corporations(corp_names: List[str]) -> str:
+    """
+    여러 기업명을 한 번에 고유번호로 변환합니다.
+    비교 기업군이나 다중회사 재무정보 조회처럼 여러 기업이 필요할 때
+    get_corp_code를 반복 호출하는 대신 사용하세요.
+    
+    Args:
+        corp_names: 기업명 목록 (예: ["삼성전자", "SK하이닉스", "LG전자"])
+        
+    Returns:
+        기업명별 고유번호/종목코드 목록 (찾지 못한 기업은 유사 후보 표시)
+    """
+    try:
+        ensure_storage_initialized()
+        
+        names = [name.strip() for name in corp_names if name and name.strip()]
+        if not names:
+            return "❌ 변환할 기업명이 없습니다."
+        
+        codes = get_corp_codes_bulk(names)
+        infos = get_storage().get_corporations_by_codes([code for code in codes.values() if code])
+        
+        output = []
+        output.append(f"🏢 기업 고유번호 일괄 변환 ({sum(1 for code in codes.values() if code)}/{len(codes)}개 성공)")
+        output.append("=" * 50)
+        
+        for i, (name, code) in enumerate(codes.items(), 1):
+            if code:
+                info = infos.get(code) or {}
+                stock_code = (info.get('stock_code') or '').strip()
+                line = f"{i}. {name} → {code}"
+                if stock_code:
+                    line += f" (종목코드 {stock_code})"
+                output.append(line)
+            else:
+                candidates = fuzzy_search(name, 1)
+                if candidates:
+                    best = candidates[0]
+                    output.append(f"{i}. {name} → ❓ 정확히 일치하는 기업 없음 "
+                                  f"(후보: {best['corp_name']} {best['corp_code']}, 유사도 {best['score']:.2f})")
+                else:
+                    output.append(f"{i}. {name} → ❌ 찾을 수 없음")
+        
+        return "\n".join(output)
+    except Exception as e:
+        return f"일괄 변환 중 오류 발생: {str(e)}"
 
 
 def get_corp_info(corp_code: str) -> str:
@@ -293,34 +460,38 @@ def get_corp_info(corp_code: str) -> str:
         기업 상세 정보
     """
     try:
-        _ensure_storage_initialized()
+        ensure_storage_initialized()
         
         storage = get_storage()
         info = storage.get_corporation_info(corp_code)
-        
-        if not info:
-            return f"고유번호 {corp_code}에 해당하는 기업을 찾을 수 없습니다."
-        
-        output = []
-        output.append(f"📊 기업 상세 정보")
-        output.append("=" * 40)
-        output.append(f"🏢 회사명: {info['corp_name']}")
-        output.append(f"🔢 고유번호: {info['corp_code']}")
-        if info['stock_code'].strip():
-            output.append(f"📈 종목코드: {info['stock_code']}")
-        if info['corp_eng_name']:
-            output.append(f"🌐 영문명: {info['corp_eng_name']}")
-        output.append(f"📅 최종수정일: {info['modify_date']}")
-        if info['access_count'] > 0:
-            output.append(f"🔍 조회횟수: {info['access_count']}회")
-        if info['last_accessed']:
-            output.append(f"⏰ 최근조회: {info['last_accessed']}")
-        
-        return "\n".join(output)
+        return format_corp_info(corp_code, info)
     except Exception as e:
         return f"정보 조회 중 오류 발생: {str(e)}"
 
 
+def format_corp_info(corp_code: str, info: dict) -> str:
+    """기업 상세 정보를 출력용 문자열로 변환합니다 (내부 함수)"""
+    if not info:
+        return f"고유번호 {corp_code}에 해당하는 기업을 찾을 수 없습니다."
+    
+    output = []
+    output.append(f"📊 기업 상세 정보")
+    output.append("=" * 40)
+    output.append(f"🏢 회사명: {info['corp_name']}")
+    output.append(f"🔢 고유번호: {info['corp_code']}")
+    if info['stock_code'].strip():
+        output.append(f"📈 종목코드: {info['stock_code']}")
+    if info['corp_eng_name']:
+        output.append(f"🌐 영문명: {info['corp_eng_name']}")
+    output.append(f"📅 최종수정일: {info['modify_date']}")
+    if info['access_count'] > 0:
+        output.append(f"🔍 조회횟수: {info['access_count']}회")
+    if info['last_accessed']:
+        output.append(f"⏰ 최근조회: {info['last_accessed']}")
+    
+    return "\n".join(output)
+
+
 def get_document_basic_info(rcept_no: str) -> str:
     """
     ZIP 파일 추출 없이 DART API를 통해 기본 공시정보만 조회합니다.
@@ -334,20 +505,17 @@ def get_document_basic_info(rcept_no: str) -> str:
     """
     try:
         # 공시검색 API를 통해 기본 정보 조회
-        url = "https://opendart.fss.or.kr/api/list.json"
         params = {
-            'crtfc_key': config.DART_API_KEY,
             'bgn_de': rcept_no[:8],  # 접수일자 추출
             'end_de': rcept_no[:8],  # 같은 날짜로 설정
             'page_count': 100
         }
         
-        response = requests.get(url, params=params)
-        
-        if response.status_code != 200:
-            return f"❌ API 호출 실패: HTTP {response.status_code}"
-        
-        data = response.json()
+        with get_dart_client().get('list.json', params) as response:
+            if response.status_code != 200:
+                return f"❌ API 호출 실패: HTTP {response.status_code}"
+            
+            data = response.json()
         
         if data.get('status') != '000':
             return f"❌ DART API 오류: {data.get('message', '알 수 없는 오류')}"
@@ -388,20 +556,23 @@ def get_document_basic_info(rcept_no: str) -> str:
 
 def ensure_document_available(rcept_no: str, download_folder: str) -> str:
     """문서가 사용 가능한지 확인하고 필요시 다운로드 (내부 함수)"""
-    from .file_handlers import download_document_zip
-    
-    extract_folder = os.path.join(download_folder, f"extracted_{rcept_no}")
+    from .file_handlers import DartDownloadError, fetch_zip, is_document_cached, legacy_extract_folder
     
-    # 이미 압축해제된 폴더가 있는지 확인
-    if os.path.exists(extract_folder) and os.listdir(extract_folder):
+    # 캐시에 ZIP이 있거나 이전 버전이 풀어 둔 폴더가 있으면 다시 받지 않음
+    # (open_document_files가 둘 다 읽을 수 있으므로 API 호출과 일일 한도를 아낌)
+    if is_document_cached(rcept_no, download_folder) or legacy_extract_folder(rcept_no, download_folder):
         return "READY"  # 내부 상태 코드
     
-    # 폴더가 없거나 비어있으면 다운로드 + 압축해제
-    download_result = download_document_zip(rcept_no, download_folder)
-    
-    if "❌" in download_result:
-        return download_result
+    # 다운로드 캐시를 거치므로 완전히 받은 문서만 READY로 취급하고,
+    # 다른 세션이 같은 문서를 받는 중이면 그 다운로드가 끝나기를 기다림.
+    # 압축은 풀지 않음 (문서 분석 함수들이 FilingArchive로 필요한 멤버만 읽음)
+    try:
+        downloaded = fetch_zip('document.xml', {'rcept_no': rcept_no}, download_folder)
+    except DartDownloadError as e:
+        return f"❌ {str(e)}"
     
+    if downloaded['source'] == 'cache':
+        return "READY"  # 내부 상태 코드
     return "DOWNLOAD_COMPLETE"  # 내부 상태 코드
 
 
@@ -6,7 +6,7 @@ XBRL(eXtensible Business Reporting Language) 파일의 다운로드, 파싱 및
 
 import os
 from bs4 import BeautifulSoup
-from .file_handlers import download_and_extract_file
+from .file_handlers import DartDownloadError, fetch_zip
 
 
 def download_xbrl_financial_statement(rcept_no: str, reprt_code: str, download_folder: str = "./downloads") -> str:
@@ -21,15 +21,20 @@ def download_xbrl_financial_statement(rcept_no: str, reprt_code: str, download_f
     Returns:
         처리 결과 메시지
     """
-    return download_and_extract_file(
-        endpoint='fnlttXbrl.xml',
-        params={
-            'rcept_no': rcept_no,
-            'reprt_code': reprt_code
-        },
-        download_folder=download_folder,
-        file_prefix=f'xbrl_{rcept_no}_{reprt_code}'
-    )
+    try:
+        downloaded = fetch_zip(
+            endpoint='fnlttXbrl.xml',
+            params={
+                'rcept_no': rcept_no,
+                'reprt_code': reprt_code
+            },
+            download_folder=download_folder,
+            extract_name=f'extracted_xbrl_{rcept_no}_{reprt_code}'
+        )
+    except DartDownloadError as e:
+        return f"❌ {str(e)}"
+    
+    return f"✅ ZIP 파일 처리 완료: {len(downloaded['files'])}개 파일 추출"
 
 
 def process_xbrl_files(rcept_no: str, reprt_code: str, download_folder: str = "./downloads") -> str:
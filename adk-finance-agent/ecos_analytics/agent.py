@@ -7,6 +7,8 @@ from google.adk.tools.function_tool import FunctionTool
 from google.adk.auth.auth_credential import AuthCredential, AuthCredentialTypes
 from . import prompt
 from . import corpcode_manager
+# corpcode_manager가 sys.path에 상위 폴더를 추가하므로 dart_analytics의 공용 속도 제한기 사용 가능
+from dart_analytics.sub_functions.rate_limiter import openapi_tool_callbacks
 
 # Load ECOS OpenAPI spec (use final corrected version with proper parameter order)
 with open('./ecos_analytics/ecos_final_openapi.yml', 'r') as f:
@@ -20,6 +22,9 @@ toolset = OpenAPIToolset(
     spec_str_type="yaml"
 )
 
+# ECOS OpenAPI 도구 호출은 API 키별 공용 속도 제한기를 거침 (ERROR-602 과도한 호출 시 백오프)
+before_tool_callback, after_tool_callback = openapi_tool_callbacks('ecos', config.ECOS_API_KEY)
+
 # CORPCODE 관리 함수들을 FunctionTool로 등록
 
 ecos_analytics = LlmAgent(
@@ -34,6 +39,8 @@ ecos_analytics = LlmAgent(
         FunctionTool(func=corpcode_manager.get_corp_info),
         FunctionTool(func=corpcode_manager.get_listed_companies)
     ],
+    before_tool_callback=before_tool_callback,
+    after_tool_callback=after_tool_callback,
     output_key="ecos_result",
 )
 
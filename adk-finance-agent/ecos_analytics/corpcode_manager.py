@@ -20,13 +20,26 @@ try:
 except ImportError as e:
     print(f"Warning: Could not import dart_analytics storage: {e}")
     print("Corporation code functionality will be limited.")
-    _storage = None
-else:
-    # Initialize storage if XML file exists
-    xml_path = parent_dir / "dart_analytics" / "CORPCODE.xml"
-    if xml_path.exists():
-        initialize_storage(str(xml_path))
-    _storage = get_storage()
+    get_storage = None
+
+_storage = None
+
+
+def _get_storage():
+    """
+    Open the shared DART storage on first use.
+    
+    The storage coordinates with the DART agent and other workers on this host
+    (one stats writer, shared mmap snapshot), so no separate copy is imported here.
+    """
+    global _storage
+    if _storage is None and get_storage is not None:
+        # Import only if no process has loaded the data yet
+        xml_path = parent_dir / "dart_analytics" / "CORPCODE.xml"
+        if xml_path.exists():
+            initialize_storage(str(xml_path))
+        _storage = get_storage()
+    return _storage
 
 
 def get_corp_code(corp_name: str) -> Optional[str]:
@@ -39,12 +52,13 @@ def get_corp_code(corp_name: str) -> Optional[str]:
     Returns:
         Corporation code if found, None otherwise
     """
-    if _storage is None:
+    storage = _get_storage()
+    if storage is None:
         print(f"Storage not available. Cannot get corp code for: {corp_name}")
         return None
     
     try:
-        return _storage.get_corp_code(corp_name)
+        return storage.get_corp_code(corp_name)
     except Exception as e:
         print(f"Error getting corp code for {corp_name}: {e}")
         return None
@@ -61,12 +75,13 @@ def search_corporations(query: str, limit: int = 10) -> List[Dict[str, str]]:
     Returns:
         List of matching corporations
     """
-    if _storage is None:
+    storage = _get_storage()
+    if storage is None:
         print(f"Storage not available. Cannot search for: {query}")
         return []
     
     try:
-        return _storage.search_corporations(query, limit)
+        return storage.search_corporations(query, limit)
     except Exception as e:
         print(f"Error searching corporations for {query}: {e}")
         return []
@@ -82,12 +97,13 @@ def get_corp_info(corp_code: str) -> Optional[Dict[str, Any]]:
     Returns:
         Corporation information dictionary if found
     """
-    if _storage is None:
+    storage = _get_storage()
+    if storage is None:
         print(f"Storage not available. Cannot get info for corp code: {corp_code}")
         return None
     
     try:
-        return _storage.get_corporation_info(corp_code)
+        return storage.get_corporation_info(corp_code)
     except Exception as e:
         print(f"Error getting corp info for {corp_code}: {e}")
         return None
@@ -103,13 +119,14 @@ def get_listed_companies(limit: int = 100) -> List[Dict[str, Any]]:
     Returns:
         List of listed companies
     """
-    if _storage is None:
+    storage = _get_storage()
+    if storage is None:
         print("Storage not available. Cannot get listed companies.")
         return []
     
     try:
         # Search for companies with stock codes
-        results = _storage.search_corporations("", limit * 2)  # Get more to filter
+        results = storage.search_corporations("", limit * 2)  # Get more to filter
         
         # Filter to only include companies with stock codes
         listed_companies = []
@@ -132,10 +149,11 @@ def get_storage_statistics() -> Dict[str, Any]:
     Returns:
         Storage statistics dictionary
     """
-    if _storage is None:
+    storage = _get_storage()
+    if storage is None:
         return {"error": "Storage not available"}
     
     try:
-        return _storage.get_statistics()
+        return storage.get_statistics()
     except Exception as e:
         return {"error": f"Error getting statistics: {e}"}
\ No newline at end of file
@@ -11,9 +11,18 @@ from .config import config
 from . import prompt
 from .ssl_api_tool import (
     get_stock_price_info_ssl,
-    get_securities_price_info_ssl
+    get_securities_price_info_ssl,
+    convert_corporation_identifier
 )
 
+# OpenAPIToolset 호출도 ssl 도구와 같은 data.go.kr 속도 제한기를 공유 (sys.path는 ssl_api_tool에서 설정)
+try:
+    from dart_analytics.sub_functions.rate_limiter import openapi_tool_callbacks
+    before_tool_callback, after_tool_callback = openapi_tool_callbacks('data_go_kr', config.STOCK_API_KEY)
+except Exception as e:
+    print(f"⚠️ 공용 속도 제한기 로드 실패: {e}")
+    before_tool_callback = after_tool_callback = None
+
 # OpenAPI 스펙 파일 경로
 openapi_spec_path = os.path.join(os.path.dirname(__file__), 'stock_openapi.yml')
 
@@ -42,7 +51,8 @@ except Exception as e:
 # SSL 호환 함수 도구들 생성
 ssl_tools = [
     FunctionTool(func=get_stock_price_info_ssl),
-    FunctionTool(func=get_securities_price_info_ssl)
+    FunctionTool(func=get_securities_price_info_ssl),
+    FunctionTool(func=convert_corporation_identifier)
 ]
 
 # Tools 리스트 구성 - SSL 호환 도구를 우선 사용
@@ -58,6 +68,8 @@ stock_analytics = LlmAgent(
     description="금융위원회 주식시세정보 OpenAPI를 활용한 주식/증권 시세 조회 및 분석 에이전트",
     instruction=prompt.STOCK_ANALYTICS_PROMPT,
     tools=tools_list,
+    before_tool_callback=before_tool_callback,
+    after_tool_callback=after_tool_callback,
     output_key="stock_result",
 )
 
@@ -22,6 +22,7 @@ STOCK_ANALYTICS_PROMPT = f"""
 ## 📊 사용 가능한 API 함수 (SSL 호환)
 1. **get_stock_price_info_ssl**: 주식시세정보 조회 (SSL 문제 해결)
 2. **get_securities_price_info_ssl**: 수익증권시세정보 조회 (SSL 문제 해결)
+3. **convert_corporation_identifier**: DART 고유번호 ↔ 종목코드 ↔ ISIN ↔ 기업명 변환 (로컬 인덱스, API 호출 없음)
 
 ## 🎯 주요 파라미터 사용법
 
@@ -29,6 +30,7 @@ STOCK_ANALYTICS_PROMPT = f"""
 - **itms_nm**: 정확한 종목명 (정확히 일치하는 종목명으로 검색)
 - **like_itms_nm**: 포함 검색 (종목명에 특정 단어가 포함된 모든 종목 검색) 
 - **isin_cd**: ISIN 코드 (국제 증권 식별 번호로 검색)
+- **stock_code** / **corp_code**: 종목코드 또는 DART 고유번호 (자동으로 ISIN 변환 후 검색)
 
 ### 날짜 파라미터  
 - **bas_dt**: 특정 기준일자 (YYYYMMDD)
@@ -4,16 +4,105 @@ SSL 호환 API 호출 도구
 """
 
 import json
+import sys
 import xml.etree.ElementTree as ET
-from typing import Optional
+from pathlib import Path
+from typing import Any, Dict, Optional
 from .ssl_adapter import create_ssl_session
 from .config import config
 
+# dart_analytics 저장소의 식별자 인덱스로 corp_code/종목코드/ISIN/기업명 변환
+parent_dir = Path(__file__).parent.parent
+if str(parent_dir) not in sys.path:
+    sys.path.insert(0, str(parent_dir))
+
+try:
+    from dart_analytics.sub_functions.corpcode_storage import get_storage, initialize_storage
+except Exception as e:
+    print(f"Warning: Could not import dart_analytics storage: {e}")
+    print("Identifier translation (corp_code/stock_code -> ISIN) will be unavailable.")
+    get_storage = None
+
+try:
+    from dart_analytics.sub_functions.rate_limiter import get_rate_limiter
+except Exception as e:
+    print(f"Warning: Could not import shared rate limiter: {e}")
+    get_rate_limiter = None
+
+_storage_initialized = False
+
+
+def _rate_limited_get(session, url: str, params: Dict[str, Any]):
+    """
+    data.go.kr 공용 속도 제한기(API 키별 우선순위 큐, 일일 한도)를 거쳐 GET 요청 (내부 함수)
+    
+    LIMITED_NUMBER_OF_SERVICE_REQUESTS 응답을 받으면 같은 키의 다른 요청도 잠시 멈추고 속도를 낮춥니다.
+    """
+    limiter = get_rate_limiter('data_go_kr', config.STOCK_API_KEY) if get_rate_limiter is not None else None
+    if limiter is not None:
+        limiter.acquire()
+    
+    response = session.get(url, params=params, timeout=30, verify=False)
+    
+    if limiter is not None:
+        if response.status_code == 429:
+            limiter.report_throttled()
+        else:
+            limiter.report(response.text)
+    return response
+
+
+def _resolve_identifier(identifier: str) -> Optional[Dict[str, Any]]:
+    """corp_code, 종목코드, ISIN 또는 기업명을 모든 식별자로 변환 (내부 함수)"""
+    global _storage_initialized
+    if get_storage is None:
+        return None
+    
+    if not _storage_initialized:
+        xml_path = parent_dir / "dart_analytics" / "CORPCODE.xml"
+        if xml_path.exists():
+            initialize_storage(str(xml_path))
+        _storage_initialized = True
+    
+    return get_storage().resolve_identifier(identifier)
+
+
+def convert_corporation_identifier(identifier: str) -> str:
+    """
+    기업 식별자를 상호 변환합니다 (DART 고유번호 ↔ 종목코드 ↔ ISIN ↔ 기업명).
+    
+    Args:
+        identifier: DART 고유번호(8자리), 종목코드(6자리), ISIN(12자리) 또는 정확한 기업명
+    
+    Returns:
+        str: 변환된 식별자 정보
+    """
+    try:
+        info = _resolve_identifier(identifier)
+    except Exception as e:
+        return f"❌ 식별자 변환 중 오류 발생: {str(e)}"
+    
+    if info is None:
+        return f"❌ '{identifier}'에 해당하는 기업을 찾을 수 없습니다."
+    
+    result = [
+        f"🏢 기업명: {info['corp_name']}",
+        f"🔢 DART 고유번호: {info['corp_code']}",
+    ]
+    if info['stock_code']:
+        result.append(f"📈 종목코드: {info['stock_code']}")
+        result.append(f"🌐 ISIN: {info['isin']}")
+    else:
+        result.append("ℹ️ 비상장 기업 (종목코드/ISIN 없음)")
+    return "\n".join(result)
+
 
 def get_stock_price_info_ssl(
     itms_nm: Optional[str] = None,
     like_itms_nm: Optional[str] = None,
     isin_cd: Optional[str] = None,
+    stock_code: Optional[str] = None,
+    corp_code: Optional[str] = None,
     bas_dt: Optional[str] = None,
     begin_bas_dt: Optional[str] = None,
     end_bas_dt: Optional[str] = None,
@@ -29,6 +118,8 @@ def get_stock_price_info_ssl(
         itms_nm: 종목명 (정확한 매칭)
         like_itms_nm: 종목명 포함 검색 (부분 매칭)
         isin_cd: ISIN 코드
+        stock_code: 종목코드 6자리 (ISIN으로 자동 변환)
+        corp_code: DART 고유번호 8자리 (ISIN으로 자동 변환)
         bas_dt: 기준일자 (YYYYMMDD)
         begin_bas_dt: 기간 조회 시작일
         end_bas_dt: 기간 조회 종료일
@@ -41,6 +132,16 @@ def get_stock_price_info_ssl(
         str: API 응답 결과 (JSON 또는 XML 텍스트)
     """
     
+    # 종목코드/DART 고유번호는 로컬 인덱스로 ISIN 변환 (추가 API 호출 없음)
+    if not isin_cd and (stock_code or corp_code):
+        try:
+            info = _resolve_identifier(stock_code or corp_code)
+        except Exception:
+            info = None
+        if info is None or not info['isin']:
+            return f"❌ '{stock_code or corp_code}'에 해당하는 상장 종목의 ISIN을 찾을 수 없습니다."
+        isin_cd = info['isin']
+    
     # SSL 호환 세션 생성
     session = create_ssl_session()
     
@@ -72,8 +173,8 @@ def get_stock_price_info_ssl(
         params['mrktCtg'] = mrkt_ctg
     
     try:
-        # API 호출 (SSL 어댑터 사용, verify=False 추가)
-        response = session.get(url, params=params, timeout=30, verify=False)
+        # API 호출 (SSL 어댑터 사용, verify=False 추가, 공용 속도 제한기 경유)
+        response = _rate_limited_get(session, url, params)
         
         if response.status_code == 200:
             # 성공적인 응답 처리
@@ -152,7 +253,7 @@ def get_securities_price_info_ssl(
         params['endBasDt'] = end_bas_dt
     
     try:
-        response = session.get(url, params=params, timeout=30, verify=False)
+        response = _rate_limited_get(session, url, params)
         
         if response.status_code == 200:
             content = response.text.strip()
@@ -0,0 +1,73 @@
+"""Shared fixtures for the adk-finance-agent test suite"""
+
+import sys
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dart_analytics.sub_functions.corpcode_storage import CorpCodeStorage  # noqa: E402
+
+
+def write_corpcode_xml(path: Path, rows) -> Path:
+    """Write a CORPCODE.xml with (corp_code, corp_name, corp_eng_name, stock_code, modify_date) rows"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<result>\n')
+        for corp_code, corp_name, corp_eng_name, stock_code, modify_date in rows:
+            f.write(
+                f"<list><corp_code>{corp_code}</corp_code><corp_name>{escape(corp_name)}</corp_name>"
+                f"<corp_eng_name>{escape(corp_eng_name)}</corp_eng_name><stock_code>{stock_code}</stock_code>"
+                f"<modify_date>{modify_date}</modify_date></list>\n"
+            )
+        f.write("</result>\n")
+    return path
+
+
+SAMPLE_ROWS = [
+    ("00126380", "삼성전자", "SAMSUNG ELECTRONICS CO,.LTD", "005930", "20240101"),
+    ("00164779", "SK하이닉스", "SK hynix Inc.", "000660", "20240101"),
+    ("00164742", "현대자동차", "Hyundai Motor Company", "005380", "20240101"),
+    ("00126186", "삼성에스디에스", "Samsung SDS Co.,Ltd.", "018260", "20240101"),
+    ("00258801", "카카오", "Kakao Corp.", "035720", "20240101"),
+    ("00401731", "LG전자", "LG Electronics Inc.", "066570", "20240101"),
+    ("00000001", "동명회사", "Namesake Unlisted", " ", "20240101"),
+    ("00000002", "동명회사", "Namesake Listed", "900001", "20240101"),
+    ("00000003", "삼성물산", "Samsung C&T", "028260", "20240101"),
+    ("00000004", "비상장테스트", "Unlisted Test", " ", "20240101"),
+]
+
+
+@pytest.fixture
+def sample_rows():
+    return list(SAMPLE_ROWS)
+
+
+@pytest.fixture
+def corpcode_xml(tmp_path):
+    return write_corpcode_xml(tmp_path / "CORPCODE.xml", SAMPLE_ROWS)
+
+
+@pytest.fixture
+def make_corpcode_xml(tmp_path):
+    """Factory writing CORPCODE.xml files with the given rows under tmp_path"""
+    def factory(rows, name="CORPCODE.xml"):
+        return write_corpcode_xml(tmp_path / name, rows)
+    return factory
+
+
+@pytest.fixture
+def make_storage(tmp_path):
+    """Factory for storages under tmp_path, closed after the test"""
+    created = []
+
+    def factory(base_dir=None, **kwargs):
+        kwargs.setdefault("persist_cache", False)
+        storage = CorpCodeStorage(base_dir=base_dir or tmp_path, **kwargs)
+        created.append(storage)
+        return storage
+
+    yield factory
+    for storage in created:
+        storage.close()
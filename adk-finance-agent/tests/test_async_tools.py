@@ -0,0 +1,31 @@
+"""Async corp-code tool: one exact lookup, then only the fallback"""
+
+import asyncio
+
+from dart_analytics.sub_functions import async_tools, utils
+from dart_analytics.sub_functions.corpcode_async import AsyncCorpCodeStorage
+
+
+def test_exact_miss_runs_only_the_fallback(make_storage, corpcode_xml, monkeypatch):
+    storage = make_storage()
+    storage.import_from_xml(str(corpcode_xml))
+    lookups = []
+    exact = storage.get_corp_code
+
+    def counted(corp_name):
+        lookups.append(corp_name)
+        return exact(corp_name)
+
+    monkeypatch.setattr(storage, "get_corp_code", counted)
+    monkeypatch.setattr(async_tools, "get_async_storage", lambda: AsyncCorpCodeStorage(storage, max_workers=1))
+    monkeypatch.setattr(utils, "ensure_storage_initialized", lambda: True)
+    monkeypatch.setattr(utils, "_storage_initialized", True)
+    monkeypatch.setattr(utils, "get_corp_code_quick", counted)
+    monkeypatch.setattr(utils, "fuzzy_search", storage.fuzzy_search)
+    monkeypatch.setattr(utils, "quick_search", storage.search_corporations)
+
+    assert asyncio.run(async_tools.get_corp_code("삼성전자")) == "00126380"
+    assert lookups == ["삼성전자"]
+
+    assert asyncio.run(async_tools.get_corp_code("(주)삼성전자")) == "00126380"
+    assert lookups == ["삼성전자", "(주)삼성전자"]
@@ -0,0 +1,33 @@
+"""BulkDownloader progress log: append-only, replayed on start"""
+
+from dart_analytics.sub_functions.bulk_downloader import BulkDownloader
+
+
+def test_progress_log_is_replayed(tmp_path):
+    downloader = BulkDownloader(str(tmp_path))
+    downloader._record("20240101000001", status="failed", attempts=1, retryable=True)
+    downloader._record("20240101000001", status="done", attempts=2, error=None)
+    downloader._record("20240101000002", status="failed", attempts=1, retryable=False)
+    downloader._close_progress()
+
+    lines = downloader.progress_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3
+
+    items = BulkDownloader(str(tmp_path))._progress["items"]
+    assert items["20240101000001"] == {"status": "done", "attempts": 2, "retryable": True, "error": None}
+    assert items["20240101000002"]["status"] == "failed"
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    downloader = BulkDownloader(str(tmp_path))
+    downloader._record("20240101000001", status="done", attempts=1)
+    downloader._close_progress()
+    with open(downloader.progress_path, "a", encoding="utf-8") as f:
+        f.write('{"item": "20240101000002", "fie')
+
+    resumed = BulkDownloader(str(tmp_path))
+    assert list(resumed._progress["items"]) == ["20240101000001"]
+    resumed._record("20240101000003", status="done", attempts=1)
+    resumed._close_progress()
+
+    assert set(BulkDownloader(str(tmp_path))._progress["items"]) == {"20240101000001", "20240101000003"}
@@ -0,0 +1,43 @@
+"""Corporations sharing a name resolve to the same corp_code on every lookup path"""
+
+import pytest
+
+from dart_analytics.sub_functions.corpcode_identifiers import CorpIdentifierIndex
+from dart_analytics.sub_functions.corpcode_snapshot import CorpCodeSnapshot, write_snapshot
+
+LISTED = "00000002"
+
+
+@pytest.mark.parametrize("shared", [True, False])
+def test_single_and_bulk_lookups_agree(make_storage, corpcode_xml, shared):
+    storage = make_storage(shared=shared)
+    storage.import_from_xml(str(corpcode_xml))
+
+    assert storage.get_corp_code("동명회사") == LISTED
+    storage.clear_cache()
+    assert storage.get_corp_codes_bulk(["동명회사", "삼성전자"]) == {"동명회사": LISTED, "삼성전자": "00126380"}
+    # The bulk result was cached under the same key; the single lookup must still agree
+    assert storage.get_corp_code("동명회사") == LISTED
+
+
+def test_tie_break_ignores_insertion_order(make_storage, make_corpcode_xml, tmp_path):
+    rows = [
+        ("00000009", "동명회사", "", "900009", "20240101"),
+        ("00000001", "동명회사", "", " ", "20240101"),
+        ("00000005", "동명회사", "", "900005", "20240101"),
+    ]
+    storage = make_storage(shared=False)
+    storage.import_from_xml(str(make_corpcode_xml(rows, "dup.xml")))
+
+    assert storage.get_corp_code("동명회사") == "00000005"
+    storage.clear_cache()
+    assert storage.get_corp_codes_bulk(["동명회사"]) == {"동명회사": "00000005"}
+    assert storage.resolve_identifier("동명회사")["corp_code"] == "00000005"
+
+    snapshot_path = tmp_path / "dup.snapshot"
+    write_snapshot(snapshot_path, rows)
+    with CorpCodeSnapshot(snapshot_path) as snapshot:
+        assert snapshot.get_corp_code("동명회사") == "00000005"
+
+    index = CorpIdentifierIndex.build([(code, name, stock) for code, name, _, stock, _ in reversed(rows)])
+    assert index.by_name("동명회사")["corp_code"] == "00000005"
@@ -0,0 +1,47 @@
+"""Fuzzy name index: stop-grams and lazy builds"""
+
+from dart_analytics.sub_functions.corpcode_fuzzy import FuzzyCorpIndex, LazyFuzzyIndex, decompose_jamo
+
+FILLER = [(f"{i:08d}", f"테스트{i}전자", "", "") for i in range(500)]
+
+
+def test_common_grams_are_stop_grams_not_truncated():
+    rows = FILLER + [("00126380", "삼성전자", "SAMSUNG ELECTRONICS", "005930")]
+    index = FuzzyCorpIndex.build(rows, max_posting=100)
+
+    assert decompose_jamo("전자")[:3] in index._stop_grams
+    assert all(len(posting) <= 100 for posting in index._postings.values())
+    assert index.search("삼셩전자", limit=1)[0]["corp_code"] == "00126380"
+
+
+def test_query_made_only_of_stop_grams_finds_no_fuzzy_candidates():
+    index = FuzzyCorpIndex.build(FILLER, max_posting=100)
+    assert index._candidates(decompose_jamo("전자")) == []
+
+
+def test_lazy_index_builds_once_and_again_after_invalidation():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return [("00126380", "삼성전자", "", "005930")]
+
+    lazy = LazyFuzzyIndex(loader)
+    assert calls == []
+    assert len(lazy.get()) == 1
+    assert len(lazy.get()) == 1
+    assert len(calls) == 1
+
+    lazy.invalidate()
+    assert len(calls) == 1
+    assert len(lazy.get()) == 1
+    assert len(calls) == 2
+
+
+def test_storage_builds_fuzzy_index_on_first_lookup(make_storage, corpcode_xml):
+    storage = make_storage()
+    storage.import_from_xml(str(corpcode_xml))
+    assert storage._fuzzy_index._index is None
+
+    assert storage.fuzzy_search("삼셩전자", limit=1)[0]["corp_code"] == "00126380"
+    assert len(storage._fuzzy_index._index) == len(storage._load_fuzzy_rows())
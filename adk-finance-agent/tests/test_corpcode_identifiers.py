@@ -0,0 +1,46 @@
+"""ISIN check digits and identifier resolution"""
+
+import pytest
+
+from dart_analytics.sub_functions.corpcode_identifiers import (
+    classify_identifier, is_valid_isin, isin_to_stock_code, stock_code_to_isin)
+
+
+@pytest.mark.parametrize("stock_code, isin", [
+    ("005930", "KR7005930003"),  # Samsung Electronics
+    ("000660", "KR7000660001"),  # SK hynix
+    ("005380", "KR7005380001"),  # Hyundai Motor
+    ("035720", "KR7035720002"),  # Kakao
+])
+def test_stock_code_to_isin(stock_code, isin):
+    assert stock_code_to_isin(stock_code) == isin
+    assert is_valid_isin(isin)
+    assert isin_to_stock_code(isin) == stock_code
+
+
+def test_foreign_isin_check_digit():
+    assert is_valid_isin("US0378331005")  # Apple
+    assert not is_valid_isin("US0378331006")
+
+
+def test_malformed_codes_are_rejected():
+    assert stock_code_to_isin("59300") is None
+    assert isin_to_stock_code("KR7005930004") is None
+    assert isin_to_stock_code("US0378331005") is None
+
+
+def test_classify_identifier():
+    assert classify_identifier("KR7005930003") == "isin"
+    assert classify_identifier("00126380") == "corp_code"
+    assert classify_identifier("005930") == "stock_code"
+    assert classify_identifier("삼성전자") == "name"
+
+
+def test_storage_resolves_every_identifier_kind(make_storage, corpcode_xml):
+    storage = make_storage()
+    storage.import_from_xml(str(corpcode_xml))
+
+    for identifier in ("KR7005930003", "00126380", "005930", "삼성전자"):
+        resolved = storage.resolve_identifier(identifier)
+        assert resolved["corp_code"] == "00126380", identifier
+        assert resolved["isin"] == "KR7005930003"
@@ -0,0 +1,63 @@
+"""Blue/green reload: swap on success, keep the live database on failure"""
+
+import pytest
+
+
+def test_reload_swaps_in_a_new_database(make_storage, make_corpcode_xml, sample_rows):
+    storage = make_storage()
+    storage.import_from_xml(str(make_corpcode_xml(sample_rows)))
+    live_path = storage.db_path
+
+    rows = sample_rows + [("00999999", "신규상장", "New Listing", "999990", "20240301")]
+    changeset = storage.reload_from_xml(str(make_corpcode_xml(rows, "CORPCODE-2.xml")))
+
+    assert changeset["added"] == ["00999999"]
+    assert storage.db_path != live_path
+    assert storage.db_path.name == changeset["database"]
+    assert storage.get_corp_code("신규상장") == "00999999"
+
+
+def test_reload_below_min_ratio_keeps_the_live_database(make_storage, make_corpcode_xml, sample_rows):
+    storage = make_storage()
+    storage.import_from_xml(str(make_corpcode_xml(sample_rows)))
+    live_path = storage.db_path
+    generation = storage.get_generation()
+
+    truncated = make_corpcode_xml(sample_rows[:2], "CORPCODE-truncated.xml")
+    with pytest.raises(ValueError, match="minimum"):
+        storage.reload_from_xml(str(truncated), min_ratio=0.5)
+
+    assert storage.db_path == live_path
+    assert storage.get_generation() == generation
+    assert storage.get_corp_code("카카오") == "00258801"
+    assert not list(storage.storage_dir.glob("*.building"))
+    assert not (storage.storage_dir / f"corpcode-{generation + 1}.db").exists()
+
+
+def test_reload_of_an_empty_file_is_rejected(make_storage, make_corpcode_xml, corpcode_xml):
+    storage = make_storage()
+    storage.import_from_xml(str(corpcode_xml))
+    live_path = storage.db_path
+
+    with pytest.raises(ValueError):
+        storage.reload_from_xml(str(make_corpcode_xml([], "empty.xml")))
+
+    assert storage.db_path == live_path
+    assert storage.search_corporations("삼성")
+
+
+def test_reload_writes_only_changed_rows(make_storage, make_corpcode_xml, sample_rows):
+    storage = make_storage()
+    storage.import_from_xml(str(make_corpcode_xml(sample_rows)))
+    assert storage.get_corp_code("카카오") == "00258801"
+    storage.flush()
+
+    rows = sample_rows + [("00999999", "신규상장", "New Listing", "999990", "20240301")]
+    changeset = storage.reload_from_xml(str(make_corpcode_xml(rows, "CORPCODE-2.xml")))
+
+    assert changeset["writes"] == 1
+    assert changeset["unchanged"] == len(sample_rows)
+    with storage._connection() as conn:
+        access_count = conn.execute(
+            "SELECT access_count FROM corporations WHERE corp_code = '00258801'").fetchone()[0]
+    assert access_count >= 1
@@ -0,0 +1,48 @@
+"""Bigram search index returns what the LIKE scan returns"""
+
+import pytest
+
+from dart_analytics.sub_functions import corpcode_search_index
+
+QUERIES = ["삼성", "삼성전자", "전자", "하이닉스", "SK", "sk", "Sk", "0059", "005930", "0012",
+           "동명", "현대자동차", "없는회사", "LG전"]
+
+
+def indexed_and_scanned(storage, query):
+    columns = "c.corp_code, c.corp_name, c.corp_eng_name, c.stock_code, c.modify_date"
+    with storage._connection() as conn:
+        sql, params = corpcode_search_index.build_search_query(query, columns, 1000)
+        indexed = conn.execute(sql, params).fetchall()
+        scanned = storage._scan_corporations(conn, query, 1000)
+    return indexed, scanned
+
+
+def rank(row, query):
+    """The ranking bucket shared by both paths: exact name, name prefix, other"""
+    name = row[1]
+    return 1 if name == query else 2 if name.lower().startswith(query.lower()) else 3
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_index_matches_like_scan(make_storage, corpcode_xml, query):
+    storage = make_storage()
+    storage.import_from_xml(str(corpcode_xml))
+    assert corpcode_search_index.is_indexable(query)
+
+    indexed, scanned = indexed_and_scanned(storage, query)
+    assert sorted(indexed) == sorted(scanned)
+    assert [rank(row, query) for row in indexed] == sorted(rank(row, query) for row in indexed)
+
+
+def test_index_follows_delta_sync(make_storage, make_corpcode_xml, sample_rows):
+    storage = make_storage()
+    storage.import_from_xml(str(make_corpcode_xml(sample_rows)))
+    renamed = [("00126380", "삼성일렉트로닉스", "SAMSUNG", "005930", "20240201")]
+    kept = [row for row in sample_rows if row[0] not in ("00126380", "00164779")]
+    storage.sync_from_xml(str(make_corpcode_xml(kept + renamed, "CORPCODE-2.xml")))
+
+    for query in ["삼성", "전자", "일렉트로", "하이닉스", "SK", "0066"]:
+        indexed, scanned = indexed_and_scanned(storage, query)
+        assert sorted(indexed) == sorted(scanned), query
+    assert storage.search_corporations("하이닉스") == []
+    assert [r["corp_code"] for r in storage.search_corporations("일렉트로")] == ["00126380"]
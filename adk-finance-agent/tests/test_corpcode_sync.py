@@ -0,0 +1,69 @@
+"""Delta sync: changesets, tombstones and restores"""
+
+import pytest
+
+
+def is_deleted(storage, corp_code):
+    with storage._connection() as conn:
+        return conn.execute("SELECT is_deleted FROM corporations WHERE corp_code = ?", (corp_code,)).fetchone()[0]
+
+
+def test_changeset_lists_added_updated_and_removed(make_storage, make_corpcode_xml, sample_rows):
+    storage = make_storage()
+    storage.import_from_xml(str(make_corpcode_xml(sample_rows)))
+
+    rows = [row for row in sample_rows if row[0] != "00258801"]
+    rows[0] = ("00126380", "삼성전자", "SAMSUNG ELECTRONICS CO,.LTD", "005930", "20240301")
+    rows.append(("00999999", "신규상장", "New Listing", "999990", "20240301"))
+    changeset = storage.sync_from_xml(str(make_corpcode_xml(rows, "CORPCODE-2.xml")))
+
+    assert changeset["added"] == ["00999999"]
+    assert changeset["updated"] == ["00126380"]
+    assert changeset["removed"] == ["00258801"]
+    assert changeset["restored"] == []
+    assert changeset["unchanged"] == len(sample_rows) - 2
+    assert changeset["writes"] == 3
+
+    assert storage.get_corp_code("신규상장") == "00999999"
+    assert storage.get_corp_code("카카오") is None
+    assert is_deleted(storage, "00258801") == 1
+
+
+def test_unchanged_file_writes_nothing(make_storage, corpcode_xml):
+    storage = make_storage()
+    storage.import_from_xml(str(corpcode_xml))
+    generation = storage.get_generation()
+
+    changeset = storage.sync_from_xml(str(corpcode_xml))
+
+    assert changeset["writes"] == 0
+    assert storage.get_generation() == generation
+
+
+def test_tombstoned_corporation_is_restored_with_its_statistics(make_storage, make_corpcode_xml, sample_rows):
+    storage = make_storage()
+    storage.import_from_xml(str(make_corpcode_xml(sample_rows)))
+    assert storage.get_corp_code("카카오") == "00258801"
+    storage.flush()
+
+    without = [row for row in sample_rows if row[0] != "00258801"]
+    storage.sync_from_xml(str(make_corpcode_xml(without, "CORPCODE-2.xml")))
+    assert storage.search_corporations("카카오") == []
+
+    changeset = storage.sync_from_xml(str(make_corpcode_xml(sample_rows, "CORPCODE-3.xml")))
+    assert changeset["restored"] == ["00258801"]
+    assert is_deleted(storage, "00258801") == 0
+    assert storage.get_corp_code("카카오") == "00258801"
+    with storage._connection() as conn:
+        access_count = conn.execute(
+            "SELECT access_count FROM corporations WHERE corp_code = '00258801'").fetchone()[0]
+    assert access_count >= 1
+
+
+def test_empty_file_does_not_tombstone_everything(make_storage, make_corpcode_xml, corpcode_xml):
+    storage = make_storage()
+    storage.import_from_xml(str(corpcode_xml))
+
+    with pytest.raises(ValueError):
+        storage.sync_from_xml(str(make_corpcode_xml([], "empty.xml")))
+    assert storage.get_corp_code("삼성전자") == "00126380"
@@ -0,0 +1,137 @@
+"""DownloadCache: single-flight deduplication, eviction and lock files"""
+
+import io
+import os
+import threading
+import time
+import zipfile
+
+from dart_analytics.sub_functions.corpcode_shared import FileLock
+from dart_analytics.sub_functions.download_cache import DownloadCache
+from dart_analytics.sub_functions.file_handlers import _extract_zip
+
+
+def make_zip(text: str) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("document.xml", text)
+    return buffer.getvalue()
+
+
+def writer_of(payload: bytes, calls=None, release=None):
+    def download(target):
+        if calls is not None:
+            calls.append(1)
+        if release is not None:
+            release.wait(5)
+        target.write(payload)
+    return download
+
+
+def new_cache(tmp_path, **kwargs) -> DownloadCache:
+    cache = DownloadCache(str(tmp_path), **kwargs)
+    # Keep the background sweep out of the way; tests call sweep() themselves
+    cache._last_sweep = time.time()
+    return cache
+
+
+def test_concurrent_requests_share_one_download(tmp_path):
+    cache = new_cache(tmp_path)
+    calls, release = [], threading.Event()
+    download = writer_of(make_zip("<doc/>"), calls, release)
+    results = []
+
+    def worker():
+        results.append(cache.fetch("document.xml", {"rcept_no": "1"}, None, download, _extract_zip))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while cache.get_metrics()["joined"] < 7:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(result["source"] for result in results) == ["download"] + ["joined"] * 7
+    assert len({result["sha256"] for result in results}) == 1
+    assert cache.fetch("document.xml", {"rcept_no": "1"}, None, download, _extract_zip)["source"] == "cache"
+    assert len(calls) == 1
+
+
+def test_sweep_evicts_least_recently_used_blobs(tmp_path):
+    payloads = [make_zip(f"<doc>{i}</doc>" * 200) for i in range(3)]
+    cache = new_cache(tmp_path, max_bytes=sum(map(len, payloads[1:])), max_age_days=None)
+    entries = [cache.fetch("document.xml", {"rcept_no": str(i)}, None, writer_of(payload), _extract_zip)
+               for i, payload in enumerate(payloads)]
+    for age, entry in zip((300, 200, 100), entries):
+        past = time.time() - age
+        os.utime(cache.blob_path(entry), (past, past))
+
+    result = cache.sweep()
+
+    assert result["blobs_removed"] == 1
+    assert result["entries_removed"] == 1
+    assert not cache.blob_path(entries[0]).exists()
+    assert cache.lookup("document.xml", {"rcept_no": "0"}) is None
+    assert cache.lookup("document.xml", {"rcept_no": "2"}) is not None
+
+
+def test_sweep_evicts_blobs_unused_for_max_age(tmp_path):
+    cache = new_cache(tmp_path, max_bytes=None, max_age_days=1)
+    old = cache.fetch("document.xml", {"rcept_no": "old"}, None, writer_of(make_zip("old")), _extract_zip)
+    cache.fetch("document.xml", {"rcept_no": "new"}, None, writer_of(make_zip("new")), _extract_zip)
+    past = time.time() - 2 * 86400
+    os.utime(cache.blob_path(old), (past, past))
+
+    assert cache.sweep()["blobs_removed"] == 1
+    assert cache.lookup("document.xml", {"rcept_no": "old"}) is None
+    assert cache.lookup("document.xml", {"rcept_no": "new"}) is not None
+
+
+def test_sweep_removes_old_unheld_lock_files(tmp_path):
+    cache = new_cache(tmp_path)
+    for i in range(20):
+        cache.fetch("document.xml", {"rcept_no": str(i)}, None, writer_of(make_zip(str(i))), _extract_zip)
+    locks = sorted(cache.lock_dir.glob("*.lock"))
+    assert len(locks) == 20
+    assert not list(cache.entry_dir.glob("*.lock"))
+
+    past = time.time() - 2 * 86400
+    for path in locks:
+        os.utime(path, (past, past))
+    held = FileLock(locks[0])
+    assert held.acquire(blocking=False)
+    try:
+        assert cache.sweep()["locks_removed"] == 19
+    finally:
+        held.release()
+    assert [path for path in cache.lock_dir.glob("*.lock") if path.name != "sweep.lock"] == [locks[0]]
+
+    # 지워진 키도 다시 받을 수 있음
+    cache.fetch("document.xml", {"rcept_no": "1"}, "extracted_1", writer_of(make_zip("1")), _extract_zip)
+
+
+def test_different_keys_download_concurrently(tmp_path):
+    cache = new_cache(tmp_path)
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow(target):
+        started.set()
+        release.wait(5)
+        target.write(make_zip("slow"))
+
+    thread = threading.Thread(target=cache.fetch,
+                              args=("document.xml", {"rcept_no": "slow"}, None, slow, _extract_zip))
+    thread.start()
+    try:
+        assert started.wait(5)
+        began = time.monotonic()
+        result = cache.fetch("document.xml", {"rcept_no": "fast"}, None, writer_of(make_zip("fast")), _extract_zip)
+        assert result["source"] == "download"
+        assert time.monotonic() - began < 2
+    finally:
+        release.set()
+        thread.join(5)
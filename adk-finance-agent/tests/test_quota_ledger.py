@@ -0,0 +1,62 @@
+"""QuotaLedger: KST day rollover, batched writes, shared limits"""
+
+import json
+from datetime import datetime, timezone
+
+from dart_analytics.sub_functions import rate_limiter
+from dart_analytics.sub_functions.rate_limiter import ProviderRateLimiter, QuotaLedger
+
+
+def test_today_uses_korean_time(monkeypatch):
+    class FixedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            # 15:30 UTC on Jan 1st is already 00:30 on Jan 2nd in Seoul
+            return datetime(2024, 1, 1, 15, 30, tzinfo=timezone.utc).astimezone(tz)
+
+    monkeypatch.setattr(rate_limiter, "datetime", FixedDatetime)
+    assert QuotaLedger.today() == "2024-01-02"
+
+
+def test_counts_reset_when_the_kst_date_changes(tmp_path, monkeypatch):
+    ledger = QuotaLedger(tmp_path / "ledger.json")
+    monkeypatch.setattr(ledger, "today", lambda: "2024-01-01")
+    assert [ledger.reserve("dart:key", 2) for _ in range(3)] == [1, 2, None]
+
+    monkeypatch.setattr(ledger, "today", lambda: "2024-01-02")
+    assert ledger.used("dart:key") == 0
+    assert ledger.reserve("dart:key", 2) == 1
+
+    reopened = QuotaLedger(tmp_path / "ledger.json")
+    monkeypatch.setattr(reopened, "today", lambda: "2024-01-02")
+    assert reopened.used("dart:key") == 1
+
+
+def test_reservations_are_batched_far_from_the_limit(tmp_path):
+    path = tmp_path / "ledger.json"
+    ledger = QuotaLedger(path, flush_every=10, flush_interval=3600)
+    for _ in range(9):
+        ledger.reserve("dart:key", None)
+    assert not path.exists()
+
+    ledger.reserve("dart:key", None)
+    assert json.loads(path.read_text())["counts"] == {"dart:key": 10}
+    ledger.reserve("dart:key", None)
+    ledger.flush()
+    assert json.loads(path.read_text())["counts"] == {"dart:key": 11}
+
+
+def test_processes_sharing_a_ledger_never_exceed_the_limit(tmp_path):
+    # Two instances on one file stand in for two processes
+    first = QuotaLedger(tmp_path / "ledger.json", flush_every=5, flush_interval=3600)
+    second = QuotaLedger(tmp_path / "ledger.json", flush_every=5, flush_interval=3600)
+    granted = [ledger.reserve("dart:key", 20) for _ in range(30) for ledger in (first, second)]
+
+    assert sum(result is not None for result in granted) == 20
+    assert first.used("dart:key") == second.used("dart:key") == 20
+
+
+def test_acquire_waits_without_a_deadline_by_default(tmp_path):
+    limiter = ProviderRateLimiter("dart", "key", rate=1000, ledger=QuotaLedger(tmp_path / "ledger.json"))
+    assert limiter.max_wait is None
+    assert limiter.acquire() >= 0